@@ -0,0 +1,389 @@
+"""
+Cohort analytics over many students' assignment and attendance data.
+
+Records of every student are appended to compact columns (array.array) and
+turned into numpy arrays on the first query, so class-wide and school-wide
+aggregations are a handful of vectorized passes instead of per-student
+Python loops. Requires numpy (pip install numpy).
+
+Usage:
+    cohort = Cohort()
+    for id_path in id_paths:
+        cohort.add_client(BBClient(id_path=id_path))
+    cohort.on_time_distribution(by="class")
+    cohort.attendance_by_course()
+    cohort.percentile_ranks("grade", within="class")
+"""
+
+import math
+from array import array
+from typing import Optional, List, Dict, Any, Iterable, Mapping
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("Cohort analytics require numpy: pip install numpy")
+
+
+def _to_numpy(column: array, dtype) -> Any:
+    """Copy an array.array column into numpy (a view would block further appends)."""
+    if not len(column):
+        return np.zeros(0, dtype=dtype)
+    return np.frombuffer(column, dtype=dtype).copy()
+
+
+class Cohort:
+    """
+    Columnar store of many students' assignments and attendance.
+    
+    Assignments are classified exactly like BBClient.get_course_assignment_stats
+    (on time, late, missed, available) and attendance like
+    get_course_attendance_percentage (present, late and excused count as attended).
+    Courses are keyed by internal course ID; course_names maps them to names.
+    """
+    
+    ATTENDED_STATUSES = ("present", "late", "excused")
+    ABSENT_STATUSES = ("absent",)
+    
+    METRICS = ("on_time_rate", "attendance", "grade")
+    
+    def __init__(self):
+        _require_numpy()
+        self.students: List[str] = []
+        self.class_names: List[Optional[str]] = []
+        self.courses: List[str] = []
+        self.course_names: Dict[str, Optional[str]] = {}
+        self._student_index: Dict[str, int] = {}
+        self._course_index: Dict[str, int] = {}
+        
+        # Assignment columns: one entry per assignment per student
+        self._a_student = array("i")
+        self._a_course = array("i")
+        self._a_submitted = array("b")
+        self._a_past_due = array("b")
+        self._a_accepts_late = array("b")
+        self._a_graded = array("b")
+        self._a_score = array("d")
+        self._a_possible = array("d")
+        
+        # Attendance columns: one entry per meeting per student (1 attended, 0 absent, -1 unknown)
+        self._m_student = array("i")
+        self._m_course = array("i")
+        self._m_status = array("b")
+        
+        self._assignment_columns = (
+            "_a_student", "_a_course", "_a_submitted", "_a_past_due",
+            "_a_accepts_late", "_a_graded", "_a_score", "_a_possible"
+        )
+        self._attendance_columns = ("_m_student", "_m_course", "_m_status")
+        
+        self._cache: Optional[Dict[str, Any]] = None
+    
+    def __len__(self) -> int:
+        return len(self.students)
+    
+    def _student(self, student: str, class_name: Optional[str]) -> int:
+        index = self._student_index.get(student)
+        if index is None:
+            index = self._student_index[student] = len(self.students)
+            self.students.append(student)
+            self.class_names.append(class_name)
+        elif class_name:
+            self.class_names[index] = class_name
+        return index
+    
+    def _course(self, course_id: Optional[str], name: Optional[str] = None) -> int:
+        course_id = course_id or "Unknown"
+        index = self._course_index.get(course_id)
+        if index is None:
+            index = self._course_index[course_id] = len(self.courses)
+            self.courses.append(course_id)
+        if name:
+            self.course_names[course_id] = name
+        else:
+            self.course_names.setdefault(course_id, None)
+        return index
+    
+    def _drop_rows(self, s: int) -> None:
+        """Remove the rows of student index s from every column."""
+        for columns in (self._assignment_columns, self._attendance_columns):
+            owner = getattr(self, columns[0])
+            if not len(owner):
+                continue
+            keep = np.frombuffer(owner, dtype=np.int32) != s
+            if keep.all():
+                continue
+            for name in columns:
+                column = getattr(self, name)
+                kept = np.frombuffer(column, dtype=column.typecode)[keep]
+                setattr(self, name, array(column.typecode, kept.tobytes()))
+    
+    def add_student(
+        self,
+        student: str,
+        assignments: Iterable[Mapping[str, Any]],
+        attendance: Optional[Mapping[str, Iterable[Mapping[str, Any]]]] = None,
+        class_name: Optional[str] = None,
+        courses: Optional[Iterable[Mapping[str, Any]]] = None
+    ) -> None:
+        """
+        Add one student's records, replacing those previously added for the same key.
+        
+        Args:
+            student: Unique student key (e.g. username)
+            assignments: assignment dicts or Assignment records (get_assignments format);
+                         grouped by their course_id (internal course ID)
+            attendance: attendance dicts or records per internal course ID
+            class_name: Student's class (e.g. "4SAE11")
+            courses: .id course dicts (or Course records), to name the courses
+        """
+        if student in self._student_index:
+            self._drop_rows(self._student_index[student])
+        s = self._student(student, class_name)
+        nan = math.nan
+        
+        for course in courses or ():
+            if course.get("internal_id"):
+                self._course(course["internal_id"], course.get("name"))
+        
+        for a in assignments:
+            score = a.get("score")
+            possible = a.get("score_possible")
+            self._a_student.append(s)
+            self._a_course.append(self._course(a.get("course_id"), a.get("course_name")))
+            self._a_submitted.append(bool(a.get("submitted", False)))
+            self._a_past_due.append(bool(a.get("is_past_due", False)))
+            self._a_accepts_late.append(bool(a.get("accepts_late", True)))
+            self._a_graded.append(bool(a.get("graded", False)))
+            self._a_score.append(score if score is not None else nan)
+            self._a_possible.append(possible if possible is not None else nan)
+        
+        for course_id, records in (attendance or {}).items():
+            c = self._course(course_id)
+            for record in records:
+                status = (record.get("status") or "").lower()
+                if status in self.ATTENDED_STATUSES:
+                    code = 1
+                elif status in self.ABSENT_STATUSES:
+                    code = 0
+                else:
+                    code = -1
+                self._m_student.append(s)
+                self._m_course.append(c)
+                self._m_status.append(code)
+        
+        self._cache = None
+    
+    def add_client(self, client, student: Optional[str] = None) -> None:
+        """
+        Fetch and add the records of an authenticated BBClient.
+        
+        Args:
+            client: BBClient with cached .id data
+            student: Student key (defaults to the .id username)
+        """
+        user = (client.get_cached_data() or {}).get("user", {})
+        student = student or user.get("username") or str(client.user_id)
+        # Courses whose fetch failed are left out, not counted as empty
+        self.add_student(
+            student, client.get_assignments(), client.get_attendance_by_course(),
+            class_name=user.get("class"), courses=client.get_course_catalog()
+        )
+    
+    def _columns(self) -> Dict[str, Any]:
+        """Numpy copies of the columns and per-student counters (built once per change)."""
+        if self._cache is not None:
+            return self._cache
+        
+        n = len(self.students)
+        student = _to_numpy(self._a_student, np.int32)
+        submitted = _to_numpy(self._a_submitted, np.int8).astype(bool)
+        past_due = _to_numpy(self._a_past_due, np.int8).astype(bool)
+        accepts_late = _to_numpy(self._a_accepts_late, np.int8).astype(bool)
+        graded = _to_numpy(self._a_graded, np.int8).astype(bool)
+        score = _to_numpy(self._a_score, np.float64)
+        possible = _to_numpy(self._a_possible, np.float64)
+        
+        # Same precedence as get_course_assignment_stats
+        zero_graded = graded & (score == 0)
+        on_time = ~zero_graded & submitted & ~past_due
+        late = ~zero_graded & submitted & past_due
+        missed = zero_graded | (~submitted & past_due & ~accepts_late)
+        available = ~(on_time | late | missed)
+        
+        ratio_mask = graded & ~np.isnan(score) & (possible > 0)
+        ratio = np.where(ratio_mask, score / np.where(possible > 0, possible, 1.0), 0.0)
+        
+        m_student = _to_numpy(self._m_student, np.int32)
+        m_status = _to_numpy(self._m_status, np.int8)
+        
+        counts = {
+            "assignments": np.bincount(student, minlength=n),
+            "on_time": np.bincount(student, weights=on_time, minlength=n).astype(np.int64),
+            "late": np.bincount(student, weights=late, minlength=n).astype(np.int64),
+            "missed": np.bincount(student, weights=missed, minlength=n).astype(np.int64),
+            "available": np.bincount(student, weights=available, minlength=n).astype(np.int64),
+            "graded": np.bincount(student, weights=ratio_mask, minlength=n),
+            "grade_sum": np.bincount(student, weights=ratio, minlength=n),
+            "meetings": np.bincount(m_student, minlength=n),
+            "present": np.bincount(m_student, weights=m_status == 1, minlength=n).astype(np.int64),
+            "absent": np.bincount(m_student, weights=m_status == 0, minlength=n).astype(np.int64)
+        }
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            metrics = {
+                # Students without assignments/meetings get 0.0, like the client
+                "on_time_rate": np.where(counts["assignments"] > 0, counts["on_time"] / counts["assignments"], 0.0),
+                "attendance": np.where(counts["meetings"] > 0, counts["present"] / counts["meetings"] * 100, 0.0),
+                # Students without graded work have no grade (NaN)
+                "grade": np.where(counts["graded"] > 0, counts["grade_sum"] / counts["graded"] * 100, np.nan)
+            }
+        
+        self._cache = {
+            "m_student": m_student,
+            "m_course": _to_numpy(self._m_course, np.int32),
+            "m_status": m_status,
+            "classes": np.array([c or "" for c in self.class_names], dtype=object),
+            "counts": counts,
+            "metrics": metrics
+        }
+        return self._cache
+    
+    def _groups(self, by: str) -> Dict[str, Any]:
+        """Map group name to a boolean student mask ("class" or "school")."""
+        if by == "school":
+            return {"school": np.ones(len(self.students), dtype=bool)}
+        if by != "class":
+            raise ValueError('by must be "class" or "school"')
+        classes = self._columns()["classes"]
+        return {name or "Unknown": classes == name for name in sorted(set(classes))}
+    
+    def student_stats(self) -> Dict[str, Any]:
+        """
+        Get per-student counters and metrics as columns.
+        
+        Returns:
+            Dict of equally long sequences: student, class_name, assignments,
+            on_time, late, missed, available, on_time_rate (0-1), meetings,
+            present, absent, attendance (percentage) and grade (average
+            percentage of graded work, NaN if none)
+        """
+        columns = self._columns()
+        counts = columns["counts"]
+        return {
+            "student": list(self.students),
+            "class_name": list(self.class_names),
+            **{key: counts[key] for key in ("assignments", "on_time", "late", "missed", "available",
+                                            "meetings", "present", "absent")},
+            **columns["metrics"]
+        }
+    
+    def on_time_distribution(self, by: str = "class", bins: int = 10) -> Dict[str, Dict[str, Any]]:
+        """
+        Distribution of on-time rates per class (or for the whole school).
+        
+        Only students with at least one assignment are counted.
+        
+        Args:
+            by: "class" or "school"
+            bins: Number of equal-width histogram bins over [0, 1]
+        
+        Returns:
+            Dict mapping group to students, mean, median, p10, p90 and histogram
+            (student counts per bin)
+        """
+        columns = self._columns()
+        rates = columns["metrics"]["on_time_rate"]
+        has_work = columns["counts"]["assignments"] > 0
+        
+        result = {}
+        for group, mask in self._groups(by).items():
+            values = rates[mask & has_work]
+            if not len(values):
+                continue
+            p10, median, p90 = np.percentile(values, [10, 50, 90])
+            result[group] = {
+                "students": int(len(values)),
+                "mean": round(float(values.mean()), 4),
+                "median": round(float(median), 4),
+                "p10": round(float(p10), 4),
+                "p90": round(float(p90), 4),
+                "histogram": np.histogram(values, bins=bins, range=(0.0, 1.0))[0].tolist()
+            }
+        return result
+    
+    def attendance_by_course(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Attendance per course over every student.
+        
+        Returns:
+            Dict mapping internal course ID to name, students, present, absent,
+            total meetings and percentage (present / total)
+        """
+        columns = self._columns()
+        course = columns["m_course"]
+        status = columns["m_status"]
+        n = len(self.courses)
+        
+        total = np.bincount(course, minlength=n)
+        present = np.bincount(course, weights=status == 1, minlength=n)
+        absent = np.bincount(course, weights=status == 0, minlength=n)
+        
+        # Distinct students per course, from the distinct (course, student) pairs
+        width = max(len(self.students), 1)
+        pairs = np.unique(course.astype(np.int64) * width + columns["m_student"])
+        students = np.bincount(pairs // width, minlength=n)
+        
+        return {
+            course_id: {
+                "name": self.course_names.get(course_id),
+                "students": int(students[c]),
+                "present": int(present[c]),
+                "absent": int(absent[c]),
+                "total": int(total[c]),
+                "percentage": round(float(present[c] / total[c] * 100), 2)
+            }
+            for c, course_id in enumerate(self.courses)
+            if total[c]
+        }
+    
+    def percentile_ranks(self, metric: str = "grade", within: str = "school") -> Dict[str, Optional[float]]:
+        """
+        Percentile rank (0-100) of every student for a metric.
+        
+        The rank is the share of the group scoring below the student, counting
+        ties as half. Students without a value (no graded work) get None.
+        
+        Args:
+            metric: "grade", "on_time_rate" or "attendance"
+            within: "school" or "class"
+        
+        Returns:
+            Dict mapping student to percentile rank
+        """
+        if metric not in self.METRICS:
+            raise ValueError(f"metric must be one of {self.METRICS}")
+        
+        values = self._columns()["metrics"][metric]
+        ranks = np.full(len(self.students), np.nan)
+        valid = ~np.isnan(values)
+        
+        for mask in self._groups(within).values():
+            mask = mask & valid
+            group = values[mask]
+            if not len(group):
+                continue
+            ordered = np.sort(group)
+            below = np.searchsorted(ordered, group, side="left")
+            at_or_below = np.searchsorted(ordered, group, side="right")
+            ranks[mask] = (below + at_or_below) / 2 / len(group) * 100
+        
+        return {
+            student: (None if math.isnan(rank) else round(float(rank), 2))
+            for student, rank in zip(self.students, ranks.tolist())
+        }
@@ -3,7 +3,6 @@ Authentication module for bbpy.
 Handles .id file authentication and Selenium login.
 """
 
-import json
 import time
 from pathlib import Path
 from typing import Optional
@@ -15,6 +14,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
+from bbpy import codec
 from bbpy.exceptions import BBAuthError
 
 
@@ -163,8 +163,7 @@ def save_id_file(
     if not id_data["credentials"]:
         del id_data["credentials"]
     
-    with open(id_path, 'w', encoding='utf-8') as f:
-        json.dump(id_data, f, indent=2, ensure_ascii=False)
+    codec.dump_file(id_path, id_data)
 
 
 def update_id_file_cookies(id_path: str, session: requests.Session) -> None:
@@ -183,8 +182,7 @@ def update_id_file_cookies(id_path: str, session: requests.Session) -> None:
     
     try:
         # Load existing .id file
-        with open(id_path, 'r', encoding='utf-8') as f:
-            id_data = json.load(f)
+        id_data = codec.load_file(id_path)
         
         # Extract new cookies from session
         cookies = []
@@ -201,12 +199,38 @@ def update_id_file_cookies(id_path: str, session: requests.Session) -> None:
         id_data["updated_at"] = datetime.now().isoformat()
         
         # Save back to file
-        with open(id_path, 'w', encoding='utf-8') as f:
-            json.dump(id_data, f, indent=2, ensure_ascii=False)
+        codec.dump_file(id_path, id_data)
             
     except FileNotFoundError:
         raise BBAuthError(f"ID file not found: {id_path}")
-    except json.JSONDecodeError:
+    except codec.DecodeError:
+        raise BBAuthError(f"Invalid ID file format: {id_path}")
+
+
+def update_id_file_attendance(id_path: str, ledger: dict) -> None:
+    """
+    Update only the attendance ledger in an existing .id file, preserving all other data.
+    
+    The ledger maps internal course IDs to their frozen meeting records, so
+    attendance percentages can be recomputed without re-fetching past meetings.
+    
+    Args:
+        id_path: Path to the .id file to update
+        ledger: Attendance ledger ({course_id: {"horizon": ..., "records": {...}}})
+    
+    Raises:
+        BBAuthError: If .id file cannot be loaded or updated
+    """
+    try:
+        id_data = codec.load_file(id_path)
+        
+        id_data["attendance"] = ledger
+        
+        codec.dump_file(id_path, id_data)
+    
+    except FileNotFoundError:
+        raise BBAuthError(f"ID file not found: {id_path}")
+    except codec.DecodeError:
         raise BBAuthError(f"Invalid ID file format: {id_path}")
 
 
@@ -219,14 +243,14 @@ def load_id_file(id_path: str) -> tuple:
         
     Returns:
         Tuple of (requests.Session, cached_data dict)
-        cached_data includes: generated_at, user, courses, and optionally credentials
+        cached_data includes: generated_at, user, courses, attendance ledger,
+        and optionally credentials
         
     Raises:
         BBAuthError: If .id file cannot be loaded
     """
     try:
-        with open(id_path, 'r', encoding='utf-8') as f:
-            id_data = json.load(f)
+        id_data = codec.load_file(id_path)
         
         # Create session with cookies
         session = requests.Session()
@@ -251,14 +275,15 @@ def load_id_file(id_path: str) -> tuple:
             "generated_at": id_data.get("generated_at"),
             "user": id_data.get("user", {}),
             "courses": id_data.get("courses", []),
-            "credentials": id_data.get("credentials")  # May be None
+            "credentials": id_data.get("credentials"),  # May be None
+            "attendance": id_data.get("attendance", {})  # Per-course attendance ledger
         }
         
         return session, cached_data
         
     except FileNotFoundError:
         raise BBAuthError(f"ID file not found: {id_path}")
-    except json.JSONDecodeError:
+    except codec.DecodeError:
         raise BBAuthError(f"Invalid ID file format: {id_path}")
 
 
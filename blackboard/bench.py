@@ -0,0 +1,499 @@
+"""
+Benchmark suite for BBClient against the local mock Blackboard server.
+
+Every benchmark has a request-count budget derived from the mock's shape
+(courses, columns, meetings, roster) and a wall-time budget. Exceeding
+either fails the run, so N+1 regressions show up as a non-zero exit code.
+
+Usage:
+    python -m bbpy.bench
+    python -m bbpy.bench --codec
+    python -m bbpy.bench --upload
+    python -m bbpy.bench --transport requests --transport httpx --latency 0.02
+    python -m bbpy.bench --courses 10 --columns 12 --latency 0.01 --json bench.json
+"""
+
+import argparse
+import json
+import math
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable
+
+from bbpy import codec
+from bbpy.client import BBClient
+from bbpy.mock_server import MockBlackboard, MockSyncServer
+from bbpy.transport import Transport, RequestsTransport, HttpxTransport
+from bbpy.upload import DeltaUploader, build_document
+
+
+DEFAULT_CONFIG = {
+    "courses": 6,
+    "columns": 8,
+    "meetings": 12,
+    "roster": 30,
+    "instructors": 2,
+    "latency": 0.005,
+    "page_size": 100
+}
+
+
+def _pages(items: int, page_size: int) -> int:
+    return max(1, math.ceil(items / page_size))
+
+
+def _enrolled_budget(cfg: dict) -> int:
+    # Memberships listing + one /courses/{id} per membership
+    return _pages(cfg["courses"], cfg["page_size"]) + cfg["courses"]
+
+
+def _assignments_budget(cfg: dict) -> int:
+    # Per course: columns listing + grade and content per column (cold content cache)
+    columns_pages = _pages(cfg["columns"] + 1, cfg["page_size"])
+    return cfg["courses"] * (columns_pages + 2 * cfg["columns"])
+
+
+def _warm_content_budget(cfg: dict) -> int:
+    # Per course: columns listing + one content request per column (in parallel)
+    columns_pages = _pages(cfg["columns"] + 1, cfg["page_size"])
+    return cfg["courses"] * (columns_pages + cfg["columns"])
+
+
+def _attendance_budget(cfg: dict) -> int:
+    # Per course: meetings listing; once per pass: bulk user records (not filtered by course)
+    meetings_pages = _pages(cfg["meetings"], cfg["page_size"])
+    records_pages = _pages(cfg["courses"] * cfg["meetings"], cfg["page_size"])
+    return cfg["courses"] * meetings_pages + records_pages
+
+
+def _attendance_ledger_budget(cfg: dict) -> int:
+    # Past meetings come from the ledger: only the meetings listing remains
+    return cfg["courses"] * _pages(cfg["meetings"], cfg["page_size"])
+
+
+def _instructors_budget(cfg: dict) -> int:
+    # Enrolled courses + per course: roster listing + one /users/{id} per instructor
+    roster_pages = _pages(cfg["roster"] + cfg["instructors"], cfg["page_size"])
+    return _enrolled_budget(cfg) + cfg["courses"] * (roster_pages + cfg["instructors"])
+
+
+def _generate_budget(cfg: dict) -> int:
+    # /users/me + enrolled courses + instructors (which lists enrolled courses again)
+    return 1 + _enrolled_budget(cfg) + _instructors_budget(cfg)
+
+
+def _document_budget(cfg: dict) -> int:
+    # Assignments sync + one attendance pass (stats are counted from its records)
+    return _assignments_budget(cfg) + _attendance_budget(cfg)
+
+
+def _run_generate(client: BBClient, bb: MockBlackboard) -> Any:
+    with tempfile.TemporaryDirectory() as tmp:
+        return client.generate_id_file(str(Path(tmp) / "bench.id"))
+
+
+BENCHMARKS: List[Dict[str, Any]] = [
+    {
+        "name": "get_enrolled_courses",
+        "run": lambda client, bb: client.get_enrolled_courses(),
+        "budget": _enrolled_budget
+    },
+    {
+        "name": "get_assignments",
+        "run": lambda client, bb: client.get_assignments(),
+        "budget": _assignments_budget
+    },
+    {
+        "name": "warm_content_cache",
+        "run": lambda client, bb: client.warm_content_cache(),
+        "budget": _warm_content_budget
+    },
+    {
+        "name": "get_attendance_percentage",
+        "run": lambda client, bb: client.get_attendance_percentage(),
+        "budget": _attendance_budget
+    },
+    {
+        "name": "get_attendance_percentage (ledger)",
+        "setup": lambda client, bb: client.get_attendance_percentage(),
+        "run": lambda client, bb: client.get_attendance_percentage(),
+        "budget": _attendance_ledger_budget
+    },
+    {
+        "name": "get_course_instructors",
+        "run": lambda client, bb: client.get_course_instructors(),
+        "budget": _instructors_budget
+    },
+    {
+        "name": "generate_id_file",
+        "run": _run_generate,
+        "budget": _generate_budget
+    },
+    {
+        "name": "build_document",
+        "run": lambda client, bb: build_document(client),
+        "budget": _document_budget
+    }
+]
+
+
+# Transports compared by --transport
+TRANSPORTS: Dict[str, Callable[[], Transport]] = {
+    "requests": RequestsTransport,
+    "httpx": HttpxTransport,
+    "httpx-http1": lambda: HttpxTransport(http2=False)
+}
+
+# Benchmarks with many requests per call (warm_content_cache sends them from a thread pool)
+FANOUT_BENCHMARKS = ["warm_content_cache", "get_assignments", "get_course_instructors"]
+
+
+def time_budget(requests: int, cfg: dict, time_scale: float = 1.0) -> float:
+    """
+    Wall-time budget for a benchmark: serial latency per request plus overhead.
+    
+    Args:
+        requests: Request-count budget of the benchmark
+        cfg: Mock server configuration
+        time_scale: Multiplier for slow machines
+    
+    Returns:
+        Budget in seconds
+    """
+    return (requests * (cfg["latency"] + 0.01) + 0.5) * time_scale
+
+
+def run_benchmarks(
+    config: Optional[dict] = None,
+    names: Optional[List[str]] = None,
+    time_scale: float = 1.0,
+    client_factory: Optional[Callable[[str, str], BBClient]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run the benchmarks against a fresh mock server.
+    
+    Each benchmark gets a new client (and therefore cold caches); the
+    /users/me call made by the constructor and the benchmark's optional
+    setup step are not counted, except for the connections they open,
+    which the benchmark then reuses.
+    
+    Args:
+        config: Mock server configuration (defaults to DEFAULT_CONFIG)
+        names: Benchmarks to run (all if None)
+        time_scale: Multiplier applied to wall-time budgets
+        client_factory: Callable (id_path, domain) -> BBClient, to benchmark
+                        clients with non-default options
+    
+    Returns:
+        List of result dicts: name, requests, budget, seconds, time_budget,
+        bytes, connections (new TCP connections), endpoints, passed
+    """
+    cfg = dict(DEFAULT_CONFIG, **(config or {}))
+    client_factory = client_factory or (lambda id_path, domain: BBClient(id_path=id_path, domain=domain))
+    mock_options = {k: cfg[k] for k in ("courses", "columns", "meetings", "roster", "instructors", "latency", "page_size")}
+    
+    results = []
+    with MockBlackboard(**mock_options) as bb, tempfile.TemporaryDirectory() as tmp:
+        id_path = str(Path(tmp) / "student.id")
+        
+        for bench in BENCHMARKS:
+            if names and bench["name"] not in names:
+                continue
+            
+            bb.write_id_file(id_path)
+            bb.reset_counters()
+            client = client_factory(id_path, bb.url)
+            if "setup" in bench:
+                bench["setup"](client, bb)
+            connections = bb.connections
+            bb.reset_counters()
+            
+            start = time.perf_counter()
+            bench["run"](client, bb)
+            seconds = time.perf_counter() - start
+            
+            budget = bench["budget"](cfg)
+            seconds_budget = time_budget(budget, cfg, time_scale)
+            results.append({
+                "name": bench["name"],
+                "requests": bb.request_count,
+                "budget": budget,
+                "seconds": round(seconds, 4),
+                "time_budget": round(seconds_budget, 4),
+                "bytes": bb.bytes_sent,
+                "connections": connections + bb.connections,
+                "endpoints": bb.counts_by_endpoint(),
+                "passed": bb.request_count <= budget and seconds <= seconds_budget
+            })
+    
+    return results
+
+
+def run_transport_benchmark(
+    config: Optional[dict] = None,
+    transports: Optional[List[str]] = None,
+    names: Optional[List[str]] = None,
+    time_scale: float = 1.0
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run the benchmarks once per HTTP transport.
+    
+    Every benchmark gets a new transport, so connections are opened cold
+    and counted by the mock server. The mock serves plain HTTP/1.1: httpx
+    runs there without HTTP/2 (no ALPN), which measures its overhead and
+    connection reuse but not multiplexing.
+    
+    Args:
+        config: Mock server configuration (defaults to DEFAULT_CONFIG)
+        transports: Names from TRANSPORTS (all if None)
+        names: Benchmarks to run (FANOUT_BENCHMARKS if None)
+        time_scale: Multiplier applied to wall-time budgets
+    
+    Returns:
+        {transport: run_benchmarks() results}, with "http_versions" added
+        per result for transports that report them
+    """
+    results = {}
+    for transport_name in transports or list(TRANSPORTS):
+        opened: List[Transport] = []
+        
+        def client_factory(id_path: str, domain: str) -> BBClient:
+            transport = TRANSPORTS[transport_name]()
+            opened.append(transport)
+            return BBClient(id_path=id_path, domain=domain, transport=transport)
+        
+        try:
+            runs = run_benchmarks(config, names or FANOUT_BENCHMARKS, time_scale, client_factory)
+            # One client (and transport) per benchmark, in order
+            for result, transport in zip(runs, opened):
+                if hasattr(transport, "stats"):
+                    result["http_versions"] = transport.stats()["http_versions"]
+        finally:
+            for transport in opened:
+                transport.close()
+        results[transport_name] = runs
+    return results
+
+
+def print_transport_results(results: Dict[str, List[Dict[str, Any]]]) -> None:
+    """Print transport benchmark results as a table, grouped by benchmark."""
+    print(f"{'benchmark':<28} {'transport':<12} {'requests':>9} {'connections':>12} {'seconds':>9}  protocol")
+    names = [r["name"] for r in next(iter(results.values()), [])]
+    for name in names:
+        for transport_name, runs in results.items():
+            r = next(r for r in runs if r["name"] == name)
+            protocol = ", ".join(sorted(r.get("http_versions", {}))) or "HTTP/1.1"
+            status = "" if r["passed"] else "  FAIL"
+            print(f"{name:<28} {transport_name:<12} {r['requests']:>9} {r['connections']:>12} "
+                  f"{r['seconds']:>9.3f}  {protocol}{status}")
+
+
+def run_upload_check(config: Optional[dict] = None) -> List[Dict[str, Any]]:
+    """
+    Check that delta uploads keep the data of a course whose fetch fails.
+    
+    Uploads a student in full to a MockSyncServer, then makes the first
+    course answer 403 and uploads twice more: once when the fetch fails, once
+    when the negative cache skips the course. After each, the server must
+    still hold every acknowledged assignment and attendance item.
+    
+    Args:
+        config: Mock server configuration (defaults to DEFAULT_CONFIG)
+    
+    Returns:
+        List of result dicts: name, deletes (sent for the course), missing
+        (items no longer on the server) and passed
+    """
+    cfg = dict(DEFAULT_CONFIG, **(config or {}))
+    mock_options = {k: cfg[k] for k in ("courses", "columns", "meetings", "roster", "instructors", "page_size")}
+    results = []
+    with MockBlackboard(**mock_options) as bb, MockSyncServer() as server, tempfile.TemporaryDirectory() as tmp:
+        id_path = str(Path(tmp) / "student.id")
+        bb.write_id_file(id_path)
+        client = BBClient(id_path=id_path, domain=bb.url)
+        uploader = DeltaUploader(server.url)
+        uploader.add_client(client, "student")
+        uploader.flush()
+        acknowledged = server.documents["student"]
+        
+        bb.unavailable_courses = 1
+        for name in ("course fetch fails", "course skipped (negative cache)"):
+            document = server.documents["student"]
+            uploader.add_client(client, "student")
+            stats = uploader.flush()
+            missing = sum(
+                1 for collection in ("assignments", "attendance")
+                for key in acknowledged[collection]
+                if key not in server.documents["student"].get(collection, {})
+            )
+            results.append({
+                "name": name,
+                "deletes": sum(
+                    1 for collection in ("assignments", "attendance")
+                    for key in document.get(collection, {})
+                    if key not in server.documents["student"].get(collection, {})
+                ),
+                "missing": missing,
+                "passed": missing == 0 and stats["requeued"] == 0
+            })
+    return results
+
+
+def print_upload_results(results: List[Dict[str, Any]]) -> None:
+    """Print upload check results as a table."""
+    print(f"{'check':<38} {'deletes':>8} {'missing':>8}  result")
+    for r in results:
+        status = "ok" if r["passed"] else "FAIL"
+        print(f"{r['name']:<38} {r['deletes']:>8} {r['missing']:>8}  {status}")
+
+
+def _codec_payloads(cfg: dict) -> Dict[str, Any]:
+    """Typical response bodies and a .id file from the mock server, keyed by name."""
+    mock_options = {k: cfg[k] for k in ("courses", "columns", "meetings", "roster", "instructors", "page_size")}
+    with MockBlackboard(**mock_options) as bb, tempfile.TemporaryDirectory() as tmp:
+        course_id = bb.course_id(0)
+        student_id = bb.student_id(0)
+        payloads = {
+            "course users": bb.dispatch(f"/v1/courses/{course_id}/users", {}, 0)[1],
+            "gradebook columns": bb.dispatch(f"/v2/courses/{course_id}/gradebook/columns", {}, 0)[1],
+            "attendance records": bb.dispatch(f"/v1/courses/{course_id}/meetings/users/{student_id}", {}, 0)[1]
+        }
+        id_path = str(Path(tmp) / "student.id")
+        bb.write_id_file(id_path)
+        payloads[".id file"] = codec.load_file(id_path)
+    return payloads
+
+
+def _best_of(fn: Callable[[], Any], iterations: int, repeat: int = 5) -> float:
+    """Best average seconds per call of fn over repeat rounds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best
+
+
+def run_codec_benchmark(config: Optional[dict] = None, iterations: int = 200) -> List[Dict[str, Any]]:
+    """
+    Compare the JSON codec with the previous stdlib path.
+    
+    Decoding is measured on the raw response bytes (stdlib: what
+    response.json() does), encoding against json.dump(indent=2) as the .id
+    writes used to do. Every payload is also checked to read back identically
+    with the stdlib after being written by the codec.
+    
+    Args:
+        config: Mock server configuration (defaults to DEFAULT_CONFIG)
+        iterations: Calls per timing round
+    
+    Returns:
+        List of result dicts: name, bytes, decode/encode times in microseconds
+        for stdlib and codec, output sizes and compatible
+    """
+    cfg = dict(DEFAULT_CONFIG, **(config or {}))
+    results = []
+    for name, body in _codec_payloads(cfg).items():
+        raw = json.dumps(body).encode("utf-8")
+        pretty = json.dumps(body, indent=2, ensure_ascii=False).encode("utf-8")
+        compact = codec.dumps(body)
+        
+        decode_stdlib = _best_of(lambda: json.loads(raw.decode("utf-8")), iterations)
+        decode_codec = _best_of(lambda: codec.loads(raw), iterations)
+        encode_stdlib = _best_of(lambda: json.dumps(body, indent=2, ensure_ascii=False).encode("utf-8"), iterations)
+        encode_codec = _best_of(lambda: codec.dumps(body), iterations)
+        
+        results.append({
+            "name": name,
+            "bytes": len(raw),
+            "decode_stdlib_us": round(decode_stdlib * 1e6, 2),
+            "decode_codec_us": round(decode_codec * 1e6, 2),
+            "encode_stdlib_us": round(encode_stdlib * 1e6, 2),
+            "encode_codec_us": round(encode_codec * 1e6, 2),
+            "pretty_bytes": len(pretty),
+            "compact_bytes": len(compact),
+            "compatible": json.loads(compact.decode("utf-8")) == body and codec.loads(pretty) == body
+        })
+    return results
+
+
+def print_codec_results(results: List[Dict[str, Any]]) -> None:
+    """Print codec benchmark results as a table."""
+    print(f"JSON backend: {codec.BACKEND}")
+    print(f"{'payload':<20} {'bytes':>8} {'decode us':>19} {'encode us':>19} {'file bytes':>17}  result")
+    for r in results:
+        decode_col = f"{r['decode_stdlib_us']:.1f} -> {r['decode_codec_us']:.1f}"
+        encode_col = f"{r['encode_stdlib_us']:.1f} -> {r['encode_codec_us']:.1f}"
+        size_col = f"{r['pretty_bytes']} -> {r['compact_bytes']}"
+        status = "ok" if r["compatible"] else "MISMATCH"
+        print(f"{r['name']:<20} {r['bytes']:>8} {decode_col:>19} {encode_col:>19} {size_col:>17}  {status}")
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Print benchmark results as a table."""
+    print(f"{'benchmark':<38} {'requests':>14} {'seconds':>16} {'bytes':>10}  result")
+    for r in results:
+        requests_col = f"{r['requests']}/{r['budget']}"
+        seconds_col = f"{r['seconds']:.3f}/{r['time_budget']:.3f}"
+        status = "ok" if r["passed"] else "FAIL"
+        print(f"{r['name']:<38} {requests_col:>14} {seconds_col:>16} {r['bytes']:>10}  {status}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark BBClient against a local mock Blackboard")
+    for key, value in DEFAULT_CONFIG.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument("--only", action="append", help="Run only this benchmark (repeatable)")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiply wall-time budgets")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--codec", action="store_true", help="Benchmark the JSON codec instead of the client")
+    parser.add_argument(
+        "--upload", action="store_true",
+        help="Check delta uploads of a failing course against the mock sync server"
+    )
+    parser.add_argument(
+        "--transport", action="append", choices=list(TRANSPORTS),
+        help="Compare HTTP transports on the fan-out benchmarks (repeatable)"
+    )
+    args = parser.parse_args(argv)
+    
+    config = {key: getattr(args, key) for key in DEFAULT_CONFIG}
+    if args.codec:
+        codec_results = run_codec_benchmark(config)
+        print_codec_results(codec_results)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump({"backend": codec.BACKEND, "config": config, "codec": codec_results}, f, indent=2)
+        return 0 if all(r["compatible"] for r in codec_results) else 1
+    
+    if args.upload:
+        upload_results = run_upload_check(config)
+        print_upload_results(upload_results)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump({"config": config, "upload": upload_results}, f, indent=2)
+        return 0 if all(r["passed"] for r in upload_results) else 1
+    
+    if args.transport:
+        transport_results = run_transport_benchmark(config, args.transport, args.only, args.time_scale)
+        print_transport_results(transport_results)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump({"config": config, "transports": transport_results}, f, indent=2)
+        return 0 if all(r["passed"] for runs in transport_results.values() for r in runs) else 1
+    
+    results = run_benchmarks(config, names=args.only, time_scale=args.time_scale)
+    print_results(results)
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"config": config, "results": results}, f, indent=2)
+    
+    return 0 if all(r["passed"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
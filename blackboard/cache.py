@@ -0,0 +1,434 @@
+"""
+Persistent caches shared between BBClient instances.
+
+Caches are plain JSON files, so several clients (or processes) syncing
+students of the same courses can point at the same cache directory.
+"""
+
+import copy
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable
+
+from bbpy import codec
+
+
+class _JSONStore:
+    """
+    Small JSON file store used by the caches below.
+    
+    Reads are served from memory. Every write re-reads the file, applies the
+    change and atomically replaces it, so concurrent writers only race on the
+    same key instead of overwriting each other's entries. The change is applied
+    to a shallow copy that then replaces data, so threads reading data never
+    see it half-updated; changes must replace the top-level values they touch
+    instead of mutating them.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self._lock = threading.RLock()
+        self.data: Dict[str, Any] = self._read()
+    
+    def _read(self) -> Dict[str, Any]:
+        if not self.path or not self.path.exists():
+            return {}
+        try:
+            return codec.load_file(self.path)
+        except (OSError, codec.DecodeError):
+            # A corrupt cache is just an empty cache
+            return {}
+    
+    def update(self, change: Callable[[Dict[str, Any]], None]) -> None:
+        """Apply change(data) to the latest file contents and persist the result."""
+        with self._lock:
+            data = self._read() if self.path else dict(self.data)
+            change(data)
+            if self.path:
+                codec.dump_file(self.path, data)
+            self.data = data
+
+
+class NegativeCache:
+    """
+    Remembers endpoint families that are unavailable for a course.
+    
+    Courses without attendance or gradebook access answer 403/404 on every
+    sync, for every student. Once such a failure is recorded, the endpoint is
+    skipped until the entry expires; the next call after that re-probes it.
+    Each failed re-probe doubles the TTL (up to MAX_TTL).
+    
+    Usage:
+        cache = NegativeCache("cache/unavailable.json")
+        if not cache.is_unavailable(course_id, "meetings"):
+            ...
+    """
+    
+    DEFAULT_TTL = 24 * 3600  # seconds
+    MAX_TTL = 7 * 24 * 3600
+    
+    # Only "this course doesn't have it" failures are cached, not auth or server errors
+    UNAVAILABLE_STATUSES = (403, 404)
+    
+    def __init__(self, path: Optional[str] = None, ttl: int = DEFAULT_TTL):
+        """
+        Initialize the negative cache.
+        
+        Args:
+            path: JSON file to persist entries in (in-memory only if None)
+            ttl: Seconds before an unavailable endpoint is probed again
+        """
+        self.ttl = ttl
+        self._store = _JSONStore(path)
+        self._skipped = 0
+    
+    def is_unavailable(self, course_id: str, family: str) -> bool:
+        """
+        Check whether an endpoint family should be skipped for a course.
+        
+        Args:
+            course_id: Internal course ID
+            family: Endpoint family (e.g. "meetings", "gradebook")
+        
+        Returns:
+            True if the endpoint is known to be unavailable and not due for a re-probe
+        """
+        entry = self._store.data.get(course_id, {}).get(family)
+        if not entry or time.time() >= entry["expires_at"]:
+            return False
+        self._skipped += 1
+        return True
+    
+    def record_failure(self, course_id: str, family: str, status_code: Optional[int]) -> None:
+        """Record a failed request; ignored unless the status means "unavailable"."""
+        if status_code not in self.UNAVAILABLE_STATUSES:
+            return
+        
+        now = time.time()
+        
+        def change(data):
+            families = dict(data.get(course_id, {}))
+            entry = dict(families.get(family) or {
+                "first_seen": now,
+                "failures": 0
+            })
+            entry["failures"] += 1
+            entry["status_code"] = status_code
+            entry["last_probe"] = now
+            entry["expires_at"] = now + min(self.ttl * 2 ** (entry["failures"] - 1), self.MAX_TTL)
+            families[family] = entry
+            data[course_id] = families
+        
+        self._store.update(change)
+    
+    def record_success(self, course_id: str, family: str) -> None:
+        """Forget an endpoint family once it answers again."""
+        if family not in self._store.data.get(course_id, {}):
+            return
+        
+        def change(data):
+            families = dict(data.get(course_id, {}))
+            families.pop(family, None)
+            if families:
+                data[course_id] = families
+            else:
+                data.pop(course_id, None)
+        
+        self._store.update(change)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get negative cache statistics.
+        
+        Returns:
+            Dict with the number of entries, requests skipped by this instance,
+            and per-course entries (status code, failures, first seen, next probe)
+        """
+        now = time.time()
+        courses = {}
+        active = 0
+        for course_id, families in self._store.data.items():
+            for family, entry in families.items():
+                expired = now >= entry["expires_at"]
+                if not expired:
+                    active += 1
+                courses.setdefault(course_id, {})[family] = {
+                    "status_code": entry.get("status_code"),
+                    "failures": entry.get("failures", 0),
+                    "first_seen": entry.get("first_seen"),
+                    "next_probe": entry.get("expires_at"),
+                    "expired": expired
+                }
+        
+        return {
+            "entries": sum(len(families) for families in courses.values()),
+            "active": active,
+            "skipped": self._skipped,
+            "courses": courses
+        }
+
+
+class ContentHandlerCache:
+    """
+    Caches the contentHandler of course content items.
+    
+    Handlers (e.g. isLateAttemptCreationDisallowed) are course content, the
+    same for every student, so one fetch can serve a whole class. Entries are
+    keyed by (course_id, content_id) and expire after the TTL.
+    
+    Usage:
+        cache = ContentHandlerCache("cache/content_handlers.json")
+        handler = cache.get(course_id, content_id)
+        if handler is None:
+            ...
+    """
+    
+    DEFAULT_TTL = 7 * 24 * 3600  # seconds
+    
+    def __init__(self, path: Optional[str] = None, ttl: int = DEFAULT_TTL):
+        """
+        Initialize the content handler cache.
+        
+        Args:
+            path: JSON file to persist entries in (in-memory only if None)
+            ttl: Seconds before a cached handler is fetched again
+        """
+        self.ttl = ttl
+        self._store = _JSONStore(path)
+        self._hits = 0
+        self._misses = 0
+    
+    def get(self, course_id: str, content_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached content handler.
+        
+        Args:
+            course_id: Internal course ID
+            content_id: Content item ID
+        
+        Returns:
+            The contentHandler dict, or None if missing or expired
+        """
+        entry = self._fresh_entry(course_id, content_id)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return entry["handler"]
+    
+    def has(self, course_id: str, content_id: str) -> bool:
+        """Check for a fresh cached handler without counting a hit or miss."""
+        return self._fresh_entry(course_id, content_id) is not None
+    
+    def _fresh_entry(self, course_id: str, content_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._store.data.get(course_id, {}).get(content_id)
+        if not entry or time.time() - entry["fetched_at"] >= self.ttl:
+            return None
+        return entry
+    
+    def set(self, course_id: str, content_id: str, handler: Dict[str, Any]) -> None:
+        """Cache the content handler of one content item."""
+        self.set_many(course_id, {content_id: handler})
+    
+    def set_many(self, course_id: str, handlers: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Cache several content handlers of a course with a single write.
+        
+        Args:
+            course_id: Internal course ID
+            handlers: Dict mapping content ID to its contentHandler
+        """
+        if not handlers:
+            return
+        
+        now = time.time()
+        
+        def change(data):
+            course = dict(data.get(course_id, {}))
+            for content_id, handler in handlers.items():
+                course[content_id] = {"handler": handler, "fetched_at": now}
+            data[course_id] = course
+        
+        self._store.update(change)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get content handler cache statistics.
+        
+        Returns:
+            Dict with number of courses and entries, plus hits/misses of this instance
+        """
+        return {
+            "courses": len(self._store.data),
+            "entries": sum(len(items) for items in self._store.data.values()),
+            "hits": self._hits,
+            "misses": self._misses
+        }
+
+
+@dataclass
+class CachedResult:
+    """A result served by ResultCache.read()."""
+    
+    value: Any
+    # Seconds since the value was fetched (0.0 if fetched by this read)
+    age: float
+    fetched_at: float
+    # A background refresh is running (the value may be replaced soon)
+    refreshing: bool = False
+
+
+class ResultCache:
+    """
+    Stale-while-revalidate cache of whole client results (e.g. get_assignments()).
+    
+    read() returns the last persisted value at once, with its age. When the
+    value is older than max_age, it also starts a background refresh; callers
+    arriving while a refresh of the same key runs join it instead of starting
+    another. Only a cold read (nothing cached yet) waits for the network.
+    A failed background refresh keeps the stale value (see stats()).
+    
+    fetch runs on a background thread, so it must be safe to call alongside
+    the caller's own use of the client (BBClient is). Values are stored and
+    returned as copies: a caller mutating its result changes neither the
+    cache nor the results of other callers.
+    
+    Usage:
+        cache = ResultCache("cache/results/student.json", max_age=300)
+        result = cache.read("assignments", client.get_assignments)
+        render(result.value, result.age)
+    """
+    
+    DEFAULT_MAX_AGE = 300  # seconds
+    
+    def __init__(self, path: Optional[str] = None, max_age: float = DEFAULT_MAX_AGE):
+        """
+        Initialize the result cache.
+        
+        Args:
+            path: JSON file to persist results in (in-memory only if None)
+            max_age: Seconds after which a read triggers a background refresh
+        """
+        self.max_age = max_age
+        self._store = _JSONStore(path)
+        self._lock = threading.Lock()
+        self._refreshes: Dict[str, Future] = {}
+        self._hits = 0
+        self._misses = 0
+        self._refreshed = 0
+        self._coalesced = 0
+        self._errors: Dict[str, str] = {}
+    
+    def read(
+        self,
+        key: str,
+        fetch: Callable[[], Any],
+        max_age: Optional[float] = None
+    ) -> CachedResult:
+        """
+        Read a result, refreshing it in the background if stale.
+        
+        Args:
+            key: Result name
+            fetch: Function returning the fresh (JSON-serializable) value
+            max_age: Override of the cache's max_age for this read
+        
+        Returns:
+            CachedResult with the cached (or, on a cold read, fetched) value
+        
+        Raises:
+            Whatever fetch raises, on a cold read only
+        """
+        max_age = self.max_age if max_age is None else max_age
+        entry = self._store.data.get(key)
+        
+        if entry is None:
+            self._misses += 1
+            self._refresh(key, fetch).result()
+            entry = self._store.data[key]
+            return CachedResult(copy.deepcopy(entry["value"]), 0.0, entry["fetched_at"])
+        
+        self._hits += 1
+        age = max(0.0, time.time() - entry["fetched_at"])
+        refreshing = age >= max_age
+        if refreshing:
+            self._refresh(key, fetch)
+        return CachedResult(copy.deepcopy(entry["value"]), age, entry["fetched_at"], refreshing)
+    
+    def _refresh(self, key: str, fetch: Callable[[], Any]) -> Future:
+        """Start a refresh of key, or return the one already running."""
+        with self._lock:
+            future = self._refreshes.get(key)
+            if future is not None:
+                self._coalesced += 1
+                return future
+            future = Future()
+            self._refreshes[key] = future
+        
+        def run():
+            try:
+                value = fetch()
+                self.set(key, value)
+                self._refreshed += 1
+                self._errors.pop(key, None)
+                future.set_result(value)
+            except BaseException as e:
+                self._errors[key] = repr(e)
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._refreshes.pop(key, None)
+        
+        threading.Thread(target=run, name=f"refresh:{key}", daemon=True).start()
+        return future
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store (a copy of) a fresh value (e.g. after a regular blocking call)."""
+        now = time.time()
+        value = copy.deepcopy(value)
+        
+        def change(data):
+            data[key] = {"value": value, "fetched_at": now}
+        
+        self._store.update(change)
+    
+    def wait(self, key: Optional[str] = None, timeout: Optional[float] = None) -> None:
+        """
+        Wait for running refreshes (of key, or all) to finish.
+        
+        Args:
+            key: Result name (all keys if None)
+            timeout: Max seconds to wait per refresh
+        """
+        with self._lock:
+            futures = [f for k, f in self._refreshes.items() if key is None or k == key]
+        for future in futures:
+            try:
+                future.result(timeout)
+            except Exception:
+                pass
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get result cache statistics.
+        
+        Returns:
+            Dict with cached keys and their age, hits, misses (cold reads),
+            refreshes, coalesced callers, running refreshes and the last
+            error of each key whose refresh failed
+        """
+        now = time.time()
+        with self._lock:
+            running = sorted(self._refreshes)
+        return {
+            "keys": {key: round(now - entry["fetched_at"], 1) for key, entry in self._store.data.items()},
+            "hits": self._hits,
+            "misses": self._misses,
+            "refreshed": self._refreshed,
+            "coalesced": self._coalesced,
+            "running": running,
+            "errors": dict(self._errors)
+        }
@@ -0,0 +1,130 @@
+"""
+Indexed course lookups over cached .id data.
+"""
+
+from typing import Optional, List, Dict, Any, Iterator
+
+from bbpy.auth import parse_course_info
+from bbpy.records import Course
+
+
+class CourseCatalog:
+    """
+    Constant-time course lookups built from cached .id courses.
+    
+    Accepts both the .id file format ({"name", "course_id", "internal_id", ...})
+    and raw API course objects ({"id", "courseId", "name": "Name__Class", ...}),
+    normalizing them to the .id format with an extra "class_name" key
+    (or to Course records with records=True).
+    
+    Usage:
+        catalog = CourseCatalog(cached_data["courses"], class_name="4SAE11")
+        course = catalog.get("_16318_1")
+        name = catalog.name_of("_16318_1")
+    """
+    
+    def __init__(
+        self,
+        courses: List[Dict[str, Any]],
+        class_name: Optional[str] = None,
+        records: bool = False
+    ):
+        """
+        Build the catalog indexes.
+        
+        Args:
+            courses: Cached courses (.id format or raw API objects)
+            class_name: Fallback class name for courses that don't carry one
+                        (the .id format only stores the class on the user)
+            records: Store compact Course records instead of dicts
+        """
+        self._courses: List[Dict[str, Any]] = []
+        self._by_internal_id: Dict[str, Dict[str, Any]] = {}
+        self._by_course_id: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_class: Dict[str, List[Dict[str, Any]]] = {}
+        
+        for course in courses:
+            entry = self._normalize(course, class_name)
+            if records:
+                entry = Course.from_dict(entry)
+            self._courses.append(entry)
+            
+            if entry.get("internal_id"):
+                self._by_internal_id[entry["internal_id"]] = entry
+            if entry.get("course_id"):
+                self._by_course_id.setdefault(entry["course_id"], []).append(entry)
+            if entry.get("class_name"):
+                self._by_class.setdefault(entry["class_name"], []).append(entry)
+    
+    @staticmethod
+    def _normalize(course: Dict[str, Any], class_name: Optional[str]) -> Dict[str, Any]:
+        """Convert a cached course to the .id format with a class_name."""
+        if "internal_id" in course:
+            entry = dict(course)
+            entry.setdefault("class_name", class_name)
+            return entry
+        
+        # Raw API course (e.g. right after generate_id_file)
+        parsed = parse_course_info(course.get("name", ""), course.get("courseId", ""))
+        return {
+            "name": parsed["name"],
+            "course_id": parsed["course_id"],
+            "internal_id": course.get("id"),
+            "url": course.get("externalAccessUrl", ""),
+            "professors": course.get("professors", []),
+            "class_name": parsed["class_name"] or class_name
+        }
+    
+    def __len__(self) -> int:
+        return len(self._courses)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._courses)
+    
+    def __contains__(self, internal_id: str) -> bool:
+        return internal_id in self._by_internal_id
+    
+    def get(self, internal_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a course by its internal ID.
+        
+        Args:
+            internal_id: Internal course ID (e.g., "_16318_1")
+        
+        Returns:
+            Course dictionary or None if not in the catalog
+        """
+        return self._by_internal_id.get(internal_id)
+    
+    def name_of(self, internal_id: str) -> Optional[str]:
+        """Get the name of a course by its internal ID (None if unknown)."""
+        course = self._by_internal_id.get(internal_id)
+        return course.get("name") if course else None
+    
+    def find_by_course_id(self, course_id: str) -> List[Dict[str, Any]]:
+        """
+        Get courses by course code.
+        
+        Args:
+            course_id: Course code without class suffix (e.g., "ESE.TC-21")
+        
+        Returns:
+            List of matching courses (one per class the course is given to)
+        """
+        return list(self._by_course_id.get(course_id, []))
+    
+    def for_class(self, class_name: str) -> List[Dict[str, Any]]:
+        """
+        Get all courses of a class.
+        
+        Args:
+            class_name: Class name (e.g., "4SAE11")
+        
+        Returns:
+            List of courses of that class
+        """
+        return list(self._by_class.get(class_name, []))
+    
+    def internal_ids(self) -> List[str]:
+        """Get the internal IDs of all courses, in cached order."""
+        return [c["internal_id"] for c in self._courses if c.get("internal_id")]
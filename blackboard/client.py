@@ -2,13 +2,29 @@
 Main BBClient class for interacting with Blackboard API.
 """
 
-import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence
 
 import requests
 
-from bbpy.auth import login_with_selenium, save_id_file, load_id_file, update_id_file_cookies
+from bbpy import codec
+from bbpy.auth import (
+    login_with_selenium, save_id_file, load_id_file,
+    update_id_file_cookies, update_id_file_attendance
+)
+from bbpy.cache import NegativeCache, ContentHandlerCache, ResultCache, CachedResult
+from bbpy.catalog import CourseCatalog
+from bbpy.dashboard import DashboardView
+from bbpy.dates import parse_datetime
+from bbpy.deadlines import DeadlineIndex
+from bbpy.metrics import RequestMetrics, normalize_endpoint
+from bbpy.profiling import Profiler, profiled, span
+from bbpy.records import Assignment, AttendanceRecord, Meeting
+from bbpy.transport import Transport, RequestsTransport
 from bbpy.exceptions import BBAuthError, BBAPIError
 
 
@@ -21,6 +37,15 @@ class BBClient:
     - Get instructor/professor data
     - Get attendance records
     
+    Thread safety: one client can serve concurrent requests (e.g. in a web
+    server). The session and cached data are only ever replaced as a whole
+    under a lock, never mutated in place, so get_cached_data() returns a
+    consistent snapshot; writes to the .id file are serialized. Sessions are
+    only re-authenticated when the client is built: a long-lived client
+    whose session expires (API calls fail with 401) recovers with reload()
+    once the .id file was refreshed, e.g. by bbpy.reauth. Profiling is not
+    thread-aware: only use profile() on a client that is not shared.
+    
     Usage:
         # With existing .id file
         client = BBClient(id_path="username.id")
@@ -34,13 +59,51 @@ class BBClient:
     
     DEFAULT_DOMAIN = "https://esprit.blackboard.com"
     
+    # Meetings that started within this many days before the last attendance
+    # sync are re-queried, since professors often correct attendance late
+    ATTENDANCE_REOPEN_DAYS = 14
+    
+    # Max parallel per-meeting requests when the bulk attendance endpoint is unavailable
+    ATTENDANCE_MAX_WORKERS = 8
+    
+    # Max parallel content requests when warming the content handler cache
+    CONTENT_WARM_WORKERS = 8
+    
+    # Fields requested from the API (fields= projection) on internal call paths:
+    # only what the client reads. Public get_* methods return full objects by default.
+    USER_ID_FIELDS = ("id",)
+    USER_FIELDS = ("id", "userName", "name", "contact")
+    MEMBERSHIP_FIELDS = ("id", "userId", "courseId", "courseRoleId", "availability")
+    COURSE_FIELDS = ("id", "courseId", "name", "externalAccessUrl")
+    ROSTER_FIELDS = ("userId", "courseRoleId")
+    COLUMN_FIELDS = ("id", "name", "contentId", "grading", "score")
+    GRADE_FIELDS = ("status", "score")
+    CONTENT_FIELDS = ("contentHandler",)
+    MEETING_FIELDS = ("id", "courseId", "title", "start", "end")
+    ATTENDANCE_FIELDS = ("id", "meetingId", "userId", "status")
+    
+    # Results served by read(), with the method fetching them
+    READS = {
+        "assignments": "get_assignments",
+        "assignment_stats": "get_assignment_stats",
+        "attendance_percentage": "get_attendance_percentage",
+        "enrolled_courses": "get_enrolled_courses"
+    }
+    
+    # Seconds before a read() result is refreshed in the background
+    READ_MAX_AGE = 300
+    
     def __init__(
         self,
         id_path: Optional[str] = None,
         username: Optional[str] = None,
         password: Optional[str] = None,
         domain: str = DEFAULT_DOMAIN,
-        auto_refresh: bool = True
+        auto_refresh: bool = True,
+        cache_dir: Optional[str] = None,
+        metrics: Optional[RequestMetrics] = None,
+        transport: Optional[Transport] = None,
+        dashboard_path: Optional[str] = None
     ):
         """
         Initialize the Blackboard client.
@@ -51,16 +114,52 @@ class BBClient:
             password: Blackboard password (for Selenium login)
             domain: Blackboard domain URL
             auto_refresh: If True and session is expired, auto-login with credentials
+            cache_dir: Directory for caches shared between clients (in-memory if None)
+            metrics: RequestMetrics to record requests in (pass one instance to
+                     several clients to aggregate them)
+            transport: Transport performing the HTTP requests (requests backend if None),
+                       e.g. RecordingTransport or ReplayTransport
+            dashboard_path: Dashboard view file rewritten (if changed) after
+                            generate_id_file() and re-authentication
         """
         self.domain = domain
         self.api_url = f"{domain}/learn/api/public/v1"
         self.session: Optional[requests.Session] = None
+        self.transport = transport or RequestsTransport()
         self._user_id: Optional[str] = None
         self._username = username
         self._password = password
         self._id_path = id_path
         self._auto_refresh = auto_refresh
         self._cached_data: Optional[dict] = None  # Cached user/course data from .id file
+        self._attendance_dirty = False  # Attendance ledger has unsaved changes
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+        self.metrics = metrics if metrics is not None else RequestMetrics()
+        self._profiler: Optional[Profiler] = None
+        self._results: Optional[ResultCache] = None
+        self._deadlines: Optional[DeadlineIndex] = None
+        # (cached courses list, CourseCatalog built from it)
+        self._catalog: Optional[tuple] = None
+        
+        # Guards swaps of session and cached data (incl. the attendance ledger)
+        self._lock = threading.RLock()
+        # One re-authentication at a time; serialized .id file writes
+        self._auth_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        # Per-thread state of the running attendance pass (see _attendance_pass)
+        self._local = threading.local()
+        
+        self.dashboard = DashboardView(dashboard_path) if dashboard_path else None
+        
+        # Course endpoints that answered 403/404 (shared across students via cache_dir)
+        self.negative_cache = NegativeCache(
+            str(self._cache_dir / "unavailable.json") if self._cache_dir else None
+        )
+        
+        # Content handlers (accepts_late lookups) are the same for every student
+        self.content_cache = ContentHandlerCache(
+            str(self._cache_dir / "content_handlers.json") if self._cache_dir else None
+        )
         
         # Authenticate
         if id_path and Path(id_path).exists():
@@ -97,12 +196,21 @@ class BBClient:
             )
     
     def _refresh_authentication(self) -> None:
-        """Refresh authentication using Selenium login."""
+        """Refresh authentication using Selenium login (only called from __init__)."""
         if not self._username or not self._password:
             raise BBAuthError("Cannot refresh: username or password not provided")
         
+        with self._auth_lock:
+            self._login_and_store()
+    
+    def _login_and_store(self) -> None:
+        """Selenium login, then store the new session (caller holds _auth_lock)."""
         print("🔄 Refreshing authentication with Selenium...")
-        self.session = login_with_selenium(self._username, self._password, self.domain)
+        session = login_with_selenium(self._username, self._password, self.domain)
+        
+        # Requests in flight keep the session they started with
+        with self._lock:
+            self.session = session
         
         # Validate the new session first
         self._validate_auth()
@@ -113,32 +221,41 @@ class BBClient:
         if has_existing_id:
             # Update only cookies, keep existing user/course data
             print(f"📝 Updating cookies in existing .id file: {self._id_path}")
-            update_id_file_cookies(self._id_path, self.session)
+            with self._write_lock:
+                update_id_file_cookies(self._id_path, session)
+                
+                # Reload the .id file to populate cached data
+                _, cached_data = load_id_file(self._id_path)
             print("✅ Cookies refreshed successfully!")
-            
-            # Reload the .id file to populate cached data
-            _, self._cached_data = load_id_file(self._id_path)
+            with self._lock:
+                self._cached_data = cached_data
         else:
             # Generate full .id file with user data and courses
             if self._id_path:
-                self.generate_id_file(self._id_path)
+                self._generate_id_file(self._id_path)
             elif self._username:
                 # Default to username.id
                 id_file = f"{self._username}.id"
-                self.generate_id_file(id_file)
+                self._generate_id_file(id_file)
                 self._id_path = id_file
         
-        # Update isNerd and isAttending stats
+        # Update isNerd and isAttending stats; the dashboard reuses the same sync
         print("📊 Updating stats (isNerd, isAttending)...")
+        assignments = attendance_stats = None
         try:
-            self.is_nerd()
-            self.is_attending()
+            assignments = self.get_assignments()
+            attendance_stats = self.get_attendance_percentage()
+            self.is_nerd(self.get_assignment_stats(assignments))
+            self.is_attending(attendance_stats)
             print("✅ Stats updated!")
         except Exception:
             print("⚠️ Could not update stats (API may be slow)")
+        
+        self._update_dashboard(assignments, attendance_stats)
 
 
     
+    @profiled
     def generate_id_file(self, id_path: str) -> None:
         """
         Generate an enriched .id file with cookies, user data, and course information.
@@ -146,63 +263,288 @@ class BBClient:
         Args:
             id_path: Path to save the .id file
         """
+        self._generate_id_file(id_path)
+        self._update_dashboard()
+    
+    def _generate_id_file(self, id_path: str) -> None:
+        """generate_id_file() without the dashboard stage (re-authentication runs it once, at the end)."""
         print(f"📝 Generating .id file: {id_path}")
         
         # Get user data
-        user_data = self.get_current_user()
+        user_data = self.get_current_user(fields=self.USER_FIELDS)
         
         # Get enrolled courses
-        courses = self.get_enrolled_courses()
+        courses = self.get_enrolled_courses(fields=self.COURSE_FIELDS)
         
         # Get instructors
-        instructors = self.get_course_instructors()
+        instructors = self.get_course_instructors(fields=self.USER_FIELDS)
         
         # Save the .id file (with credentials for future auto-refresh)
-        save_id_file(
-            id_path, self.session, user_data, courses, instructors,
-            username=self._username, password=self._password
-        )
+        with self._write_lock:
+            save_id_file(
+                id_path, self.session, user_data, courses, instructors,
+                username=self._username, password=self._password
+            )
         
         # Update cached data
-        self._cached_data = {
+        class_name = courses[0].get("name", "").split("__")[1] if courses and "__" in courses[0].get("name", "") else None
+        cached_data = {
             "user": {
                 "name": f"{user_data.get('name', {}).get('given', '')} {user_data.get('name', {}).get('family', '')}".strip(),
                 "username": user_data.get("userName", ""),
                 "email": user_data.get("contact", {}).get("email", ""),
-                "class": courses[0].get("name", "").split("__")[1] if courses and "__" in courses[0].get("name", "") else None
+                "class": class_name
             },
             "courses": courses,
-            "credentials": {"username": self._username, "password": self._password} if self._username else None
+            "credentials": {"username": self._username, "password": self._password} if self._username else None,
+            "attendance": {}
         }
+        with self._lock:
+            self._cached_data = cached_data
         
         print(f"✅ .id file generated successfully!")
     
-    def get_cached_data(self) -> Optional[dict]:
+    def update_dashboard(
+        self,
+        path: Optional[str] = None,
+        assignments: Optional[List[Dict[str, Any]]] = None,
+        attendance_stats: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Rebuild the dashboard view and write it if its content changed.
+        
+        Args:
+            path: View file (the client's dashboard_path if None)
+            assignments: get_assignments() result, if already fetched
+            attendance_stats: get_attendance_percentage() result, if already computed
+        
+        Returns:
+            True if the file was (re)written
+        
+        Raises:
+            ValueError: If no path is given and the client has no dashboard_path
+        """
+        view = DashboardView(path) if path else self.dashboard
+        if view is None:
+            raise ValueError("No dashboard path: pass one or set BBClient(dashboard_path=...)")
+        return view.update(self, assignments=assignments, attendance_stats=attendance_stats)
+    
+    def _update_dashboard(
+        self,
+        assignments: Optional[List[Dict[str, Any]]] = None,
+        attendance_stats: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Sync stage after (re)authentication: refresh the dashboard view, if configured."""
+        if self.dashboard is None:
+            return
+        try:
+            if self.update_dashboard(assignments=assignments, attendance_stats=attendance_stats):
+                print(f"📊 Dashboard view updated: {self.dashboard.path}")
+        except Exception as e:
+            print(f"⚠️ Could not update the dashboard view: {e}")
+    
+    def reload(self) -> None:
+        """
+        Re-read the .id file and swap in its session and cached data.
+        
+        The recovery path of long-lived clients whose session expired: once
+        another process (e.g. bbpy.reauth) refreshed the cookies, reload()
+        swaps them in. Requests in flight finish with the previous session.
+        
+        Raises:
+            BBAuthError: If the client has no .id file, it cannot be loaded,
+                         or its session is not valid
+        """
+        if not self._id_path:
+            raise BBAuthError("Cannot reload: client has no .id file")
+        session, cached_data = load_id_file(self._id_path)
+        with self._lock:
+            self.session = session
+            self._cached_data = cached_data
+            self._attendance_dirty = False
+        self._validate_auth()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics for the client's caches.
+        
+        Returns:
+            Dict with "unavailable" (negative cache: courses whose endpoints
+            answer 403/404, and how many requests were skipped),
+            "content_handlers" (content handler cache size, hits and misses)
+            and "results" (read() results, refreshes and errors)
+        """
+        return {
+            "unavailable": self.negative_cache.stats(),
+            "content_handlers": self.content_cache.stats(),
+            "results": self.results_cache.stats()
+        }
+    
+    @property
+    def user_id(self) -> Optional[str]:
+        """Internal ID of the authenticated user (e.g. "_12345_1"), set by auth validation."""
+        return self._user_id
+    
+    @property
+    def results_cache(self) -> ResultCache:
+        """Cache of read() results (persisted per student in cache_dir/results)."""
+        with self._lock:
+            if self._results is None:
+                path = None
+                username = ((self._cached_data or {}).get("user") or {}).get("username")
+                if self._cache_dir and username:
+                    path = str(self._cache_dir / "results" / f"{username}.json")
+                self._results = ResultCache(path, max_age=self.READ_MAX_AGE)
+            return self._results
+    
+    @property
+    def deadlines(self) -> DeadlineIndex:
+        """
+        Sorted deadline index, rebuilt by every get_assignments() call.
+        
+        Persisted per student in cache_dir/deadlines, so upcoming(),
+        due_between() and overdue_available() work before the first sync of
+        a new process.
+        """
+        with self._lock:
+            if self._deadlines is None:
+                path = None
+                username = ((self._cached_data or {}).get("user") or {}).get("username")
+                if self._cache_dir and username:
+                    path = str(self._cache_dir / "deadlines" / f"{username}.json")
+                self._deadlines = DeadlineIndex(path)
+            return self._deadlines
+    
+    def read(self, name: str, max_age: Optional[float] = None) -> CachedResult:
+        """
+        Read a result instantly from cache (stale-while-revalidate).
+        
+        Returns the last persisted result with its age. If it is older than
+        max_age, a background refresh starts; concurrent reads of the same
+        result share that refresh. Only the first read of a result (nothing
+        cached yet) waits for the network.
+        
+        Args:
+            name: One of READS ("assignments", "assignment_stats",
+                  "attendance_percentage", "enrolled_courses")
+            max_age: Seconds before a refresh is due (READ_MAX_AGE if None)
+        
+        Returns:
+            CachedResult with value (as the get_* method returns it), age in
+            seconds, fetched_at and refreshing
+        
+        Raises:
+            ValueError: If the name is unknown
+            BBAPIError: On a cold read that fails
+        
+        Usage:
+            result = client.read("assignments")
+            print(f"{len(result.value)} assignments, {result.age:.0f}s old")
+        """
+        if name not in self.READS:
+            raise ValueError(f"Unknown result {name!r}, expected one of {sorted(self.READS)}")
+        
+        fetch = getattr(self, self.READS[name])
+        result = self.results_cache.read(name, fetch, max_age)
+        return result
+    
+    def get_course_catalog(self) -> CourseCatalog:
+        """
+        Get the indexed view of cached courses.
+        
+        Returns:
+            CourseCatalog with lookups by internal ID, course code and class
+        """
+        cached_data = self._cached_data or {}
+        courses = cached_data.get("courses") or []
+        built = self._catalog
+        if built is None or built[0] is not courses:
+            # Rebuilt only when the cached courses are replaced (new .id data)
+            catalog = CourseCatalog(courses, class_name=(cached_data.get("user") or {}).get("class"))
+            built = self._catalog = (courses, catalog)
+        return built[1]
+    
+    def get_metrics(self, format: str = "json") -> Any:
+        """
+        Get request metrics (latency histograms, status codes, bytes, retries per endpoint).
+        
+        Args:
+            format: "json" for a snapshot dict, "prometheus" for the text exposition format
+        
+        Returns:
+            Snapshot dictionary or Prometheus text
+        """
+        if format == "prometheus":
+            return self.metrics.to_prometheus()
+        return self.metrics.snapshot()
+    
+    @contextmanager
+    def profile(self, trace_memory: bool = False):
+        """
+        Profile the client calls made inside the block.
+        
+        Records a call tree (operation -> course -> column -> request, with JSON
+        decoding as its own span) with wall and CPU time per span.
+        
+        The profiler is one per client, not per thread: every call made
+        through the client while the block runs is recorded, including calls
+        of other threads and read() background refreshes. Only profile a
+        client that is not shared with other threads.
+        
+        Args:
+            trace_memory: Also record tracemalloc peaks per span (slower)
+        
+        Usage:
+            with client.profile() as prof:
+                client.get_assignments()
+            prof.write_speedscope("sync.speedscope.json")
+        """
+        profiler = Profiler(trace_memory=trace_memory)
+        previous = self._profiler
+        self._profiler = profiler
+        try:
+            with profiler:
+                yield profiler
+        finally:
+            self._profiler = previous
+    
+    def get_cached_data(self) -> Optional[Dict[str, Any]]:
         """
         Get cached user and course data from .id file.
         
         Returns:
-            Cached data dictionary or None if not available
+            Shallow copy of the cached data (the client replaces it on
+            changes, so a copy never changes under the caller), or None
+            if not available
         """
-        return self._cached_data
+        cached_data = self._cached_data
+        return dict(cached_data) if cached_data is not None else None
     
     def _validate_auth(self) -> None:
         """Validate that authentication is working."""
         try:
-            user_data = self._get("/users/me")
+            user_data = self._get("/users/me", fields=self.USER_ID_FIELDS)
             self._user_id = user_data.get("id")
         except BBAPIError as e:
             if e.status_code == 401:
                 raise BBAuthError("Cookie has expired or is invalid (401 Unauthorized)")
             raise BBAuthError(f"Authentication validation failed: {e}")
     
-    def _get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+    def _request(
+        self,
+        version: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
         """
-        Make a GET request to the API.
+        Make a GET request to the API and record it in the client metrics.
         
         Args:
+            version: API version ("v1" or "v2")
             endpoint: API endpoint (without base URL)
             params: Query parameters
+            fields: Fields to return (the API's fields= projection); all if None
             
         Returns:
             JSON response as dictionary
@@ -210,38 +552,88 @@ class BBClient:
         Raises:
             BBAPIError: If request fails
         """
-        url = f"{self.api_url}{endpoint}"
-        
+        url = f"{self.domain}/learn/api/public/{version}{endpoint}"
+        if fields:
+            params = dict(params or {}, fields=",".join(fields))
+        label = "API request failed" if version == "v1" else f"API {version} request failed"
+        
+        status = None
+        response_bytes = 0
+        start = time.perf_counter()
         try:
-            response = self.session.get(url, params=params)
+            with span(self, f"GET {normalize_endpoint(f'/{version}{endpoint}')}"):
+                response = self.transport.get(self.session, url, params)
+                status = response.status_code
+                response_bytes = len(response.content)
             
             if response.status_code == 200:
-                return response.json()
+                with span(self, "decode"):
+                    try:
+                        return codec.loads(response.content)
+                    except (codec.DecodeError, UnicodeDecodeError) as e:
+                        # e.g. an HTML login page served instead of JSON
+                        raise BBAPIError(
+                            f"{label}: {endpoint} (invalid JSON: {e})",
+                            status_code=response.status_code,
+                            response=response.text
+                        )
             else:
                 raise BBAPIError(
-                    f"API request failed: {endpoint}",
+                    f"{label}: {endpoint}",
                     status_code=response.status_code,
                     response=response.text
                 )
         except requests.RequestException as e:
             raise BBAPIError(f"Request error: {e}")
+        finally:
+            self.metrics.record(
+                f"/{version}{endpoint}", status, time.perf_counter() - start, response_bytes
+            )
     
-    def _get_paginated(self, endpoint: str, params: Optional[Dict] = None) -> List[Dict]:
+    def _get(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Make a GET request to the API.
+        
+        Args:
+            endpoint: API endpoint (without base URL)
+            params: Query parameters
+            fields: Fields to return; all if None
+        
+        Returns:
+            JSON response as dictionary
+        
+        Raises:
+            BBAPIError: If request fails
+        """
+        return self._request("v1", endpoint, params, fields)
+    
+    def _get_paginated(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict]:
         """
         Make paginated GET requests and return all results.
         
         Args:
             endpoint: API endpoint
             params: Query parameters
+            fields: Fields to return for each result; all if None
             
         Returns:
             List of all results across pages
         """
         all_results = []
-        params = params or {}
+        params = dict(params or {})
         
         while True:
-            data = self._get(endpoint, params)
+            data = self._get(endpoint, params, fields)
             results = data.get("results", [])
             all_results.extend(results)
             
@@ -262,49 +654,47 @@ class BBClient:
         
         return all_results
     
-    def _get_v2(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+    def _get_v2(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
         """
         Make a GET request to the v2 API.
         
         Args:
             endpoint: API endpoint (without base URL)
             params: Query parameters
+            fields: Fields to return; all if None
             
         Returns:
             JSON response as dictionary
         """
-        url = f"{self.domain}/learn/api/public/v2{endpoint}"
-        
-        try:
-            response = self.session.get(url, params=params)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise BBAPIError(
-                    f"API v2 request failed: {endpoint}",
-                    status_code=response.status_code,
-                    response=response.text
-                )
-        except requests.RequestException as e:
-            raise BBAPIError(f"Request error: {e}")
+        return self._request("v2", endpoint, params, fields)
     
-    def _get_paginated_v2(self, endpoint: str, params: Optional[Dict] = None) -> List[Dict]:
+    def _get_paginated_v2(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict]:
         """
         Make paginated GET requests to v2 API and return all results.
         
         Args:
             endpoint: API endpoint
             params: Query parameters
+            fields: Fields to return for each result; all if None
             
         Returns:
             List of all results across pages
         """
         all_results = []
-        params = params or {}
+        params = dict(params or {})
         
         while True:
-            data = self._get_v2(endpoint, params)
+            data = self._get_v2(endpoint, params, fields)
             results = data.get("results", [])
             all_results.extend(results)
             
@@ -323,15 +713,25 @@ class BBClient:
         
         return all_results
     
-    def get_course_assignments(self, course_id: str) -> List[Dict[str, Any]]:
+    @profiled
+    def get_course_assignments(
+        self,
+        course_id: str,
+        records: bool = False,
+        strict: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         Get all assignments for a specific course.
         
         Args:
             course_id: Internal course ID (e.g., "_123456_1")
+            records: Return compact Assignment records instead of dicts
+            strict: Raise BBAPIError if the gradebook can't be fetched, instead
+                    of returning [] (which a course without assignments also
+                    returns). Courses known to be unavailable still return [].
             
         Returns:
-            List of assignment dictionaries with:
+            List of assignment dictionaries (or Assignment records) with:
             - id: Gradebook column ID
             - name: Assignment name
             - course_id: Internal course ID
@@ -344,26 +744,35 @@ class BBClient:
             - graded: Whether assignment has been graded
             - is_past_due: Whether current date is after due date
             - grading_type: "Attempts", "Manual", or "Calculated"
+        
+        Raises:
+            BBAPIError: In strict mode, if the gradebook columns can't be fetched
         """
-        from datetime import datetime
+        from datetime import datetime, timezone
         
         assignments = []
         
+        if self.negative_cache.is_unavailable(course_id, "gradebook"):
+            return []
+        
         try:
             # Get gradebook columns from v2 API
-            columns = self._get_paginated_v2(f"/courses/{course_id}/gradebook/columns")
-        except BBAPIError:
+            columns = self._get_paginated_v2(
+                f"/courses/{course_id}/gradebook/columns", fields=self.COLUMN_FIELDS
+            )
+        except BBAPIError as e:
             # Course might not have gradebook or we don't have access
+            self.negative_cache.record_failure(course_id, "gradebook", e.status_code)
+            if strict:
+                raise
             return []
+        self.negative_cache.record_success(course_id, "gradebook")
         
         # Get course name from cached data if available
-        course_name = None
-        if self._cached_data:
-            for course in self._cached_data.get("courses", []):
-                # Match by checking if course_id contains the cached course_id
-                if course.get("course_id") and course.get("course_id") in str(course_id):
-                    course_name = course.get("name")
-                    break
+        course_name = self.get_course_catalog().name_of(course_id)
+        
+        # Content handlers fetched on cache misses, written in one cache update
+        fetched_handlers: Dict[str, Dict[str, Any]] = {}
         
         for column in columns:
             column_id = column.get("id")
@@ -378,60 +787,53 @@ class BBClient:
             due = grading.get("due")
             
             # Determine if past due
-            is_past_due = False
-            if due:
-                try:
-                    due_dt = datetime.fromisoformat(due.replace("Z", "+00:00"))
-                    is_past_due = datetime.now(due_dt.tzinfo) > due_dt
-                except (ValueError, TypeError):
-                    pass
-            
-            # Get user's grade for this column
-            score = None
-            status = "NotSubmitted"
-            graded = False
-            submitted = False
+            due_dt = parse_datetime(due)
+            is_past_due = due_dt is not None and datetime.now(timezone.utc) > due_dt
             
-            try:
-                grade_url = f"/courses/{course_id}/gradebook/columns/{column_id}/users/{self._user_id}"
-                grade = self._get(grade_url)
+            with span(self, f"column:{column_id}"):
+                # Get user's grade for this column
+                score = None
+                status = "NotSubmitted"
+                graded = False
+                submitted = False
                 
-                grade_status = grade.get("status")
-                score = grade.get("score")
-                
-                if grade_status == "Graded":
-                    status = "Graded"
-                    graded = True
-                    submitted = True
-                elif grade_status == "NeedsGrading":
-                    status = "Submitted"
-                    submitted = True
-                elif grade_status:
-                    # Has some status but not graded
-                    status = grade_status
-                    submitted = True
-                elif score is not None:
-                    # Has score but no status (shouldn't happen often)
-                    status = "Graded"
-                    graded = True
-                    submitted = True
-                # If no grade record exists, status remains "NotSubmitted"
-                    
-            except BBAPIError:
-                # No grade record - not submitted
-                pass
-            
-            # Check if late submissions are allowed (fetch content info)
-            accepts_late = True  # Default to true
-            content_id = column.get("contentId")
-            if content_id:
                 try:
-                    content = self._get(f"/courses/{course_id}/contents/{content_id}")
-                    handler = content.get("contentHandler", {})
-                    # isLateAttemptCreationDisallowed = true means late NOT allowed
-                    accepts_late = not handler.get("isLateAttemptCreationDisallowed", False)
+                    grade_url = f"/courses/{course_id}/gradebook/columns/{column_id}/users/{self._user_id}"
+                    grade = self._get(grade_url, fields=self.GRADE_FIELDS)
+                    
+                    grade_status = grade.get("status")
+                    score = grade.get("score")
+                    
+                    if grade_status == "Graded":
+                        status = "Graded"
+                        graded = True
+                        submitted = True
+                    elif grade_status == "NeedsGrading":
+                        status = "Submitted"
+                        submitted = True
+                    elif grade_status:
+                        # Has some status but not graded
+                        status = grade_status
+                        submitted = True
+                    elif score is not None:
+                        # Has score but no status (shouldn't happen often)
+                        status = "Graded"
+                        graded = True
+                        submitted = True
+                    # If no grade record exists, status remains "NotSubmitted"
+                
                 except BBAPIError:
+                    # No grade record - not submitted
                     pass
+                
+                # Check if late submissions are allowed (fetch content info)
+                accepts_late = True  # Default to true
+                content_id = column.get("contentId")
+                if content_id:
+                    handler = self._get_content_handler(course_id, content_id, fetched_handlers)
+                    if handler is not None:
+                        # isLateAttemptCreationDisallowed = true means late NOT allowed
+                        accepts_late = not handler.get("isLateAttemptCreationDisallowed", False)
             
             assignment = {
                 "id": column_id,
@@ -450,26 +852,134 @@ class BBClient:
                 "grading_type": grading_type
             }
             
-            assignments.append(assignment)
+            assignments.append(Assignment(**assignment) if records else assignment)
         
+        self.content_cache.set_many(course_id, fetched_handlers)
         return assignments
     
-    def get_assignments(self) -> List[Dict[str, Any]]:
+    def _get_content_handler(
+        self,
+        course_id: str,
+        content_id: str,
+        fetched: Dict[str, Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the contentHandler of a content item, from the cache when possible.
+        
+        Handlers fetched on a miss are added to fetched (content ID -> handler)
+        for the caller to cache with a single set_many().
+        """
+        if content_id in fetched:
+            return fetched[content_id]
+        handler = self.content_cache.get(course_id, content_id)
+        if handler is not None:
+            return handler
+        
+        try:
+            content = self._get(
+                f"/courses/{course_id}/contents/{content_id}", fields=self.CONTENT_FIELDS
+            )
+        except BBAPIError:
+            return None
+        
+        handler = content.get("contentHandler", {})
+        fetched[content_id] = handler
+        return handler
+    
+    @profiled
+    def warm_content_cache(self, course_ids: Optional[List[str]] = None) -> int:
+        """
+        Fetch the content handlers of every gradebook column into the cache.
+        
+        Run once for a set of courses (e.g. by a single account per class) so
+        later syncs of every student skip the per-column content requests.
+        
+        Args:
+            course_ids: Internal course IDs (optional).
+                        If None, uses all courses from the cached .id data.
+        
+        Returns:
+            Number of content handlers fetched
+        """
+        if course_ids is None:
+            course_ids = self.get_course_catalog().internal_ids()
+        
+        fetched = 0
+        for course_id in course_ids:
+            if self.negative_cache.is_unavailable(course_id, "gradebook"):
+                continue
+            
+            try:
+                columns = self._get_paginated_v2(
+                    f"/courses/{course_id}/gradebook/columns", fields=("id", "contentId")
+                )
+            except BBAPIError as e:
+                self.negative_cache.record_failure(course_id, "gradebook", e.status_code)
+                continue
+            self.negative_cache.record_success(course_id, "gradebook")
+            
+            missing = {
+                column["contentId"] for column in columns
+                if column.get("contentId")
+                and not self.content_cache.has(course_id, column["contentId"])
+            }
+            if not missing:
+                continue
+            
+            def fetch_one(content_id, course_id=course_id):
+                try:
+                    content = self._get(
+                        f"/courses/{course_id}/contents/{content_id}", fields=self.CONTENT_FIELDS
+                    )
+                    return content_id, content.get("contentHandler", {})
+                except BBAPIError:
+                    return content_id, None
+            
+            workers = min(self.CONTENT_WARM_WORKERS, len(missing))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(fetch_one, sorted(missing))
+                handlers = {cid: handler for cid, handler in results if handler is not None}
+            
+            # One cache write per course
+            self.content_cache.set_many(course_id, handlers)
+            fetched += len(handlers)
+        
+        return fetched
+    
+    @profiled
+    def get_assignments(
+        self,
+        records: bool = False,
+        strict: bool = False,
+        failed: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Get all assignments from all courses in the .id file.
         
         Uses cached course data from the .id file to iterate over courses,
-        then fetches assignments for each course.
+        then fetches assignments for each course. Courses whose fetch fails
+        are skipped, and keep their previous entries in the deadline index.
+        
+        Args:
+            records: Return compact Assignment records instead of dicts
+            strict: Raise on the first course whose fetch fails instead of skipping it
+            failed: List the internal IDs of skipped courses are appended to
         
         Returns:
             List of assignment dictionaries (same format as get_course_assignments)
+        
+        Raises:
+            BBAPIError: In strict mode, if a course's gradebook can't be fetched
         """
         all_assignments = []
         
         if not self._cached_data:
             return []
         
-        courses = self._cached_data.get("courses", [])
+        courses = self.get_course_catalog()
+        
+        # Courses whose gradebook could not be fetched
+        failed_courses = []
         
         # Get assignments for each cached course using internal_id
         for cached_course in courses:
@@ -481,7 +991,10 @@ class BBClient:
                 continue
             
             try:
-                course_assignments = self.get_course_assignments(internal_id)
+                with span(self, f"course:{internal_id}"):
+                    course_assignments = self.get_course_assignments(
+                        internal_id, records=records, strict=True
+                    )
                 
                 # Update course_name if not set
                 for assignment in course_assignments:
@@ -490,31 +1003,51 @@ class BBClient:
                 
                 all_assignments.extend(course_assignments)
             except BBAPIError:
+                if strict:
+                    raise
                 # Skip courses we can't access
+                failed_courses.append(internal_id)
                 continue
         
+        self.deadlines.update(all_assignments, keep_courses=failed_courses)
+        if failed is not None:
+            failed.extend(failed_courses)
         return all_assignments
     
-    def get_current_user(self) -> Dict[str, Any]:
+    @profiled
+    def get_current_user(self, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         """
         Get current authenticated user information.
         
+        Args:
+            fields: User fields to fetch (e.g. USER_FIELDS); all if None
+        
         Returns:
             User data dictionary
         """
-        return self._get("/users/me")
+        return self._get("/users/me", fields=fields)
     
-    def get_enrolled_courses(self) -> List[Dict[str, Any]]:
+    @profiled
+    def get_enrolled_courses(self, fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         """
         Get all enrolled courses for the current user.
         
         A course is considered "enrolled" if it has an "externalAccessUrl" field.
         
+        Args:
+            fields: Course fields to fetch, e.g. COURSE_FIELDS (externalAccessUrl
+                    is always added); all if None
+        
         Returns:
             List of enrolled course dictionaries
         """
+        if fields and "externalAccessUrl" not in fields:
+            fields = tuple(fields) + ("externalAccessUrl",)
+        
         # Get user's course memberships
-        memberships = self._get_paginated(f"/users/{self._user_id}/courses")
+        memberships = self._get_paginated(
+            f"/users/{self._user_id}/courses", fields=self.MEMBERSHIP_FIELDS
+        )
         
         enrolled_courses = []
         
@@ -524,8 +1057,8 @@ class BBClient:
                 continue
             
             try:
-                # Get full course details
-                course = self._get(f"/courses/{course_id}")
+                # Get course details
+                course = self._get(f"/courses/{course_id}", fields=fields)
                 
                 # Check if enrolled (has externalAccessUrl)
                 if course.get("externalAccessUrl"):
@@ -538,27 +1071,33 @@ class BBClient:
         
         return enrolled_courses
     
-    def get_course_instructors(self, course_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    @profiled
+    def get_course_instructors(
+        self,
+        course_id: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Get instructor/professor data for courses.
         
         Args:
             course_id: Specific course ID (optional). 
                        If None, returns instructors for all enrolled courses.
+            fields: User fields to fetch per instructor (e.g. USER_FIELDS); all if None
         
         Returns:
             List of instructor data dictionaries with course info
         """
         if course_id:
-            return self._get_course_instructors_single(course_id)
+            return self._get_course_instructors_single(course_id, fields)
         
         # Get instructors for all enrolled courses
-        courses = self.get_enrolled_courses()
+        courses = self.get_enrolled_courses(fields=self.COURSE_FIELDS)
         all_instructors = []
         
         for course in courses:
             course_id = course.get("id")
-            instructors = self._get_course_instructors_single(course_id)
+            instructors = self._get_course_instructors_single(course_id, fields)
             
             for instructor in instructors:
                 instructor["course"] = {
@@ -570,11 +1109,17 @@ class BBClient:
         
         return all_instructors
     
-    def _get_course_instructors_single(self, course_id: str) -> List[Dict[str, Any]]:
+    def _get_course_instructors_single(
+        self,
+        course_id: str,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
         """Get instructors for a single course."""
         try:
             # Get course memberships and filter by role
-            memberships = self._get_paginated(f"/courses/{course_id}/users")
+            memberships = self._get_paginated(
+                f"/courses/{course_id}/users", fields=self.ROSTER_FIELDS
+            )
             
             instructors = []
             for member in memberships:
@@ -585,7 +1130,7 @@ class BBClient:
                     
                     try:
                         # Get user details
-                        user_data = self._get(f"/users/{user_id}")
+                        user_data = self._get(f"/users/{user_id}", fields=fields)
                         user_data["courseRole"] = role
                         instructors.append(user_data)
                     except BBAPIError:
@@ -600,67 +1145,315 @@ class BBClient:
         except BBAPIError:
             return []
     
-    def get_attendance(self, course_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    @profiled
+    def get_attendance(
+        self,
+        course_id: Optional[str] = None,
+        records: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         Get attendance/presence records for courses.
         
         Args:
             course_id: Specific course ID (optional).
                        If None, returns attendance for all enrolled courses.
+            records: Return compact AttendanceRecord records instead of dicts
         
         Returns:
             List of attendance records with course info
         """
         if course_id:
-            return self._get_course_attendance(course_id)
+            return self._get_course_attendance(course_id, meeting_fields=None, records=records)
         
         # Get attendance for all enrolled courses
-        courses = self.get_enrolled_courses()
+        courses = self.get_enrolled_courses(fields=self.COURSE_FIELDS)
         all_attendance = []
         
-        for course in courses:
-            cid = course.get("id")
-            attendance = self._get_course_attendance(cid)
-            
-            for record in attendance:
-                record["course"] = {
-                    "id": cid,
-                    "name": course.get("name"),
-                    "courseId": course.get("courseId")
-                }
-                all_attendance.append(record)
+        with self._attendance_pass():
+            for course in courses:
+                cid = course.get("id")
+                attendance = self._get_course_attendance(cid, meeting_fields=None, records=records)
+                
+                for record in attendance:
+                    record["course"] = {
+                        "id": cid,
+                        "name": course.get("name"),
+                        "courseId": course.get("courseId")
+                    }
+                    all_attendance.append(record)
         
         return all_attendance
     
-    def _get_course_attendance(self, course_id: str) -> List[Dict[str, Any]]:
-        """Get attendance records for a single course."""
-        try:
-            # Try to get course meetings (attendance)
-            meetings = self._get_paginated(f"/courses/{course_id}/meetings")
-            
-            attendance_records = []
-            for meeting in meetings:
-                meeting_id = meeting.get("id")
-                
+    @profiled
+    def get_attendance_by_course(
+        self,
+        records: bool = False,
+        failed: Optional[List[str]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the attendance records of every cached course, in one ledger pass.
+        
+        Past meetings come from the attendance ledger and the bulk listing is
+        fetched once for all courses, like get_attendance_percentage() does.
+        Courses whose meetings can't be listed are left out, so they can't be
+        mistaken for courses without meetings.
+        
+        Args:
+            records: Return compact AttendanceRecord records instead of dicts
+            failed: List the internal IDs of left-out courses are appended to
+        
+        Returns:
+            Dict mapping internal course ID to its attendance records, each
+            with its "meeting"
+        """
+        by_course = {}
+        with self._attendance_pass():
+            for course in self.get_course_catalog():
+                internal_id = course.get("internal_id")
+                if not internal_id:
+                    continue
                 try:
-                    # Get attendance for this meeting
-                    attendance = self._get(
-                        f"/courses/{course_id}/meetings/{meeting_id}/users/{self._user_id}"
-                    )
-                    attendance["meeting"] = meeting
-                    attendance_records.append(attendance)
+                    with span(self, f"course:{internal_id}"):
+                        by_course[internal_id] = self._get_course_attendance(
+                            internal_id, incremental=True, records=records, strict=True
+                        )
                 except BBAPIError:
-                    # Include meeting without user-specific attendance
-                    attendance_records.append({
-                        "meeting": meeting,
-                        "status": "unknown"
-                    })
-            
-            return attendance_records
-        except BBAPIError:
+                    if failed is not None:
+                        failed.append(internal_id)
+        
+        self._save_attendance_ledger()
+        return by_course
+    
+    def _get_course_attendance(
+        self,
+        course_id: str,
+        incremental: bool = False,
+        meeting_fields: Optional[Sequence[str]] = MEETING_FIELDS,
+        records: bool = False,
+        strict: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Get attendance records for a single course.
+        
+        Every fetch is written to the in-memory attendance ledger. In incremental
+        mode, meetings that started before the ledger's horizon (the previous sync
+        time) minus ATTENDANCE_REOPEN_DAYS are served from the ledger instead of
+        being queried again, unless their status is "unknown" (possibly a
+        transient error), which is never frozen.
+        
+        Args:
+            course_id: Internal course ID
+            incremental: If True, only query meetings that are not frozen in the ledger
+            meeting_fields: Meeting fields to fetch; all if None. The ledger
+                            always keeps MEETING_FIELDS only.
+            records: Return compact AttendanceRecord records instead of dicts
+            strict: Raise BBAPIError if the meetings can't be listed, instead of
+                    returning [] (see get_course_assignments)
+        
+        Returns:
+            List of attendance records, each with its "meeting" attached
+        
+        Raises:
+            BBAPIError: In strict mode, if the meetings can't be listed
+        """
+        from datetime import datetime, timedelta, timezone
+        
+        if self.negative_cache.is_unavailable(course_id, "meetings"):
+            return []
+        
+        try:
+            # Try to get course meetings (attendance)
+            meetings = self._get_paginated(
+                f"/courses/{course_id}/meetings", fields=meeting_fields
+            )
+        except BBAPIError as e:
             # Attendance API might not be available for all courses
+            self.negative_cache.record_failure(course_id, "meetings", e.status_code)
+            if strict:
+                raise
             return []
+        self.negative_cache.record_success(course_id, "meetings")
+        
+        now = datetime.now(timezone.utc)
+        ledger = self._get_attendance_ledger()
+        entry = ledger.get(course_id) or {"horizon": None, "records": {}}
+        
+        # Meetings starting before this cutoff are frozen
+        frozen_before = None
+        if incremental and entry.get("horizon"):
+            horizon = parse_datetime(entry["horizon"])
+            if horizon:
+                frozen_before = horizon - timedelta(days=self.ATTENDANCE_REOPEN_DAYS)
+        
+        by_meeting = {}
+        pending = []
+        for meeting in meetings:
+            key = str(meeting.get("id"))
+            cached = entry["records"].get(key)
+            start = parse_datetime(meeting.get("start"))
+            frozen = cached and cached.get("status", "unknown") != "unknown"
+            if frozen and frozen_before and start and start < frozen_before:
+                by_meeting[key] = cached
+            else:
+                pending.append(meeting)
+        
+        by_meeting.update(self._fetch_meeting_attendance(course_id, pending))
+        
+        # Keep the order of the meetings listing
+        attendance_records = []
+        for m in meetings:
+            record = by_meeting[str(m.get("id"))]
+            if records:
+                attendance_records.append(AttendanceRecord.from_dict(record, Meeting.from_dict(m)))
+            else:
+                attendance_records.append(dict(record, meeting=m))
+        
+        # Meetings deleted upstream drop out of the ledger as well. The ledger keeps
+        # MEETING_FIELDS of each meeting, whichever fields this call fetched
+        stored = {
+            key: dict(r, meeting=_project(r.get("meeting"), self.MEETING_FIELDS))
+            for key, r in by_meeting.items()
+        }
+        self._set_ledger_entry(
+            course_id, {"horizon": now.isoformat(), "records": stored},
+            changed=entry["records"] != stored
+        )
+        
+        return attendance_records
+    
+    @contextmanager
+    def _attendance_pass(self):
+        """
+        Share the bulk attendance listing between the courses of one pass.
+        
+        The listing holds the user's records of every course, so inside a pass
+        it is fetched once instead of once per course. The listing is kept per
+        thread (passes of other threads run at other times) and dropped when
+        the outermost pass ends.
+        """
+        if getattr(self._local, "user_records", None) is not None:
+            yield
+            return
+        self._local.user_records = {}
+        try:
+            yield
+        finally:
+            self._local.user_records = None
+    
+    def _fetch_meeting_attendance(self, course_id: str, meetings: List[Dict]) -> Dict[str, Dict]:
+        """
+        Fetch the current user's attendance for the given meetings of a course.
+        
+        Prefers the bulk listing of the user's attendance records (one paginated
+        request, reused by the other courses of an _attendance_pass) and joins
+        it to the meetings in memory. Falls back to per-meeting requests, at
+        most ATTENDANCE_MAX_WORKERS in parallel, when the bulk endpoint is
+        unavailable.
+        
+        Args:
+            course_id: Internal course ID
+            meetings: Meeting objects from /courses/{id}/meetings
+            
+        Returns:
+            Dict mapping meeting ID (as string) to its attendance record
+        """
+        if not meetings:
+            return {}
+        
+        shared = getattr(self._local, "user_records", None)
+        user_records = shared.get("records") if shared is not None else None
+        
+        # A single meeting is cheaper to query directly than the bulk listing
+        if (
+            user_records is None and len(meetings) > 1
+            and not self.negative_cache.is_unavailable(course_id, "meetings_bulk")
+        ):
+            try:
+                # Not filtered by course: the courseId is only used for permissions
+                user_records = self._get_paginated(
+                    f"/courses/{course_id}/meetings/users/{self._user_id}",
+                    fields=self.ATTENDANCE_FIELDS
+                )
+                self.negative_cache.record_success(course_id, "meetings_bulk")
+                if shared is not None:
+                    shared["records"] = user_records
+            except BBAPIError as e:
+                self.negative_cache.record_failure(course_id, "meetings_bulk", e.status_code)
+        
+        if user_records is not None:
+            by_meeting = {str(r.get("meetingId")): r for r in user_records}
+            records = {}
+            for meeting in meetings:
+                key = str(meeting.get("id"))
+                attendance = by_meeting.get(key)
+                if attendance is not None:
+                    attendance = dict(attendance, meeting=meeting)
+                else:
+                    attendance = {"meeting": meeting, "status": "unknown"}
+                records[key] = attendance
+            return records
+        
+        def fetch_one(meeting):
+            try:
+                # Get attendance for this meeting
+                attendance = self._get(
+                    f"/courses/{course_id}/meetings/{meeting.get('id')}/users/{self._user_id}",
+                    fields=self.ATTENDANCE_FIELDS
+                )
+                attendance["meeting"] = meeting
+                return attendance
+            except BBAPIError:
+                # Include meeting without user-specific attendance
+                return {
+                    "meeting": meeting,
+                    "status": "unknown"
+                }
+        
+        workers = min(self.ATTENDANCE_MAX_WORKERS, len(meetings))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(fetch_one, meetings))
+        
+        return {str(m.get("id")): r for m, r in zip(meetings, results)}
+    
+    def _get_attendance_ledger(self) -> Dict[str, Any]:
+        """Get the per-course attendance ledger from cached data (a snapshot: do not mutate)."""
+        return (self._cached_data or {}).get("attendance") or {}
+    
+    def _set_ledger_entry(self, course_id: str, entry: Dict[str, Any], changed: bool = True) -> None:
+        """
+        Store a course's ledger entry, copying ledger and cached data (copy on write).
+        
+        Args:
+            course_id: Internal course ID
+            entry: {"horizon", "records"} of the course
+            changed: The records differ from the stored ones; only then is the
+                     ledger marked for saving (a new horizon alone is kept in memory)
+        """
+        with self._lock:
+            cached_data = self._cached_data or {}
+            ledger = dict(cached_data.get("attendance") or {}, **{course_id: entry})
+            self._cached_data = dict(cached_data, attendance=ledger)
+            if changed:
+                self._attendance_dirty = True
+    
+    def _save_attendance_ledger(self) -> None:
+        """Persist the attendance ledger to the .id file if it has changed."""
+        if not self._id_path or not Path(self._id_path).exists():
+            return
+        
+        with self._write_lock:
+            with self._lock:
+                if not self._attendance_dirty:
+                    return
+                ledger = self._get_attendance_ledger()
+                self._attendance_dirty = False
+            try:
+                update_id_file_attendance(self._id_path, ledger)
+            except BBAuthError:
+                with self._lock:
+                    self._attendance_dirty = True
     
+    @profiled
     def get_course_attendance_percentage(self, course_id: str) -> Dict[str, Any]:
         """
         Get attendance percentage for a specific course.
@@ -671,14 +1464,27 @@ class BBClient:
         Returns:
             Dict with present, absent, total counts and percentage
         """
-        attendance = self._get_course_attendance(course_id)
+        stats = self._course_attendance_stats(course_id)
+        self._save_attendance_ledger()
+        return stats
+    
+    @staticmethod
+    def summarize_attendance(attendance: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Count attendance records by status.
         
+        Args:
+            attendance: Attendance records (dicts or AttendanceRecord records)
+        
+        Returns:
+            Dict with present (incl. late and excused), absent, total and percentage
+        """
         present = 0
         absent = 0
         total = len(attendance)
         
         for record in attendance:
-            status = record.get("status", "").lower()
+            status = (record.get("status") or "").lower()
             if status in ["present", "late", "excused"]:
                 present += 1
             elif status in ["absent"]:
@@ -687,54 +1493,71 @@ class BBClient:
         
         percentage = (present / total * 100) if total > 0 else 0.0
         
-        # Get course name from cached data
-        course_name = None
-        if self._cached_data:
-            for c in self._cached_data.get("courses", []):
-                if c.get("internal_id") == course_id:
-                    course_name = c.get("name")
-                    break
-        
         return {
-            "course_id": course_id,
-            "course_name": course_name,
             "present": present,
             "absent": absent,
             "total": total,
             "percentage": round(percentage, 2)
         }
     
-    def get_attendance_percentage(self) -> Dict[str, Any]:
+    def _course_attendance_stats(self, course_id: str, strict: bool = False) -> Dict[str, Any]:
+        """Attendance stats of one course, without saving the ledger."""
+        # Past meetings come from the attendance ledger, only recent ones are queried
+        attendance = self._get_course_attendance(course_id, incremental=True, strict=strict)
+        
+        # Get course name from cached data
+        course_name = self.get_course_catalog().name_of(course_id)
+        
+        return {
+            "course_id": course_id,
+            "course_name": course_name,
+            **self.summarize_attendance(attendance)
+        }
+    
+    @profiled
+    def get_attendance_percentage(self, strict: bool = False) -> Dict[str, Any]:
         """
         Get attendance percentage across all courses.
         
+        Args:
+            strict: Raise if a course's meetings can't be listed, instead of
+                    counting the course as having none
+        
         Returns:
             Dict with per-course stats and overall average
+        
+        Raises:
+            BBAPIError: In strict mode, if a course's meetings can't be listed
         """
         if not self._cached_data:
             return {"courses": [], "overall": {"percentage": 0.0}}
         
-        courses = self._cached_data.get("courses", [])
+        courses = self.get_course_catalog()
         course_stats = []
         total_present = 0
         total_absent = 0
         total_meetings = 0
         
-        for course in courses:
-            internal_id = course.get("internal_id")
-            if not internal_id:
-                continue
-            
-            stats = self.get_course_attendance_percentage(internal_id)
-            stats["course_name"] = course.get("name")
-            course_stats.append(stats)
-            
-            total_present += stats["present"]
-            total_absent += stats["absent"]
-            total_meetings += stats["total"]
+        with self._attendance_pass():
+            for course in courses:
+                internal_id = course.get("internal_id")
+                if not internal_id:
+                    continue
+                
+                with span(self, f"course:{internal_id}"):
+                    stats = self._course_attendance_stats(internal_id, strict=strict)
+                stats["course_name"] = course.get("name")
+                course_stats.append(stats)
+                
+                total_present += stats["present"]
+                total_absent += stats["absent"]
+                total_meetings += stats["total"]
         
         overall_percentage = (total_present / total_meetings * 100) if total_meetings > 0 else 0.0
         
+        # One .id write for all courses (and none if nothing changed)
+        self._save_attendance_ledger()
+        
         return {
             "courses": course_stats,
             "overall": {
@@ -745,12 +1568,18 @@ class BBClient:
             }
         }
     
-    def get_course_assignment_stats(self, course_id: str) -> Dict[str, Any]:
+    @profiled
+    def get_course_assignment_stats(
+        self,
+        course_id: str,
+        assignments: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """
         Get assignment submission statistics for a specific course.
         
         Args:
             course_id: Internal course ID
+            assignments: The course's assignments, if already fetched (no requests then)
             
         Returns:
             Dict with on_time, late, missed, available counts and rates
@@ -761,7 +1590,8 @@ class BBClient:
         """
         from datetime import datetime
         
-        assignments = self.get_course_assignments(course_id)
+        if assignments is None:
+            assignments = self.get_course_assignments(course_id)
         
         total = len(assignments)
         on_time = 0
@@ -815,17 +1645,27 @@ class BBClient:
             "on_time_rate": round(on_time_rate, 2)
         }
     
-    def get_assignment_stats(self) -> Dict[str, Any]:
+    @profiled
+    def get_assignment_stats(self, assignments: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Get assignment statistics across all courses.
         
+        Args:
+            assignments: get_assignments() result, if already fetched (no requests then)
+        
         Returns:
             Dict with per-course stats and overall aggregates
         """
         if not self._cached_data:
             return {"courses": [], "overall": {"on_time_rate": 0.0}}
         
-        courses = self._cached_data.get("courses", [])
+        by_course = None
+        if assignments is not None:
+            by_course = {}
+            for a in assignments:
+                by_course.setdefault(a.get("course_id"), []).append(a)
+        
+        courses = self.get_course_catalog()
         course_stats = []
         total_all = 0
         on_time_all = 0
@@ -839,7 +1679,10 @@ class BBClient:
                 continue
             
             try:
-                stats = self.get_course_assignment_stats(internal_id)
+                with span(self, f"course:{internal_id}"):
+                    stats = self.get_course_assignment_stats(
+                        internal_id, by_course.get(internal_id, []) if by_course is not None else None
+                    )
                 stats["course_name"] = course.get("name")
                 course_stats.append(stats)
                 
@@ -865,65 +1708,86 @@ class BBClient:
             }
         }
     
-    def is_nerd(self) -> bool:
+    @profiled
+    def is_nerd(self, stats: Optional[Dict[str, Any]] = None, strict: bool = False) -> bool:
         """
         Check if student is a 'nerd' (on-time rate > 45%).
         Updates the .id file with isNerd flag.
         
+        Args:
+            stats: get_assignment_stats() result, if already computed
+            strict: Raise if the .id file can't be updated, instead of ignoring it
+        
         Returns:
             True if on-time rate > 45%
-        """
-        import json
         
-        stats = self.get_assignment_stats()
+        Raises:
+            OSError: In strict mode, if the .id file can't be read or written
+            codec.DecodeError: In strict mode, if the .id file is corrupt
+        """
+        if stats is None:
+            stats = self.get_assignment_stats()
         on_time_rate = stats["overall"].get("on_time_rate", 0)
         is_nerd = on_time_rate > 0.45
         
         # Update .id file
         if self._id_path:
             try:
-                with open(self._id_path, 'r', encoding='utf-8') as f:
-                    id_data = json.load(f)
-                
-                id_data["isNerd"] = is_nerd
-                id_data["on_time_rate"] = on_time_rate
-                
-                with open(self._id_path, 'w', encoding='utf-8') as f:
-                    json.dump(id_data, f, indent=2, ensure_ascii=False)
+                with self._write_lock:
+                    id_data = codec.load_file(self._id_path)
+                    
+                    id_data["isNerd"] = is_nerd
+                    id_data["on_time_rate"] = on_time_rate
+                    
+                    codec.dump_file(self._id_path, id_data)
             except Exception:
-                pass
+                if strict:
+                    raise
         
         return is_nerd
     
-    def is_attending(self) -> bool:
+    @profiled
+    def is_attending(self, stats: Optional[Dict[str, Any]] = None, strict: bool = False) -> bool:
         """
         Check if student is 'attending' (attendance > 60%).
         Updates the .id file with isAttending flag.
         
+        Args:
+            stats: get_attendance_percentage() result, if already computed
+            strict: Raise if the .id file can't be updated, instead of ignoring it
+        
         Returns:
             True if attendance > 60%
-        """
-        import json
         
-        stats = self.get_attendance_percentage()
+        Raises:
+            OSError: In strict mode, if the .id file can't be read or written
+            codec.DecodeError: In strict mode, if the .id file is corrupt
+        """
+        if stats is None:
+            stats = self.get_attendance_percentage()
         percentage = stats["overall"].get("percentage", 0)
         is_attending = percentage > 60
         
         # Update .id file
         if self._id_path:
             try:
-                with open(self._id_path, 'r', encoding='utf-8') as f:
-                    id_data = json.load(f)
-                
-                id_data["isAttending"] = is_attending
-                id_data["attendance_percentage"] = percentage
-                
-                with open(self._id_path, 'w', encoding='utf-8') as f:
-                    json.dump(id_data, f, indent=2, ensure_ascii=False)
+                with self._write_lock:
+                    id_data = codec.load_file(self._id_path)
+                    
+                    id_data["isAttending"] = is_attending
+                    id_data["attendance_percentage"] = percentage
+                    
+                    codec.dump_file(self._id_path, id_data)
             except Exception:
-                pass
+                if strict:
+                    raise
         
         return is_attending
     
     def __repr__(self) -> str:
         return f"BBClient(domain='{self.domain}', user_id='{self._user_id}')"
+
+
+def _project(obj: Optional[Dict[str, Any]], fields: Sequence[str]) -> Dict[str, Any]:
+    """Keep only the given keys of an API object (a local fields= projection)."""
+    return {k: v for k, v in (obj or {}).items() if k in fields}
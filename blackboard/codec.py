@@ -0,0 +1,117 @@
+"""
+JSON codec used for API responses and the files bbpy writes.
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise. Both backends produce the same compact UTF-8 output (no ASCII
+escaping), so files written by one are read back identically by the other.
+Set BBPY_JSON=stdlib to force the fallback. Objects with a to_dict()
+method (bbpy.records) are encoded as their dict.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+if os.environ.get("BBPY_JSON") == "stdlib":
+    orjson = None
+
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both
+DecodeError = json.JSONDecodeError
+
+
+def _default(obj: Any) -> Any:
+    to_dict = getattr(obj, "to_dict", None)
+    if callable(to_dict):
+        return to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def content_hash(obj: Any, digest_size: int = 12) -> str:
+    """
+    Hash the JSON encoding of obj (hex BLAKE2b).
+    
+    Both backends encode identically, so hashes are stable across them. Key
+    order matters: equal dicts built in a different order hash differently.
+    """
+    return hashlib.blake2b(dumps(obj), digest_size=digest_size).hexdigest()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode JSON from bytes or str.
+    
+    Raises:
+        DecodeError: If data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """
+    Encode obj as UTF-8 JSON.
+    
+    Args:
+        obj: JSON-serializable object (dict keys must be strings)
+        pretty: Indent with two spaces (for files meant to be read by people)
+    
+    Returns:
+        Encoded bytes; compact (no whitespace) unless pretty
+    """
+    if orjson is not None:
+        # Records are dataclasses; encode them through to_dict() to keep their API keys
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, default=_default, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=_default).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def load_file(path: Union[str, Path]) -> Any:
+    """
+    Read and decode a JSON file.
+    
+    Raises:
+        FileNotFoundError: If the file does not exist
+        DecodeError: If the file is not valid JSON
+    """
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dump_file(path: Union[str, Path], obj: Any, pretty: bool = False) -> None:
+    """
+    Write obj as JSON atomically: to a temporary file next to path, then renamed into place.
+    
+    Readers never see a half-written file, even if the process dies mid-write.
+    
+    Args:
+        path: Destination file
+        obj: JSON-serializable object
+        pretty: Indent the output (see dumps)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(obj, pretty=pretty))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,229 @@
+"""
+Precomputed dashboard view of one student.
+
+The dashboard needs the same fixed shape on every load: upcoming deadlines,
+attendance per course, grade stats and professors. build_view() assembles it
+once per sync, and DashboardView writes it as a compact JSON file the web app
+can serve as-is:
+
+    {
+        "version": 1,
+        "hash": "...",
+        "generated_at": "2026-03-01T08:00:00",
+        "user": {...},
+        "upcoming": [{"name", "course_id", "course_name", "due", "status", "accepts_late"}, ...],
+        "overdue": 2,
+        "attendance": {"overall": {...}, "courses": [...]},
+        "grades": {"overall": {...}, "courses": [...]},
+        "professors": [{"course_id", "course_name", "professors"}, ...]
+    }
+
+The hash covers everything but generated_at; the file is only rewritten
+when it changes, so its mtime (and an ETag built from the hash) tells
+readers whether anything is new.
+
+Usage:
+    view = DashboardView("student.dashboard.json")
+    changed = view.update(client)
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterable, Mapping
+
+from bbpy import codec
+from bbpy.dates import parse_datetime
+
+
+VIEW_VERSION = 1
+
+# Deadlines listed in "upcoming"
+UPCOMING_LIMIT = 10
+
+
+def _grade_stats(assignments: List[Mapping[str, Any]]) -> Dict[str, Any]:
+    graded = [a for a in assignments if a.get("graded") and a.get("score") is not None]
+    points = sum(a.get("score") for a in graded)
+    possible = sum(a.get("score_possible") or 0 for a in graded)
+    return {
+        "total": len(assignments),
+        "graded": len(graded),
+        "submitted": sum(1 for a in assignments if a.get("submitted")),
+        "points": points,
+        "possible": possible,
+        "average": round(points / possible * 100, 2) if possible else None
+    }
+
+
+def build_view(
+    user: Mapping[str, Any],
+    courses: Iterable[Mapping[str, Any]],
+    assignments: Iterable[Mapping[str, Any]],
+    attendance_stats: Mapping[str, Any],
+    now: Optional[datetime] = None,
+    upcoming_limit: int = UPCOMING_LIMIT
+) -> Dict[str, Any]:
+    """
+    Assemble the dashboard view (without hash and generated_at).
+    
+    Args:
+        user: Cached user data (name, username, email, class)
+        courses: .id course dicts or Course records
+        assignments: assignment dicts or Assignment records (get_assignments format)
+        attendance_stats: get_attendance_percentage() result
+        now: Reference time for upcoming deadlines (current time if None)
+        upcoming_limit: Max number of upcoming deadlines
+    
+    Returns:
+        Dashboard view dict
+    """
+    now = now or datetime.now(timezone.utc)
+    courses = list(courses)
+    assignments = [a for a in assignments if a.get("grading_type") != "Calculated"]
+    
+    # overdue: past due, not submitted, still accepting late submissions
+    pending = []
+    overdue = 0
+    for a in assignments:
+        if a.get("submitted"):
+            continue
+        due = parse_datetime(a.get("due"))
+        if due is None:
+            continue
+        if due >= now:
+            pending.append((due, a))
+        elif a.get("accepts_late", True):
+            overdue += 1
+    pending.sort(key=lambda item: item[0])
+    
+    upcoming = [
+        {
+            "name": a.get("name"),
+            "course_id": a.get("course_id"),
+            "course_name": a.get("course_name"),
+            "due": a.get("due"),
+            "status": a.get("status"),
+            "accepts_late": a.get("accepts_late", True)
+        }
+        for _, a in pending[:upcoming_limit]
+    ]
+    
+    by_course: Dict[str, List[Mapping[str, Any]]] = {}
+    for a in assignments:
+        by_course.setdefault(a.get("course_id"), []).append(a)
+    
+    course_names = {c.get("internal_id"): c.get("name") for c in courses}
+    grades = {
+        "overall": _grade_stats(assignments),
+        "courses": [
+            dict(_grade_stats(items), course_id=course_id, course_name=course_names.get(course_id))
+            for course_id, items in by_course.items()
+        ]
+    }
+    
+    attendance = {
+        "overall": dict(attendance_stats.get("overall", {})),
+        "courses": [
+            {key: stats.get(key) for key in ("course_id", "course_name", "present", "absent", "total", "percentage")}
+            for stats in attendance_stats.get("courses", [])
+        ]
+    }
+    
+    professors = [
+        {
+            "course_id": c.get("internal_id"),
+            "course_name": c.get("name"),
+            "professors": list(c.get("professors") or [])
+        }
+        for c in courses
+    ]
+    
+    return {
+        "version": VIEW_VERSION,
+        "user": dict(user),
+        "upcoming": upcoming,
+        "overdue": overdue,
+        "attendance": attendance,
+        "grades": grades,
+        "professors": professors
+    }
+
+
+def view_hash(view: Mapping[str, Any]) -> str:
+    """Content hash of a view (generated_at and hash excluded)."""
+    content = {key: value for key, value in view.items() if key not in ("hash", "generated_at")}
+    return codec.content_hash(content, digest_size=16)
+
+
+class DashboardView:
+    """
+    Keeps a student's dashboard view file up to date.
+    
+    The file is replaced atomically, and only when the view's content hash
+    changed since the last write.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the view.
+        
+        Args:
+            path: Dashboard JSON file (e.g. next to the .id file)
+        """
+        self.path = Path(path)
+    
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Read the current view file (None if missing, corrupt or of another version)."""
+        try:
+            view = codec.load_file(self.path)
+        except (FileNotFoundError, codec.DecodeError):
+            return None
+        return view if view.get("version") == VIEW_VERSION else None
+    
+    def write(self, view: Dict[str, Any]) -> bool:
+        """
+        Write a view built by build_view() unless its content is unchanged.
+        
+        Returns:
+            True if the file was (re)written
+        """
+        digest = view_hash(view)
+        current = self.load()
+        if current and current.get("hash") == digest:
+            return False
+        
+        view = dict(view, hash=digest, generated_at=datetime.now().isoformat())
+        codec.dump_file(self.path, view)
+        return True
+    
+    def update(
+        self,
+        client,
+        now: Optional[datetime] = None,
+        assignments: Optional[List[Mapping[str, Any]]] = None,
+        attendance_stats: Optional[Mapping[str, Any]] = None
+    ) -> bool:
+        """
+        Build the view from a BBClient's current data and write it if changed.
+        
+        Data already fetched in the same sync can be passed in; only what is
+        missing is fetched.
+        
+        Args:
+            client: Authenticated BBClient with cached .id data
+            now: Reference time for upcoming deadlines (current time if None)
+            assignments: client.get_assignments() result
+            attendance_stats: client.get_attendance_percentage() result
+        
+        Returns:
+            True if the file was (re)written
+        """
+        cached = client.get_cached_data() or {}
+        view = build_view(
+            cached.get("user", {}),
+            client.get_course_catalog(),
+            client.get_assignments() if assignments is None else assignments,
+            client.get_attendance_percentage() if attendance_stats is None else attendance_stats,
+            now=now
+        )
+        return self.write(view)
@@ -0,0 +1,27 @@
+"""
+Date parsing shared by the client, the dashboard view and the deadline index.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 timestamp from the API (or a cached file).
+    
+    Args:
+        value: Timestamp such as "2026-03-01T08:00:00.000Z"; naive values are taken as UTC
+    
+    Returns:
+        Timezone-aware datetime, or None if value is empty or unparseable
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
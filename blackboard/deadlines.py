@@ -0,0 +1,206 @@
+"""
+Sorted deadline index across all of a student's courses.
+
+Due dates are parsed once, when assignments sync, into epoch seconds kept
+in sorted lists; queries are then a bisect plus a slice instead of parsing
+and sorting every assignment again.
+
+Usage:
+    index = DeadlineIndex("cache/deadlines/student.json")
+    index.update(client.get_assignments())
+    for entry in index.upcoming(5):
+        print(entry["due"], entry["name"])
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterable, Mapping, Union
+
+from bbpy import codec
+from bbpy.dates import parse_datetime
+
+
+INDEX_VERSION = 1
+
+# Assignment fields kept in index entries
+ENTRY_FIELDS = (
+    "id", "name", "course_id", "course_name", "due",
+    "status", "submitted", "accepts_late"
+)
+
+Moment = Union[datetime, str, float, None]
+
+
+def _timestamp(value: Moment) -> Optional[float]:
+    """Epoch seconds of a datetime, ISO 8601 string or epoch (None if unparseable)."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        parsed = parse_datetime(value)
+        return parsed.timestamp() if parsed else None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _moment(value: Moment) -> float:
+    """Epoch seconds of a query bound (the current time if None)."""
+    if value is None:
+        return datetime.now(timezone.utc).timestamp()
+    ts = _timestamp(value)
+    if ts is None:
+        raise ValueError(f"Not an ISO 8601 date: {value!r}")
+    return ts
+
+
+class DeadlineIndex:
+    """
+    Deadlines of a student's assignments, sorted by due date.
+    
+    Entries are dicts of ENTRY_FIELDS plus "ts" (due date in epoch seconds).
+    Assignments without a due date (or with the calculated "Total" column)
+    are left out. Unsubmitted assignments are also indexed separately, so
+    upcoming() and overdue_available() never scan submitted work.
+    
+    Safe to share between threads: updates build new lists and swap them in
+    with one assignment, so queries always see one consistent version.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the index.
+        
+        Args:
+            path: JSON file to persist the index in (in-memory only if None)
+        """
+        self.path = Path(path) if path else None
+        self.updated_at: Optional[str] = None
+        self._lock = threading.Lock()
+        self._set_entries([])
+        if self.path and self.path.exists():
+            try:
+                data = codec.load_file(self.path)
+            except codec.DecodeError:
+                data = {}
+            if data.get("version") == INDEX_VERSION:
+                self.updated_at = data.get("updated_at")
+                self._set_entries(data.get("entries", []))
+    
+    def _set_entries(self, entries: List[Dict[str, Any]]) -> None:
+        pending = [e for e in entries if not e.get("submitted")]
+        # (entries, times, pending, pending_times), replaced as a whole
+        self._state = (entries, [e["ts"] for e in entries], pending, [e["ts"] for e in pending])
+    
+    def __len__(self) -> int:
+        return len(self._state[0])
+    
+    def update(self, assignments: Iterable[Mapping[str, Any]], keep_courses: Iterable[str] = ()) -> bool:
+        """
+        Rebuild the index from a full assignments sync.
+        
+        Args:
+            assignments: assignment dicts or Assignment records (get_assignments format)
+            keep_courses: Internal IDs of courses whose fetch failed; their
+                          indexed deadlines are kept instead of dropped
+        
+        Returns:
+            True if the index changed (and was persisted)
+        """
+        keep = set(keep_courses)
+        assignments = list(assignments)
+        with self._lock:
+            kept = [e for e in self._state[0] if e.get("course_id") in keep] if keep else []
+            return self._update(kept + assignments)
+    
+    def _update(self, assignments: Iterable[Mapping[str, Any]]) -> bool:
+        entries = []
+        for a in assignments:
+            if a.get("grading_type") == "Calculated":
+                continue
+            ts = _timestamp(a.get("due"))
+            if ts is None:
+                continue
+            entry = {name: a.get(name) for name in ENTRY_FIELDS}
+            entry["ts"] = ts
+            entries.append(entry)
+        entries.sort(key=lambda e: (e["ts"], e.get("course_id") or "", e.get("id") or ""))
+        
+        if entries == self._state[0]:
+            return False
+        
+        self._set_entries(entries)
+        self.updated_at = datetime.now().isoformat()
+        if self.path:
+            codec.dump_file(self.path, {
+                "version": INDEX_VERSION,
+                "updated_at": self.updated_at,
+                "entries": entries
+            })
+        return True
+    
+    def update_course(self, course_id: str, assignments: Iterable[Mapping[str, Any]]) -> bool:
+        """
+        Replace the deadlines of one course (e.g. after polling only that course).
+        
+        Args:
+            course_id: Internal course ID
+            assignments: The course's assignment dicts or Assignment records
+        
+        Returns:
+            True if the index changed (and was persisted)
+        """
+        assignments = list(assignments)
+        with self._lock:
+            others = [e for e in self._state[0] if e.get("course_id") != course_id]
+            return self._update(others + assignments)
+    
+    def upcoming(self, n: int = 10, now: Moment = None, include_submitted: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get the next n deadlines.
+        
+        Args:
+            n: Max number of deadlines
+            now: Reference time (current time if None)
+            include_submitted: Also list already submitted assignments
+        
+        Returns:
+            Entries due at or after now, soonest first
+        """
+        entries, times, pending, pending_times = self._state
+        if not include_submitted:
+            entries, times = pending, pending_times
+        start = bisect_left(times, _moment(now))
+        return entries[start:start + n]
+    
+    def due_between(self, start: Moment, end: Moment) -> List[Dict[str, Any]]:
+        """
+        Get every deadline in [start, end], submitted or not.
+        
+        Args:
+            start: Range start (datetime, ISO 8601 string or epoch seconds)
+            end: Range end, inclusive
+        
+        Returns:
+            Entries sorted by due date
+        
+        Raises:
+            ValueError: If a bound is an unparseable string
+        """
+        entries, times, _, _ = self._state
+        return entries[bisect_left(times, _moment(start)):bisect_right(times, _moment(end))]
+    
+    def overdue_available(self, now: Moment = None) -> List[Dict[str, Any]]:
+        """
+        Get past-due, unsubmitted assignments that still accept late submissions.
+        
+        Args:
+            now: Reference time (current time if None)
+        
+        Returns:
+            Entries sorted by due date, oldest first
+        """
+        _, _, pending, pending_times = self._state
+        end = bisect_left(pending_times, _moment(now))
+        return [e for e in pending[:end] if e.get("accepts_late", True)]
@@ -0,0 +1,274 @@
+"""
+Change events between two syncs of a student's assignments and attendance.
+
+A snapshot keeps, per stable key (course ID + column or meeting ID), a
+content hash and the few fields events are built from. Diffing two
+snapshots only looks closer at keys whose hash changed, so the work (and the
+event list sent downstream) is proportional to what changed.
+
+A course whose fetch failed has no entries, like a course whose last entry
+was removed. Callers pass the IDs of failed courses, whose previous entries
+are then carried over without removal events.
+
+Usage:
+    tracker = ChangeTracker("student.changes.json")
+    failed_assignments, failed_attendance = [], []
+    events = tracker.update(
+        client.get_assignments(failed=failed_assignments),
+        client.get_attendance_by_course(failed=failed_attendance),
+        failed_assignments=failed_assignments,
+        failed_attendance=failed_attendance
+    )
+    for event in events:
+        print(event.type, event.name, event.old, event.new)
+"""
+
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterable, Mapping
+
+from bbpy import codec
+from bbpy.records import Record, AttendanceRecord, record
+
+
+# Assignment fields kept in snapshots (is_past_due is left out: it flips with time, not data)
+ASSIGNMENT_FIELDS = (
+    "name", "due", "score", "score_possible", "status",
+    "submitted", "graded", "accepts_late", "course_name"
+)
+
+# Event types
+ASSIGNMENT_ADDED = "assignment_added"
+ASSIGNMENT_REMOVED = "assignment_removed"
+GRADE_POSTED = "grade_posted"
+GRADE_CHANGED = "grade_changed"
+DEADLINE_CHANGED = "deadline_changed"
+SUBMISSION_CHANGED = "submission_changed"
+ASSIGNMENT_UPDATED = "assignment_updated"
+ATTENDANCE_ADDED = "attendance_added"
+ABSENCE_RECORDED = "absence_recorded"
+ATTENDANCE_CHANGED = "attendance_changed"
+ATTENDANCE_REMOVED = "attendance_removed"
+
+
+@record
+class ChangeEvent(Record):
+    """One change between two snapshots."""
+    
+    type: str
+    key: str
+    course_id: Optional[str]
+    name: Optional[str] = None
+    field: Optional[str] = None
+    old: Any = None
+    new: Any = None
+
+
+def take_snapshot(
+    assignments: Iterable[Mapping[str, Any]] = (),
+    attendance: Optional[Mapping[str, Iterable[Mapping[str, Any]]]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Build a snapshot from sync results.
+    
+    Args:
+        assignments: assignment dicts or Assignment records (get_assignments format)
+        attendance: attendance dicts with "meeting" (or AttendanceRecord records) per internal course ID
+    
+    Returns:
+        JSON-serializable snapshot: {"assignments": {key: entry}, "attendance": {key: entry}},
+        each entry holding "hash" and the tracked fields
+    """
+    snapshot: Dict[str, Dict[str, Any]] = {"assignments": {}, "attendance": {}}
+    
+    for a in assignments:
+        fields = {name: a.get(name) for name in ASSIGNMENT_FIELDS}
+        fields["course_id"] = a.get("course_id")
+        snapshot["assignments"][f"{a.get('course_id')}:{a.get('id')}"] = {
+            "hash": codec.content_hash(fields),
+            **fields
+        }
+    
+    for course_id, records in (attendance or {}).items():
+        for entry in records:
+            if not isinstance(entry, AttendanceRecord):
+                entry = AttendanceRecord.from_dict(entry)
+            meeting = entry.meeting
+            fields = {
+                "course_id": course_id,
+                "status": entry.status,
+                "title": meeting.title,
+                "start": meeting.start
+            }
+            snapshot["attendance"][f"{course_id}:{entry.meeting_id or meeting.id}"] = {
+                "hash": codec.content_hash(fields),
+                **fields
+            }
+    
+    return snapshot
+
+
+def _carry_unknown(
+    previous: Optional[Dict[str, Dict[str, Any]]],
+    current: Dict[str, Dict[str, Any]],
+    failed: Mapping[str, Iterable[str]]
+) -> Dict[str, Dict[str, Any]]:
+    """Return current with the previous entries of failed courses ({section: course IDs})."""
+    carried = dict(current)
+    for section, course_ids in failed.items():
+        course_ids = set(course_ids)
+        if not previous or not course_ids:
+            continue
+        unknown = {
+            key: entry for key, entry in previous.get(section, {}).items()
+            if entry.get("course_id") in course_ids
+        }
+        if unknown:
+            carried[section] = {**current.get(section, {}), **unknown}
+    return carried
+
+
+def _assignment_events(key: str, old: Dict[str, Any], new: Dict[str, Any]) -> List[ChangeEvent]:
+    events = []
+    
+    def event(kind, field=None, old_value=None, new_value=None):
+        events.append(ChangeEvent(kind, key, new.get("course_id"), new.get("name"), field, old_value, new_value))
+    
+    if new.get("graded") and not old.get("graded"):
+        event(GRADE_POSTED, "score", old.get("score"), new.get("score"))
+    elif new.get("score") != old.get("score"):
+        event(GRADE_CHANGED, "score", old.get("score"), new.get("score"))
+    
+    if new.get("due") != old.get("due"):
+        event(DEADLINE_CHANGED, "due", old.get("due"), new.get("due"))
+    
+    if new.get("status") != old.get("status") or new.get("submitted") != old.get("submitted"):
+        event(SUBMISSION_CHANGED, "status", old.get("status"), new.get("status"))
+    
+    # course_name is display data only; it changes no event
+    handled = {"graded", "score", "due", "status", "submitted", "course_name"}
+    for field in ASSIGNMENT_FIELDS:
+        if field not in handled and new.get(field) != old.get(field):
+            event(ASSIGNMENT_UPDATED, field, old.get(field), new.get(field))
+    
+    return events
+
+
+def diff_snapshots(
+    previous: Optional[Dict[str, Dict[str, Any]]],
+    current: Dict[str, Dict[str, Any]],
+    failed_assignments: Iterable[str] = (),
+    failed_attendance: Iterable[str] = ()
+) -> List[ChangeEvent]:
+    """
+    Compute the change events from previous to current.
+    
+    Args:
+        previous: Earlier snapshot (None for the first sync: everything is new)
+        current: Current snapshot
+        failed_assignments: Internal IDs of courses whose assignments fetch
+                            failed; they report no events
+        failed_attendance: Likewise for attendance
+    
+    Returns:
+        List of ChangeEvent records, assignments first, in current order
+    """
+    failed = {"assignments": failed_assignments, "attendance": failed_attendance}
+    return _events(previous, _carry_unknown(previous, current, failed))
+
+
+def _events(
+    previous: Optional[Dict[str, Dict[str, Any]]],
+    current: Dict[str, Dict[str, Any]]
+) -> List[ChangeEvent]:
+    """Change events from previous to current (failed courses already carried over)."""
+    previous = previous or {"assignments": {}, "attendance": {}}
+    events: List[ChangeEvent] = []
+    
+    old_assignments = previous.get("assignments", {})
+    new_assignments = current.get("assignments", {})
+    for key, new in new_assignments.items():
+        old = old_assignments.get(key)
+        if old is None:
+            events.append(ChangeEvent(ASSIGNMENT_ADDED, key, new.get("course_id"), new.get("name"),
+                                      new=new.get("due")))
+        elif old["hash"] != new["hash"]:
+            events.extend(_assignment_events(key, old, new))
+    for key, old in old_assignments.items():
+        if key not in new_assignments:
+            events.append(ChangeEvent(ASSIGNMENT_REMOVED, key, old.get("course_id"), old.get("name")))
+    
+    old_attendance = previous.get("attendance", {})
+    new_attendance = current.get("attendance", {})
+    for key, new in new_attendance.items():
+        old = old_attendance.get(key)
+        if old is not None and old["hash"] == new["hash"]:
+            continue
+        old_status = old.get("status") if old else None
+        if old is not None and old_status == new.get("status"):
+            # Only the meeting itself changed (title or start)
+            continue
+        if (new.get("status") or "").lower() == "absent":
+            kind = ABSENCE_RECORDED
+        else:
+            kind = ATTENDANCE_ADDED if old is None else ATTENDANCE_CHANGED
+        events.append(ChangeEvent(kind, key, new.get("course_id"), new.get("title"), "status",
+                                  old_status, new.get("status")))
+    for key, old in old_attendance.items():
+        if key not in new_attendance:
+            events.append(ChangeEvent(ATTENDANCE_REMOVED, key, old.get("course_id"), old.get("title")))
+    
+    return events
+
+
+class ChangeTracker:
+    """
+    Keeps the last snapshot of a student in a JSON file and reports changes on every sync.
+    
+    The file is replaced atomically, so a crash between syncs never loses the
+    previous snapshot.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the tracker.
+        
+        Args:
+            path: Snapshot file (in-memory only if None)
+        """
+        self.path = Path(path) if path else None
+        self.snapshot: Optional[Dict[str, Dict[str, Any]]] = None
+        if self.path and self.path.exists():
+            try:
+                self.snapshot = codec.load_file(self.path)
+            except codec.DecodeError:
+                self.snapshot = None
+    
+    def update(
+        self,
+        assignments: Iterable[Mapping[str, Any]] = (),
+        attendance: Optional[Mapping[str, Iterable[Mapping[str, Any]]]] = None,
+        failed_assignments: Iterable[str] = (),
+        failed_attendance: Iterable[str] = ()
+    ) -> List[ChangeEvent]:
+        """
+        Diff the new sync results against the stored snapshot, then store them.
+        
+        Failed courses keep their stored entries (see diff_snapshots).
+        
+        Args:
+            assignments: assignment dicts or Assignment records
+            attendance: Attendance records per internal course ID
+            failed_assignments: Internal IDs of courses whose assignments fetch failed
+            failed_attendance: Internal IDs of courses whose attendance fetch failed
+        
+        Returns:
+            Change events since the previous update (everything on the first one)
+        """
+        previous = self.snapshot
+        failed = {"assignments": failed_assignments, "attendance": failed_attendance}
+        current = _carry_unknown(previous, take_snapshot(assignments, attendance), failed)
+        events = _events(previous, current)
+        self.snapshot = current
+        if self.path and current != previous:
+            codec.dump_file(self.path, current)
+        return events
@@ -0,0 +1,369 @@
+"""
+Streaming columnar export of assignments, attendance and course membership.
+
+Rows of many students are buffered per table and written in chunks (at most
+chunk_rows rows in memory per table) as Parquet or Arrow IPC files when
+pyarrow is installed, or as CSV files otherwise:
+
+    out/
+        manifest.json
+        assignments/part-<run>-00000.parquet
+        attendance/part-<run>-00000.parquet
+        courses/part-<run>-00000.parquet
+
+Re-runs are incremental: the manifest keeps a content hash per student and
+table, and only tables whose data changed are written again. Rows carry the
+run that wrote them; a student's current rows of a table are those of the
+run in manifest["students"][student]["tables"][table]["run"]. Readers should
+only load the parts listed in manifest["parts"] (parts of an interrupted run
+are not listed).
+
+Usage:
+    with FleetExporter("export") as exporter:
+        for id_path in id_paths:
+            exporter.add_client(BBClient(id_path=id_path))
+
+    # or, without network, from the .id store (courses and attendance ledger)
+    with FleetExporter("export", format="csv") as exporter:
+        exporter.add_id_files(Path("ids").glob("*.id"))
+"""
+
+import csv
+import hashlib
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterable, Mapping, Tuple
+
+from bbpy import codec
+from bbpy.records import AttendanceRecord
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+    _ARROW_TYPES = {"str": pa.string, "float": pa.float64, "bool": pa.bool_}
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+
+# Column name and type ("str", "float" or "bool") of each table
+SCHEMAS: Dict[str, List[Tuple[str, str]]] = {
+    "assignments": [
+        ("run", "str"), ("student", "str"), ("class_name", "str"),
+        ("id", "str"), ("content_id", "str"), ("name", "str"),
+        ("course_id", "str"), ("course_name", "str"), ("due", "str"),
+        ("score_possible", "float"), ("score", "float"), ("status", "str"),
+        ("submitted", "bool"), ("graded", "bool"), ("is_past_due", "bool"),
+        ("accepts_late", "bool"), ("grading_type", "str")
+    ],
+    "attendance": [
+        ("run", "str"), ("student", "str"), ("class_name", "str"),
+        ("course_id", "str"), ("course_name", "str"), ("meeting_id", "str"),
+        ("meeting_title", "str"), ("meeting_start", "str"), ("meeting_end", "str"),
+        ("status", "str")
+    ],
+    "courses": [
+        ("run", "str"), ("student", "str"), ("class_name", "str"),
+        ("internal_id", "str"), ("course_id", "str"), ("name", "str"),
+        ("url", "str"), ("professors", "str")
+    ]
+}
+
+FORMATS = ("parquet", "arrow", "csv")
+EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+
+def _str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def assignment_rows(
+    assignments: Iterable[Mapping[str, Any]],
+    student: str,
+    class_name: Optional[str]
+) -> List[tuple]:
+    """Flatten assignment dicts (or Assignment records) into assignments rows, without the run column."""
+    return [
+        (
+            student, class_name,
+            _str(a.get("id")), _str(a.get("content_id")), _str(a.get("name")),
+            _str(a.get("course_id")), _str(a.get("course_name")), _str(a.get("due")),
+            _float(a.get("score_possible")), _float(a.get("score")), _str(a.get("status")),
+            bool(a.get("submitted")), bool(a.get("graded")), bool(a.get("is_past_due")),
+            bool(a.get("accepts_late", True)), _str(a.get("grading_type"))
+        )
+        for a in assignments
+    ]
+
+
+def attendance_rows(
+    attendance: Mapping[str, Iterable[Mapping[str, Any]]],
+    student: str,
+    class_name: Optional[str],
+    course_names: Optional[Mapping[str, str]] = None
+) -> List[tuple]:
+    """
+    Flatten attendance records into attendance rows, without the run column.
+    
+    Args:
+        attendance: attendance dicts with "meeting" (or AttendanceRecord records) per internal course ID
+        student: Student key
+        class_name: Student's class
+        course_names: Course name per internal course ID
+    """
+    rows = []
+    for course_id, records in attendance.items():
+        course_name = (course_names or {}).get(course_id)
+        for record in records:
+            if not isinstance(record, AttendanceRecord):
+                record = AttendanceRecord.from_dict(record)
+            meeting = record.meeting
+            rows.append((
+                student, class_name, _str(course_id), course_name,
+                _str(record.meeting_id or meeting.id), meeting.title, meeting.start, meeting.end,
+                _str(record.status)
+            ))
+    # Same order whatever the source (API listing or .id ledger), so equal data hashes equally
+    rows.sort(key=lambda row: (row[2] or "", row[4] or ""))
+    return rows
+
+
+def course_rows(courses: Iterable[Mapping[str, Any]], student: str, class_name: Optional[str]) -> List[tuple]:
+    """Flatten .id course dicts (or Course records) into courses rows, without the run column."""
+    return [
+        (
+            student, class_name,
+            _str(c.get("internal_id")), _str(c.get("course_id")), _str(c.get("name")),
+            _str(c.get("url")), ";".join(c.get("professors") or [])
+        )
+        for c in courses
+    ]
+
+
+class FleetExporter:
+    """
+    Writes many students' data to chunked columnar files with an incremental manifest.
+    
+    Memory is bounded by chunk_rows rows per table: a full buffer is written
+    as a new part file right away.
+    """
+    
+    def __init__(self, out_dir: str, format: str = "auto", chunk_rows: int = 50_000):
+        """
+        Open (or create) an export directory.
+        
+        Args:
+            out_dir: Export directory (holds manifest.json and one folder per table)
+            format: "parquet", "arrow" (Arrow IPC), "csv", or "auto" (parquet
+                    if pyarrow is installed, else csv). Re-runs keep the format
+                    of the existing manifest.
+            chunk_rows: Rows buffered per table before a part file is written
+        
+        Raises:
+            ValueError: If the format is unknown
+            ImportError: If parquet or arrow is requested without pyarrow
+        """
+        self.out_dir = Path(out_dir)
+        self.manifest_path = self.out_dir / "manifest.json"
+        self.manifest = self._load_manifest()
+        
+        if format == "auto":
+            format = self.manifest.get("format") or ("parquet" if pa is not None else "csv")
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {FORMATS} or 'auto'")
+        if format != "csv" and pa is None:
+            raise ImportError(f"{format} export requires pyarrow: pip install pyarrow")
+        if self.manifest.get("format") not in (None, format):
+            raise ValueError(f"{out_dir} already holds a {self.manifest['format']} export")
+        
+        self.format = format
+        self.chunk_rows = chunk_rows
+        self.run = datetime.now().strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+        self._buffers: Dict[str, List[tuple]] = {table: [] for table in SCHEMAS}
+        self._part_numbers: Dict[str, int] = {table: 0 for table in SCHEMAS}
+        self.stats = {"exported": 0, "unchanged": 0, "rows": {table: 0 for table in SCHEMAS}, "parts": 0}
+    
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            return codec.load_file(self.manifest_path)
+        except (FileNotFoundError, codec.DecodeError):
+            return {"version": 2, "format": None, "students": {}, "parts": []}
+    
+    def __enter__(self) -> "FleetExporter":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def add_student(
+        self,
+        student: str,
+        class_name: Optional[str] = None,
+        courses: Iterable[Mapping[str, Any]] = (),
+        assignments: Optional[Iterable[Mapping[str, Any]]] = None,
+        attendance: Optional[Mapping[str, Iterable[Mapping[str, Any]]]] = None
+    ) -> bool:
+        """
+        Queue one student's data for export.
+        
+        Args:
+            student: Unique student key (e.g. username)
+            class_name: Student's class
+            courses: .id course dicts or Course records
+            assignments: assignment dicts or Assignment records; None if not
+                         known (e.g. from a .id file): the previously exported
+                         rows stay current
+            attendance: Attendance records per internal course ID; None if
+                        not known, likewise
+        
+        Returns:
+            True if exported, False if unchanged since the last run
+        """
+        courses = list(courses)
+        course_names = {c.get("internal_id"): c.get("name") for c in courses}
+        rows = {"courses": course_rows(courses, student, class_name)}
+        if assignments is not None:
+            rows["assignments"] = assignment_rows(assignments, student, class_name)
+        if attendance is not None:
+            rows["attendance"] = attendance_rows(attendance, student, class_name, course_names)
+        
+        tables = self._tables(student)
+        changed = {}
+        for table, table_rows in rows.items():
+            digest = hashlib.sha256(codec.dumps(table_rows)).hexdigest()
+            if tables.get(table, {}).get("hash") != digest:
+                changed[table] = (table_rows, digest)
+        if not changed:
+            self.stats["unchanged"] += 1
+            return False
+        
+        for table, (table_rows, digest) in changed.items():
+            buffer = self._buffers[table]
+            buffer.extend((self.run,) + row for row in table_rows)
+            self.stats["rows"][table] += len(table_rows)
+            if len(buffer) >= self.chunk_rows:
+                self._flush(table)
+            tables[table] = {"hash": digest, "run": self.run}
+        
+        self.manifest["students"][student] = {
+            "tables": tables,
+            "exported_at": datetime.now().isoformat()
+        }
+        self.stats["exported"] += 1
+        return True
+    
+    def _tables(self, student: str) -> Dict[str, Dict[str, Any]]:
+        """Hash and run of each table's current rows of a student (copy of the manifest entry)."""
+        entry = self.manifest["students"].get(student) or {}
+        if "tables" in entry:
+            return {table: dict(state) for table, state in entry["tables"].items()}
+        if not entry:
+            return {}
+        # Version 1 manifest: one hash over every table, all written by one run
+        return {table: {"hash": None, "run": entry.get("run")} for table in SCHEMAS}
+    
+    def add_client(self, client, student: Optional[str] = None) -> bool:
+        """
+        Fetch and queue the courses, assignments and attendance of a BBClient.
+        
+        Args:
+            client: Authenticated BBClient with cached .id data
+            student: Student key (defaults to the .id username)
+        """
+        user = (client.get_cached_data() or {}).get("user", {})
+        failed_assignments: List[str] = []
+        failed_attendance: List[str] = []
+        assignments = client.get_assignments(failed=failed_assignments)
+        attendance = client.get_attendance_by_course(failed=failed_attendance)
+        # Rows are replaced per table: if a course failed, the table's exported rows stay current
+        return self.add_student(
+            student or user.get("username") or str(client.user_id),
+            class_name=user.get("class"),
+            courses=list(client.get_course_catalog()),
+            assignments=None if failed_assignments else assignments,
+            attendance=None if failed_attendance else attendance
+        )
+    
+    def add_id_file(self, id_path: str) -> bool:
+        """
+        Queue the courses and ledger attendance of a .id file (no network).
+        
+        A .id file holds no assignments: rows exported earlier (e.g. by
+        add_client) stay current.
+        
+        Args:
+            id_path: Path to the .id file
+        """
+        id_data = codec.load_file(id_path)
+        user = id_data.get("user", {})
+        attendance = {
+            course_id: list(entry.get("records", {}).values())
+            for course_id, entry in (id_data.get("attendance") or {}).items()
+        }
+        return self.add_student(
+            user.get("username") or Path(id_path).stem,
+            class_name=user.get("class"),
+            courses=id_data.get("courses", []),
+            attendance=attendance
+        )
+    
+    def add_id_files(self, id_paths: Iterable[str]) -> int:
+        """Queue every .id file; returns how many students were exported (changed)."""
+        return sum(1 for id_path in id_paths if self.add_id_file(str(id_path)))
+    
+    def _flush(self, table: str) -> None:
+        rows = self._buffers[table]
+        if not rows:
+            return
+        
+        table_dir = self.out_dir / table
+        table_dir.mkdir(parents=True, exist_ok=True)
+        path = table_dir / f"part-{self.run}-{self._part_numbers[table]:05d}{EXTENSIONS[self.format]}"
+        self._part_numbers[table] += 1
+        
+        schema = SCHEMAS[table]
+        if self.format == "csv":
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(name for name, _ in schema)
+                writer.writerows(rows)
+        else:
+            arrow_table = pa.table({
+                name: pa.array([row[i] for row in rows], type=_ARROW_TYPES[kind]())
+                for i, (name, kind) in enumerate(schema)
+            })
+            if self.format == "parquet":
+                pa.parquet.write_table(arrow_table, path)
+            else:
+                with pa.ipc.new_file(path, arrow_table.schema) as writer:
+                    writer.write_table(arrow_table)
+        
+        self.manifest["parts"].append({
+            "table": table,
+            "path": str(path.relative_to(self.out_dir)),
+            "run": self.run,
+            "rows": len(rows)
+        })
+        self.stats["parts"] += 1
+        self._buffers[table] = []
+    
+    def close(self) -> Dict[str, Any]:
+        """
+        Write the remaining buffers and the manifest.
+        
+        Returns:
+            Run statistics: exported and unchanged students, rows per table, parts written
+        """
+        for table in SCHEMAS:
+            self._flush(table)
+        self.manifest["format"] = self.format
+        self.manifest["version"] = 2
+        self.manifest["updated_at"] = datetime.now().isoformat()
+        codec.dump_file(self.manifest_path, self.manifest, pretty=True)
+        return self.stats
+
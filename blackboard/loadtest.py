@@ -0,0 +1,265 @@
+"""
+Load test: many students syncing at once against the local mock Blackboard.
+
+Each sync builds a BBClient from the student's .id file and computes the
+assignment and attendance stats (what a refresh does). The harness sweeps
+concurrency levels and reports throughput, sync latency percentiles, error
+rates and memory per client as JSON, so releases can be compared.
+
+Usage:
+    python -m bbpy.loadtest --students 200 --concurrency 1,4,16,64 --report load.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable, Sequence
+
+from bbpy.client import BBClient
+from bbpy.mock_server import MockBlackboard
+
+
+def sync_student(id_path: str, domain: str) -> BBClient:
+    """Default sync job: build the client and compute assignment and attendance stats."""
+    client = BBClient(id_path=id_path, domain=domain, auto_refresh=False)
+    client.get_assignment_stats()
+    client.get_attendance_percentage()
+    return client
+
+
+def write_id_files(bb: MockBlackboard, directory: Path, students: int) -> List[str]:
+    """Write one fresh .id file per student into directory (created if needed)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    id_paths = []
+    for n in range(students):
+        id_path = str(directory / f"student{n}.id")
+        bb.write_id_file(id_path, student=n)
+        id_paths.append(id_path)
+    return id_paths
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of values (q in [0, 100])."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def measure_client_memory(id_paths: List[str], domain: str, job: Callable = sync_student) -> int:
+    """
+    Measure memory retained per synced client with tracemalloc.
+    
+    Args:
+        id_paths: .id files to sync (one client is kept alive per file)
+        domain: Mock server URL
+        job: Sync job returning the client
+    
+    Returns:
+        Average bytes retained per client
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        clients = [job(id_path, domain) for id_path in id_paths]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        if started:
+            tracemalloc.stop()
+    
+    return int((after - before) / max(len(clients), 1))
+
+
+def run_level(
+    id_paths: List[str],
+    domain: str,
+    concurrency: int,
+    syncs: int,
+    job: Callable = sync_student,
+    bb: Optional[MockBlackboard] = None
+) -> Dict[str, Any]:
+    """
+    Run syncs with a fixed number of concurrent workers.
+    
+    Args:
+        id_paths: Student .id files, used round-robin
+        domain: Mock server URL
+        concurrency: Number of concurrent syncs
+        syncs: Total syncs to run
+        job: Sync job (id_path, domain) -> BBClient
+        bb: Mock server, to count requests
+    
+    Returns:
+        Dict with throughput, latency percentiles and error rate for this level
+    """
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    
+    def one(i):
+        start = time.perf_counter()
+        try:
+            job(id_paths[i % len(id_paths)], domain)
+            return time.perf_counter() - start, None
+        except Exception as e:
+            return time.perf_counter() - start, type(e).__name__
+    
+    if bb is not None:
+        bb.reset_counters()
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for latency, error in executor.map(one, range(syncs)):
+            if error:
+                errors[error] = errors.get(error, 0) + 1
+            else:
+                latencies.append(latency)
+    seconds = time.perf_counter() - start
+    
+    completed = len(latencies)
+    requests = bb.request_count if bb is not None else None
+    return {
+        "concurrency": concurrency,
+        "syncs": syncs,
+        "completed": completed,
+        "errors": errors,
+        "error_rate": round((syncs - completed) / syncs, 4) if syncs else 0.0,
+        "seconds": round(seconds, 3),
+        "throughput_per_s": round(completed / seconds, 3) if seconds else 0.0,
+        "throughput_per_hour": int(completed / seconds * 3600) if seconds else 0,
+        "p50": _round(percentile(latencies, 50)),
+        "p95": _round(percentile(latencies, 95)),
+        "p99": _round(percentile(latencies, 99)),
+        "requests": requests,
+        "requests_per_s": round(requests / seconds, 1) if requests and seconds else None
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 4) if value is not None else None
+
+
+def find_saturation(levels: List[Dict[str, Any]], min_gain: float = 0.1) -> Optional[int]:
+    """
+    Find the concurrency where adding workers stops paying off.
+    
+    Returns:
+        The first concurrency level whose successor improves throughput by
+        less than min_gain (relative), or None if throughput kept scaling
+    """
+    for current, following in zip(levels, levels[1:]):
+        base = current["throughput_per_s"]
+        if base and (following["throughput_per_s"] - base) / base < min_gain:
+            return current["concurrency"]
+    return None
+
+
+def run_load_test(
+    students: int = 100,
+    concurrency: Sequence[int] = (1, 4, 16, 32),
+    syncs_per_level: Optional[int] = None,
+    mock_options: Optional[dict] = None,
+    job: Callable = sync_student,
+    label: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Sweep concurrency levels against a fresh mock server.
+    
+    Syncs write the attendance ledger back into the .id files, so the memory
+    measurement and every level get their own freshly written .id files in
+    separate directories: each level starts equally cold.
+    
+    Args:
+        students: Number of distinct students (.id files)
+        concurrency: Concurrency levels to sweep
+        syncs_per_level: Syncs per level (defaults to students)
+        mock_options: Extra MockBlackboard options (courses, latency, ...)
+        job: Sync job (id_path, domain) -> BBClient
+        label: Free-form label stored in the report (e.g. release version)
+    
+    Returns:
+        Machine-readable report dict
+    """
+    options = {"latency": 0.01, "roster": students}
+    options.update(mock_options or {})
+    options["students"] = students
+    syncs = syncs_per_level or students
+    
+    with MockBlackboard(**options) as bb, tempfile.TemporaryDirectory() as tmp:
+        memory_paths = write_id_files(bb, Path(tmp) / "memory", min(10, students))
+        memory = measure_client_memory(memory_paths, bb.url, job)
+        
+        levels = []
+        for i, level in enumerate(concurrency):
+            id_paths = write_id_files(bb, Path(tmp) / f"level{i}", students)
+            levels.append(run_level(id_paths, bb.url, level, syncs, job, bb))
+    
+    return {
+        "label": label,
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "mode": "threads",
+        "config": {"students": students, "syncs_per_level": syncs, **options},
+        "memory_per_client_bytes": memory,
+        "saturation_concurrency": find_saturation(levels),
+        "levels": levels
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test BBClient syncs against a local mock Blackboard")
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--concurrency", default="1,4,16,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--syncs", type=int, help="Syncs per level (default: one per student)")
+    parser.add_argument("--courses", type=int, default=6)
+    parser.add_argument("--columns", type=int, default=8)
+    parser.add_argument("--meetings", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--label", help="Label stored in the report (e.g. release version)")
+    parser.add_argument("--report", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+    
+    report = run_load_test(
+        students=args.students,
+        concurrency=[int(level) for level in args.concurrency.split(",")],
+        syncs_per_level=args.syncs,
+        mock_options={
+            "courses": args.courses,
+            "columns": args.columns,
+            "meetings": args.meetings,
+            "latency": args.latency,
+            "jitter": args.jitter
+        },
+        label=args.label
+    )
+    
+    print(f"{'concurrency':>11} {'syncs/s':>9} {'syncs/h':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}")
+    for level in report["levels"]:
+        print(
+            f"{level['concurrency']:>11} {level['throughput_per_s']:>9} {level['throughput_per_hour']:>9} "
+            f"{level['p50'] or 0:>8.3f} {level['p95'] or 0:>8.3f} {level['p99'] or 0:>8.3f} {level['error_rate']:>7.2%}"
+        )
+    print(f"memory per client: {report['memory_per_client_bytes'] / 1024:.1f} KiB, "
+          f"saturation at concurrency: {report['saturation_concurrency']}")
+    
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
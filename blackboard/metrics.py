@@ -0,0 +1,220 @@
+"""
+Request instrumentation for BBClient.
+
+Records per-endpoint latency histograms, status code counts, response bytes
+and retries. Endpoints are grouped by template, with IDs normalized away
+("/v1/courses/_16318_1/meetings" -> "/v1/courses/{id}/meetings").
+"""
+
+import json
+import re
+import threading
+from typing import Optional, Dict, Any
+
+
+# Path segments that are IDs: "_16318_1", "12345", "userName:foo", UUIDs, ...
+_ID_SEGMENT = re.compile(
+    r"^(_\d+_\d+|\d+|[0-9a-fA-F-]{32,36}|(externalId|userName|uuid|courseId|primary):.+)$"
+)
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """
+    Replace IDs in an endpoint path with "{id}".
+    
+    Args:
+        endpoint: Endpoint path, e.g. "/v1/courses/_16318_1/meetings/42/users/_9_1"
+    
+    Returns:
+        Endpoint template, e.g. "/v1/courses/{id}/meetings/{id}/users/{id}"
+    """
+    path = endpoint.split("?", 1)[0]
+    return "/".join(
+        "{id}" if _ID_SEGMENT.match(segment) else segment
+        for segment in path.split("/")
+    )
+
+
+class RequestMetrics:
+    """
+    Thread-safe request metrics, exportable as Prometheus text or JSON.
+    
+    A single instance can be shared by many clients to get fleet-wide numbers.
+    
+    Usage:
+        metrics = RequestMetrics()
+        client = BBClient(id_path="username.id", metrics=metrics)
+        client.get_assignments()
+        print(metrics.to_prometheus())
+    """
+    
+    # Latency histogram bucket upper bounds (seconds)
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    
+    def __init__(self, prefix: str = "bbpy"):
+        """
+        Initialize empty metrics.
+        
+        Args:
+            prefix: Prefix for exported Prometheus metric names
+        """
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+    
+    def record(
+        self,
+        endpoint: str,
+        status: Optional[int],
+        latency: float,
+        response_bytes: int = 0,
+        retries: int = 0
+    ) -> None:
+        """
+        Record one completed request.
+        
+        Args:
+            endpoint: Endpoint path (IDs are normalized away)
+            status: HTTP status code, or None if the request raised
+            latency: Wall time in seconds, including retries
+            response_bytes: Size of the response body
+            retries: Number of retries before the final attempt
+        """
+        template = normalize_endpoint(endpoint)
+        status_key = str(status) if status is not None else "error"
+        
+        with self._lock:
+            stats = self._endpoints.get(template)
+            if stats is None:
+                stats = self._endpoints[template] = {
+                    "count": 0,
+                    "latency_sum": 0.0,
+                    "latency_max": 0.0,
+                    "buckets": [0] * (len(self.BUCKETS) + 1),  # last one is +Inf
+                    "status": {},
+                    "bytes": 0,
+                    "retries": 0
+                }
+            
+            stats["count"] += 1
+            stats["latency_sum"] += latency
+            stats["latency_max"] = max(stats["latency_max"], latency)
+            stats["buckets"][self._bucket_index(latency)] += 1
+            stats["status"][status_key] = stats["status"].get(status_key, 0) + 1
+            stats["bytes"] += response_bytes
+            stats["retries"] += retries
+    
+    def _bucket_index(self, latency: float) -> int:
+        for i, bound in enumerate(self.BUCKETS):
+            if latency <= bound:
+                return i
+        return len(self.BUCKETS)
+    
+    def reset(self) -> None:
+        """Drop all recorded metrics."""
+        with self._lock:
+            self._endpoints.clear()
+    
+    def total_requests(self) -> int:
+        """Get the number of recorded requests across all endpoints."""
+        with self._lock:
+            return sum(stats["count"] for stats in self._endpoints.values())
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a JSON-serializable snapshot of all metrics.
+        
+        Returns:
+            Dict with "buckets" (histogram bounds) and "endpoints", mapping each
+            endpoint template to count, latency sum/mean/max, p50/p95/p99
+            estimates, cumulative bucket counts, status counts, bytes and retries
+        """
+        with self._lock:
+            endpoints = {}
+            for template, stats in sorted(self._endpoints.items()):
+                count = stats["count"]
+                endpoints[template] = {
+                    "count": count,
+                    "latency_sum": round(stats["latency_sum"], 6),
+                    "latency_mean": round(stats["latency_sum"] / count, 6) if count else 0.0,
+                    "latency_max": round(stats["latency_max"], 6),
+                    "p50": self._quantile(stats, 0.50),
+                    "p95": self._quantile(stats, 0.95),
+                    "p99": self._quantile(stats, 0.99),
+                    "buckets": self._cumulative(stats["buckets"]),
+                    "status": dict(stats["status"]),
+                    "bytes": stats["bytes"],
+                    "retries": stats["retries"]
+                }
+        
+        return {"buckets": list(self.BUCKETS), "endpoints": endpoints}
+    
+    def to_json(self) -> str:
+        """Get the snapshot as a JSON string."""
+        return json.dumps(self.snapshot(), indent=2)
+    
+    def to_prometheus(self) -> str:
+        """
+        Export metrics in the Prometheus text exposition format.
+        
+        Returns:
+            Text with a latency histogram, request/status counter, response
+            bytes counter and retries counter, all labelled by endpoint
+        """
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_request_duration_seconds Blackboard API request latency.",
+            f"# TYPE {p}_request_duration_seconds histogram"
+        ]
+        requests_lines = [
+            f"# HELP {p}_requests_total Blackboard API requests by status code.",
+            f"# TYPE {p}_requests_total counter"
+        ]
+        bytes_lines = [
+            f"# HELP {p}_response_bytes_total Blackboard API response body bytes.",
+            f"# TYPE {p}_response_bytes_total counter"
+        ]
+        retries_lines = [
+            f"# HELP {p}_request_retries_total Blackboard API request retries.",
+            f"# TYPE {p}_request_retries_total counter"
+        ]
+        
+        with self._lock:
+            for template, stats in sorted(self._endpoints.items()):
+                label = f'endpoint="{_escape_label(template)}"'
+                cumulative = self._cumulative(stats["buckets"])
+                for bound, count in zip(self.BUCKETS, cumulative):
+                    lines.append(f'{p}_request_duration_seconds_bucket{{{label},le="{bound}"}} {count}')
+                lines.append(f'{p}_request_duration_seconds_bucket{{{label},le="+Inf"}} {stats["count"]}')
+                lines.append(f'{p}_request_duration_seconds_sum{{{label}}} {stats["latency_sum"]:.6f}')
+                lines.append(f'{p}_request_duration_seconds_count{{{label}}} {stats["count"]}')
+                
+                for status, count in sorted(stats["status"].items()):
+                    requests_lines.append(f'{p}_requests_total{{{label},status="{status}"}} {count}')
+                bytes_lines.append(f'{p}_response_bytes_total{{{label}}} {stats["bytes"]}')
+                retries_lines.append(f'{p}_request_retries_total{{{label}}} {stats["retries"]}')
+        
+        return "\n".join(lines + requests_lines + bytes_lines + retries_lines) + "\n"
+    
+    @staticmethod
+    def _cumulative(buckets: list) -> list:
+        total = 0
+        cumulative = []
+        for count in buckets:
+            total += count
+            cumulative.append(total)
+        return cumulative
+    
+    def _quantile(self, stats: Dict[str, Any], q: float) -> Optional[float]:
+        """Estimate a latency quantile from the histogram (upper bucket bound)."""
+        if not stats["count"]:
+            return None
+        target = q * stats["count"]
+        for bound, count in zip(self.BUCKETS + (stats["latency_max"],), self._cumulative(stats["buckets"])):
+            if count >= target:
+                return round(min(bound, stats["latency_max"]), 6)
+        return round(stats["latency_max"], 6)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,629 @@
+"""
+Local stand-in for the Blackboard REST API.
+
+Serves the /learn/api/public/v1 and /v2 endpoints used by BBClient with
+generated data (courses, gradebook columns, meetings, rosters) and optional
+injected latency, so performance can be measured without esprit.blackboard.com.
+
+Usage:
+    with MockBlackboard(courses=6, columns=10, latency=0.02) as bb:
+        bb.write_id_file("student.id")
+        client = BBClient(id_path="student.id", domain=bb.url)
+        client.get_assignments()
+        print(bb.request_count)
+
+MockSyncServer stands in for the web app's /api/blackboard/sync route when
+testing DeltaUploader (bbpy.upload).
+"""
+
+import gzip
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, List, Dict, Any, Callable, Tuple
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+from bbpy.metrics import normalize_endpoint
+from bbpy.upload import PROTOCOL, apply_delta
+
+
+API_PREFIX = "/learn/api/public"
+SYNC_PATH = "/api/blackboard/sync"
+
+
+class MockBlackboard:
+    """
+    Threaded HTTP server with generated Blackboard data.
+    
+    Students are identified by their BbRouter cookie ("student:<n>"), so many
+    clients can sync different students against the same server.
+    """
+    
+    CLASS_NAME = "4SAE11"
+    
+    def __init__(
+        self,
+        courses: int = 6,
+        columns: int = 8,
+        meetings: int = 12,
+        roster: int = 30,
+        instructors: int = 2,
+        students: int = 1,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        page_size: int = 100,
+        bulk_attendance: bool = True,
+        unavailable_courses: int = 0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        """
+        Initialize the mock server (call start() or use it as a context manager).
+        
+        Args:
+            courses: Courses each student is enrolled in
+            columns: Gradebook columns per course (plus a calculated "Total")
+            meetings: Attendance meetings per course
+            roster: Students per course roster
+            instructors: Instructors per course
+            students: Number of distinct students that can log in
+            latency: Seconds added to every response
+            jitter: Random extra latency, uniform in [0, jitter] seconds
+            page_size: Default page size of paginated endpoints
+            bulk_attendance: Serve /courses/{id}/meetings/users/{userId}
+            unavailable_courses: Number of courses answering 403 on meetings and gradebook
+            seed: Seed for generated statuses and scores
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.courses = courses
+        self.columns = columns
+        self.meetings = meetings
+        self.roster = roster
+        self.instructors = instructors
+        self.students = students
+        self.latency = latency
+        self.jitter = jitter
+        self.page_size = page_size
+        self.bulk_attendance = bulk_attendance
+        self.unavailable_courses = unavailable_courses
+        self.seed = seed
+        
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self.requests: List[str] = []
+        self.bytes_sent = 0
+        self.connections = 0
+        self._routes = self._build_routes()
+        
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """Base URL to pass to BBClient(domain=...)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "MockBlackboard":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self) -> "MockBlackboard":
+        return self.start()
+    
+    def __exit__(self, *exc) -> None:
+        self.stop()
+    
+    @property
+    def request_count(self) -> int:
+        """Number of requests served since the last reset."""
+        with self._lock:
+            return len(self.requests)
+    
+    def reset_counters(self) -> None:
+        """Forget served requests and accepted connections."""
+        with self._lock:
+            self.requests = []
+            self.bytes_sent = 0
+            self.connections = 0
+    
+    def counts_by_endpoint(self) -> Dict[str, int]:
+        """Get served request counts per endpoint template."""
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for path in self.requests:
+                template = normalize_endpoint(path)
+                counts[template] = counts.get(template, 0) + 1
+        return counts
+    
+    def student_id(self, n: int) -> str:
+        return f"_{1000 + n}_1"
+    
+    def course_id(self, n: int) -> str:
+        return f"_{100 + n}_1"
+    
+    def write_id_file(self, id_path: str, student: int = 0) -> None:
+        """
+        Write an .id file that logs in as the given student.
+        
+        Args:
+            id_path: Path to write
+            student: Student number (0 to students - 1)
+        """
+        courses = [
+            {
+                "name": f"Course {c}",
+                "course_id": f"ESE.MK-{c:02d}",
+                "internal_id": self.course_id(c),
+                "url": f"{self.url}/ultra/courses/{self.course_id(c)}/outline",
+                "professors": [f"Prof {c}-{i}" for i in range(self.instructors)]
+            }
+            for c in range(self.courses)
+        ]
+        id_data = {
+            "generated_at": "2026-01-01T00:00:00",
+            "cookies": [{"name": "BbRouter", "value": f"student:{student}", "domain": "", "path": "/"}],
+            "user": {
+                "name": f"Student {student}",
+                "username": f"student{student}",
+                "email": f"student{student}@esprit.tn",
+                "class": self.CLASS_NAME
+            },
+            "courses": courses
+        }
+        with open(id_path, 'w', encoding='utf-8') as f:
+            json.dump(id_data, f, indent=2)
+    
+    def _user(self, user_id: str) -> Dict[str, Any]:
+        n = user_id.strip("_").split("_")[0]
+        return {
+            "id": user_id,
+            "userName": f"user{n}",
+            "name": {"given": "User", "family": n},
+            "contact": {"email": f"user{n}@esprit.tn"},
+            "availability": {"available": "Yes"}
+        }
+    
+    def _course(self, c: int) -> Dict[str, Any]:
+        course_id = self.course_id(c)
+        return {
+            "id": course_id,
+            "courseId": f"ESE.MK-{c:02d}__{self.CLASS_NAME}",
+            "name": f"Course {c}__{self.CLASS_NAME}",
+            "description": "Generated course " * 20,
+            "externalAccessUrl": f"{self.url}/ultra/courses/{course_id}/outline",
+            "availability": {"available": "Yes", "duration": {"type": "Continuous"}},
+            "enrollment": {"type": "InstructorLed"}
+        }
+    
+    def _column(self, c: int, k: int) -> Dict[str, Any]:
+        if k == self.columns:
+            return {
+                "id": f"_{c}{k:03d}_1",
+                "name": "Total",
+                "score": {"possible": 100},
+                "grading": {"type": "Calculated"}
+            }
+        month = 1 + (k % 12)
+        return {
+            "id": f"_{c}{k:03d}_1",
+            "name": f"Assignment {k}",
+            "description": "Generated assignment " * 10,
+            "contentId": f"_{c}{k:03d}9_1",
+            "score": {"possible": 20},
+            "grading": {"type": "Attempts", "due": f"2026-{month:02d}-15T22:59:00.000Z"},
+            "availability": {"available": "Yes"}
+        }
+    
+    def _meeting(self, c: int, m: int) -> Dict[str, Any]:
+        day = 1 + (m % 28)
+        month = 1 + (m // 28) % 12
+        return {
+            "id": c * 10000 + m,
+            "courseId": self.course_id(c),
+            "title": f"Session {m}",
+            "start": f"2026-{month:02d}-{day:02d}T08:00:00.000Z",
+            "end": f"2026-{month:02d}-{day:02d}T10:00:00.000Z"
+        }
+    
+    def _pick(self, *key) -> int:
+        # Stable across processes, unlike hash()
+        return zlib.crc32(repr((self.seed,) + key).encode())
+    
+    def _attendance(self, c: int, m: int, student_id: str) -> Dict[str, Any]:
+        statuses = ["Present", "Present", "Present", "Late", "Absent", "Excused"]
+        return {
+            "id": c * 100000 + m,
+            "meetingId": str(self._meeting(c, m)["id"]),
+            "userId": student_id,
+            "status": statuses[self._pick("att", c, m, student_id) % len(statuses)]
+        }
+    
+    def _grade(self, c: int, k: int, student_id: str) -> Optional[Dict[str, Any]]:
+        pick = self._pick("grade", c, k, student_id) % 4
+        if pick == 0:
+            return None  # Not submitted
+        record = {"userId": student_id, "columnId": f"_{c}{k:03d}_1"}
+        if pick == 1:
+            record["status"] = "NeedsGrading"
+        else:
+            record["status"] = "Graded"
+            record["score"] = float(self._pick("score", c, k, student_id) % 21)
+        return record
+    
+    def _course_index(self, course_id: str) -> Optional[int]:
+        match = re.fullmatch(r"_(\d+)_1", course_id)
+        if not match:
+            return None
+        c = int(match.group(1)) - 100
+        return c if 0 <= c < self.courses else None
+    
+    def _available(self, c: int) -> bool:
+        return c >= self.unavailable_courses
+    
+    def _build_routes(self) -> List[Tuple[re.Pattern, Callable]]:
+        ID = r"([^/]+)"
+        routes = [
+            (r"/v1/users/me", self._route_me),
+            (rf"/v1/users/{ID}/courses", self._route_user_courses),
+            (rf"/v1/users/{ID}", self._route_user),
+            (rf"/v1/courses/{ID}", self._route_course),
+            (rf"/v1/courses/{ID}/users", self._route_course_users),
+            (rf"/v1/courses/{ID}/meetings", self._route_meetings),
+            (rf"/v1/courses/{ID}/meetings/users/{ID}", self._route_user_attendance),
+            (rf"/v1/courses/{ID}/meetings/{ID}/users/{ID}", self._route_meeting_attendance),
+            (rf"/v1/courses/{ID}/contents/{ID}", self._route_content),
+            (rf"/v2/courses/{ID}/gradebook/columns", self._route_columns),
+            (rf"/v[12]/courses/{ID}/gradebook/columns/{ID}/users/{ID}", self._route_grade),
+        ]
+        return [(re.compile(pattern), handler) for pattern, handler in routes]
+    
+    def dispatch(self, path: str, query: Dict[str, str], student: Optional[int]) -> Tuple[int, Any]:
+        """
+        Resolve a request to (status, JSON body).
+        
+        Args:
+            path: Path below /learn/api/public (e.g. "/v1/users/me")
+            query: Query parameters
+            student: Student number from the cookie, None if not logged in
+        """
+        if student is None:
+            return 401, {"status": 401, "message": "Unauthorized"}
+        
+        for pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match:
+                status, body = handler(student, query, *match.groups())
+                if status == 200 and query.get("fields"):
+                    body = self._project(body, query["fields"].split(","))
+                return status, body
+        return 404, {"status": 404, "message": "Not found"}
+    
+    @staticmethod
+    def _project(body: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+        """Apply a fields= projection to an object, or to each result of a listing."""
+        if "results" in body:
+            results = [{k: v for k, v in item.items() if k in fields} for item in body["results"]]
+            return dict(body, results=results)
+        return {k: v for k, v in body.items() if k in fields}
+    
+    def _paginate(self, path: str, items: List[Any], query: Dict[str, str]) -> Tuple[int, Any]:
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", self.page_size))
+        page = items[offset:offset + limit]
+        body: Dict[str, Any] = {"results": page}
+        if offset + limit < len(items):
+            next_query = dict(query, offset=offset + limit)
+            body["paging"] = {"nextPage": f"{API_PREFIX}{path}?{urlencode(next_query)}"}
+        return 200, body
+    
+    def _route_me(self, student, query):
+        return 200, self._user(self.student_id(student))
+    
+    def _route_user(self, student, query, user_id):
+        return 200, self._user(user_id)
+    
+    def _route_user_courses(self, student, query, user_id):
+        memberships = [
+            {"id": f"_{c}9_1", "userId": user_id, "courseId": self.course_id(c), "courseRoleId": "Student"}
+            for c in range(self.courses)
+        ]
+        return self._paginate(f"/v1/users/{user_id}/courses", memberships, query)
+    
+    def _route_course(self, student, query, course_id):
+        c = self._course_index(course_id)
+        if c is None:
+            return 404, {"status": 404}
+        return 200, self._course(c)
+    
+    def _route_course_users(self, student, query, course_id):
+        c = self._course_index(course_id)
+        if c is None:
+            return 404, {"status": 404}
+        members = [
+            {"userId": f"_{5000 + c * 10 + i}_1", "courseId": course_id, "courseRoleId": "Instructor"}
+            for i in range(self.instructors)
+        ] + [
+            {"userId": self.student_id(s), "courseId": course_id, "courseRoleId": "Student"}
+            for s in range(self.roster)
+        ]
+        return self._paginate(f"/v1/courses/{course_id}/users", members, query)
+    
+    def _route_meetings(self, student, query, course_id):
+        c = self._course_index(course_id)
+        if c is None:
+            return 404, {"status": 404}
+        if not self._available(c):
+            return 403, {"status": 403}
+        meetings = [self._meeting(c, m) for m in range(self.meetings)]
+        return self._paginate(f"/v1/courses/{course_id}/meetings", meetings, query)
+    
+    def _route_user_attendance(self, student, query, course_id, user_id):
+        if not self.bulk_attendance:
+            return 404, {"status": 404}
+        c = self._course_index(course_id)
+        if c is None or not self._available(c):
+            return 403, {"status": 403}
+        # Like the real endpoint, not filtered by course
+        records = [
+            self._attendance(cc, m, user_id)
+            for cc in range(self.courses) if self._available(cc)
+            for m in range(self.meetings)
+        ]
+        return self._paginate(f"/v1/courses/{course_id}/meetings/users/{user_id}", records, query)
+    
+    def _route_meeting_attendance(self, student, query, course_id, meeting_id, user_id):
+        c = self._course_index(course_id)
+        if c is None or not self._available(c):
+            return 403, {"status": 403}
+        m = int(meeting_id) - c * 10000
+        if not 0 <= m < self.meetings:
+            return 404, {"status": 404}
+        return 200, self._attendance(c, m, user_id)
+    
+    def _route_content(self, student, query, course_id, content_id):
+        c = self._course_index(course_id)
+        if c is None:
+            return 404, {"status": 404}
+        k = int(content_id.strip("_").split("_")[0]) // 10 % 1000
+        return 200, {
+            "id": content_id,
+            "title": f"Assignment {k}",
+            "body": "<p>Generated content</p>" * 10,
+            "contentHandler": {
+                "id": "resource/x-bb-asmt-test-link",
+                "isLateAttemptCreationDisallowed": k % 3 == 0
+            }
+        }
+    
+    def _route_columns(self, student, query, course_id):
+        c = self._course_index(course_id)
+        if c is None:
+            return 404, {"status": 404}
+        if not self._available(c):
+            return 403, {"status": 403}
+        columns = [self._column(c, k) for k in range(self.columns + 1)]
+        return self._paginate(f"/v2/courses/{course_id}/gradebook/columns", columns, query)
+    
+    def _route_grade(self, student, query, course_id, column_id, user_id):
+        c = self._course_index(course_id)
+        if c is None or not self._available(c):
+            return 403, {"status": 403}
+        k = int(column_id.strip("_").split("_")[0]) % 1000
+        grade = self._grade(c, k, user_id)
+        if grade is None:
+            return 404, {"status": 404}
+        return 200, grade
+    
+    def _delay(self) -> None:
+        delay = self.latency
+        if self.jitter:
+            with self._lock:
+                delay += self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+    
+    def _handler_class(self):
+        mock = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; avoid Nagle + delayed ACK stalls
+            disable_nagle_algorithm = True
+            
+            def setup(self):
+                # One handler per TCP connection (keep-alive serves many requests)
+                super().setup()
+                with mock._lock:
+                    mock.connections += 1
+            
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if not parts.path.startswith(API_PREFIX):
+                    self._send(404, {"status": 404})
+                    return
+                
+                path = parts.path[len(API_PREFIX):]
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                with mock._lock:
+                    mock.requests.append(path)
+                
+                mock._delay()
+                status, body = mock.dispatch(path, query, self._student())
+                self._send(status, body)
+            
+            def _student(self) -> Optional[int]:
+                match = re.search(r"BbRouter=student:(\d+)", self.headers.get("Cookie", ""))
+                if not match:
+                    return None
+                n = int(match.group(1))
+                return n if n < mock.students else None
+            
+            def _send(self, status: int, body: Any) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                with mock._lock:
+                    mock.bytes_sent += len(payload)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+
+
+class MockSyncServer:
+    """
+    Threaded HTTP server implementing the batched delta sync protocol.
+    
+    Keeps each student's document and version, applies uploads with version
+    checks, and answers already applied upload ids as duplicates. Failures
+    can be injected to exercise retries.
+    """
+    
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize the server (call start() or use it as a context manager).
+        
+        Args:
+            latency: Seconds added to every response
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.latency = latency
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.versions: Dict[str, int] = {}
+        # Last applied upload id per student
+        self.applied: Dict[str, str] = {}
+        
+        # Next requests answered 503 without applying anything
+        self.fail_next = 0
+        # Next requests applied, then answered 503 (as if the response was lost)
+        self.fail_after_apply = 0
+        
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.bytes_received = 0
+        self.parse_seconds = 0.0
+        
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """Sync endpoint URL to pass to DeltaUploader."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{SYNC_PATH}"
+    
+    def start(self) -> "MockSyncServer":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self) -> "MockSyncServer":
+        return self.start()
+    
+    def __exit__(self, *exc) -> None:
+        self.stop()
+    
+    def apply(self, account: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply one account entry (caller holds the lock).
+        
+        Returns:
+            Result with the upload id, status ("ok", "duplicate" or "conflict")
+            and the student's current version
+        """
+        student = account["student"]
+        current = self.versions.get(student, 0)
+        result = {"id": account["id"], "student": student}
+        
+        if self.applied.get(student) == account["id"]:
+            return dict(result, status="duplicate", version=current)
+        if not account.get("full") and account.get("base") != current:
+            return dict(result, status="conflict", version=current)
+        
+        self.documents[student] = apply_delta(self.documents.get(student, {}), account)
+        # A full upload from a client that lost its state never moves the version back
+        self.versions[student] = max(current + 1, account["version"])
+        self.applied[student] = account["id"]
+        return dict(result, status="ok", version=self.versions[student])
+    
+    def _handle(self, raw: bytes, encoding: str) -> Tuple[int, Any]:
+        started = time.perf_counter()
+        try:
+            if encoding == "gzip":
+                raw = gzip.decompress(raw)
+            body = json.loads(raw)
+        except (OSError, ValueError):
+            return 400, {"error": "Malformed body"}
+        if body.get("protocol") != PROTOCOL:
+            return 400, {"error": "Unsupported protocol"}
+        
+        with self._lock:
+            self.parse_seconds += time.perf_counter() - started
+            if self.fail_next:
+                self.fail_next -= 1
+                return 503, {"error": "Unavailable"}
+            results = [self.apply(account) for account in body.get("accounts", [])]
+            if self.fail_after_apply:
+                self.fail_after_apply -= 1
+                return 503, {"error": "Unavailable"}
+        return 200, {"results": results}
+    
+    def _handler_class(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+            
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with server._lock:
+                    server.requests += 1
+                    server.bytes_received += len(raw)
+                
+                if urlsplit(self.path).path != SYNC_PATH:
+                    self._send(404, {"error": "Not found"})
+                    return
+                if server.latency > 0:
+                    time.sleep(server.latency)
+                self._send(*server._handle(raw, self.headers.get("Content-Encoding", "")))
+            
+            def _send(self, status: int, body: Any) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
@@ -0,0 +1,295 @@
+"""
+Profiling mode for BBClient operations.
+
+Records a call tree of spans (operation -> course -> column -> request) with
+wall time, CPU time and optionally tracemalloc peaks, and exports it as a
+speedscope file or as collapsed stacks for flamegraph.pl.
+"""
+
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Optional, List, Dict, Any
+
+
+class Span:
+    """One timed region of the call tree."""
+    
+    __slots__ = (
+        "name", "parent", "children", "thread", "start", "end",
+        "cpu_start", "cpu", "mem_start", "mem_peak", "_peak_so_far"
+    )
+    
+    def __init__(self, name: str, parent: Optional["Span"]):
+        self.name = name
+        self.parent = parent
+        self.children: List["Span"] = []
+        self.thread = threading.current_thread().name
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.cpu_start = time.thread_time()
+        self.cpu = 0.0
+        self.mem_start = 0
+        self.mem_peak: Optional[int] = None
+        self._peak_so_far = 0
+    
+    @property
+    def wall(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "name": self.name,
+            "thread": self.thread,
+            "wall": round(self.wall, 6),
+            "cpu": round(self.cpu, 6),
+            "children": [child.to_dict() for child in self.children]
+        }
+        if self.mem_peak is not None:
+            data["mem_peak"] = self.mem_peak
+        return data
+
+
+class Profiler:
+    """
+    Collects spans while it is active.
+    
+    Spans opened in worker threads (e.g. parallel attendance requests) are
+    attached to the span active in the thread that started the profiler,
+    since that thread is waiting on them.
+    
+    Usage:
+        with client.profile(trace_memory=True) as prof:
+            client.get_assignments()
+        prof.write_speedscope("sync.speedscope.json")
+        print(prof.summary())
+    """
+    
+    def __init__(self, trace_memory: bool = False):
+        """
+        Initialize the profiler.
+        
+        Args:
+            trace_memory: If True, record tracemalloc peaks per span (slower)
+        """
+        self.trace_memory = trace_memory
+        self.roots: List[Span] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._owner_stack: List[Span] = []
+        self._started_tracemalloc = False
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+    
+    def __enter__(self) -> "Profiler":
+        self.start_time = time.perf_counter()
+        self._local.stack = self._owner_stack
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.end_time = time.perf_counter()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+    
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    @contextmanager
+    def span(self, name: str):
+        """
+        Time a region as a child of the current span.
+        
+        Args:
+            name: Span name (e.g. "get_assignments", "course:_123_1")
+        """
+        stack = self._stack()
+        if stack:
+            parent = stack[-1]
+        else:
+            # Worker thread: attach to whatever the owning thread is waiting in
+            parent = self._owner_stack[-1] if self._owner_stack else None
+        
+        if self.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent._peak_so_far = max(parent._peak_so_far, peak)
+            tracemalloc.reset_peak()
+        
+        span = Span(name, parent)
+        if self.trace_memory and tracemalloc.is_tracing():
+            span.mem_start = tracemalloc.get_traced_memory()[0]
+        
+        with self._lock:
+            (parent.children if parent is not None else self.roots).append(span)
+        
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            stack.pop()
+            span.end = time.perf_counter()
+            span.cpu = time.thread_time() - span.cpu_start
+            if self.trace_memory and tracemalloc.is_tracing():
+                peak = max(span._peak_so_far, tracemalloc.get_traced_memory()[1])
+                span.mem_peak = max(peak - span.mem_start, 0)
+                if parent is not None:
+                    parent._peak_so_far = max(parent._peak_so_far, peak)
+    
+    def _walk(self):
+        pending = [(root, (root.name,)) for root in reversed(self.roots)]
+        while pending:
+            span, path = pending.pop()
+            yield span, path
+            for child in reversed(span.children):
+                pending.append((child, path + (child.name,)))
+    
+    def report(self) -> Dict[str, Any]:
+        """
+        Get the full call tree.
+        
+        Returns:
+            Dict with total wall time and the list of root spans, each with
+            name, thread, wall, cpu, mem_peak (if traced) and children
+        """
+        end = self.end_time or time.perf_counter()
+        return {
+            "wall": round(end - (self.start_time or end), 6),
+            "spans": [root.to_dict() for root in self.roots]
+        }
+    
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate spans by name.
+        
+        Span names are grouped on their prefix ("course:_1_1" -> "course"),
+        so per-course and per-column spans add up.
+        
+        Returns:
+            Dict mapping name to count, total wall, total cpu and wall - cpu
+            (time spent waiting, mostly on the network)
+        """
+        totals: Dict[str, Dict[str, Any]] = {}
+        for span, _ in self._walk():
+            key = span.name.split(":", 1)[0]
+            entry = totals.setdefault(key, {"count": 0, "wall": 0.0, "cpu": 0.0})
+            entry["count"] += 1
+            entry["wall"] += span.wall
+            entry["cpu"] += span.cpu
+        
+        for entry in totals.values():
+            entry["wait"] = round(max(entry["wall"] - entry["cpu"], 0.0), 6)
+            entry["wall"] = round(entry["wall"], 6)
+            entry["cpu"] = round(entry["cpu"], 6)
+        return totals
+    
+    def to_collapsed(self, metric: str = "wall") -> str:
+        """
+        Export collapsed stacks ("a;b;c <self time in microseconds>") for flamegraph.pl.
+        
+        Args:
+            metric: "wall" or "cpu"
+        
+        Returns:
+            One line per stack, summed over identical stacks
+        """
+        weights: Dict[str, int] = {}
+        for span, path in self._walk():
+            total = span.wall if metric == "wall" else span.cpu
+            children = sum((c.wall if metric == "wall" else c.cpu) for c in span.children)
+            # Children running in parallel threads can add up to more than the parent
+            self_time = max(total - children, 0.0)
+            key = ";".join(name.replace(";", ",") for name in path)
+            weights[key] = weights.get(key, 0) + int(self_time * 1_000_000)
+        
+        return "\n".join(f"{stack} {weight}" for stack, weight in weights.items() if weight) + "\n"
+    
+    def to_speedscope(self, name: str = "bbpy") -> Dict[str, Any]:
+        """
+        Export an evented speedscope profile (https://www.speedscope.app), one per thread.
+        
+        Args:
+            name: Profile name shown in speedscope
+        
+        Returns:
+            Dict in the speedscope file format
+        """
+        frames: List[Dict[str, str]] = []
+        frame_index: Dict[str, int] = {}
+        by_thread: Dict[str, List[Span]] = {}
+        for span, _ in self._walk():
+            by_thread.setdefault(span.thread, []).append(span)
+            if span.name not in frame_index:
+                frame_index[span.name] = len(frames)
+                frames.append({"name": span.name})
+        
+        origin = self.start_time or 0.0
+        profiles = []
+        for thread, spans in by_thread.items():
+            events = []
+            for span in spans:
+                end = span.end or span.start
+                events.append((span.start - origin, 1, -end, "O", frame_index[span.name]))
+                events.append((end - origin, 0, -span.start, "C", frame_index[span.name]))
+            # Closes before opens at the same instant, outer spans open first / close last
+            events.sort()
+            profiles.append({
+                "type": "evented",
+                "name": f"{name} ({thread})",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": max((e[0] for e in events), default=0),
+                "events": [{"type": kind, "frame": frame, "at": at} for at, _, _, kind, frame in events]
+            })
+        
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "bbpy",
+            "shared": {"frames": frames},
+            "profiles": profiles
+        }
+    
+    def write_speedscope(self, path: str, name: str = "bbpy") -> None:
+        """Write the speedscope profile to a file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_speedscope(name), f)
+    
+    def write_collapsed(self, path: str, metric: str = "wall") -> None:
+        """Write collapsed stacks to a file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_collapsed(metric))
+
+
+def span(owner, name: str):
+    """
+    Open a span on owner's active profiler, or do nothing if it isn't profiling.
+    
+    Args:
+        owner: Object with a _profiler attribute (e.g. BBClient)
+        name: Span name
+    """
+    profiler = getattr(owner, "_profiler", None)
+    if profiler is None:
+        return nullcontext()
+    return profiler.span(name)
+
+
+def profiled(method):
+    """Decorator that wraps a BBClient method in a span named after it."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if getattr(self, "_profiler", None) is None:
+            return method(self, *args, **kwargs)
+        with self._profiler.span(method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,279 @@
+"""
+Mass re-authentication: parallel Selenium logins with resource caps.
+
+When many sessions expire at once (e.g. after a Blackboard restart), every
+account needs a browser login. ReauthPool runs them in a process pool sized
+by available RAM and CPU, highest priority first, and writes the new cookies
+back with update_id_file_cookies (from the parent process only, one file
+at a time).
+
+Usage:
+    pool = ReauthPool(domain="https://esprit.blackboard.com")
+    result = pool.run(Path("ids").glob("*.id"))
+
+    python -m bbpy.reauth ids/*.id --check --memory-per-browser 500
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable, Iterable
+
+import requests
+
+from bbpy import codec
+from bbpy.auth import login_with_selenium, load_id_file, update_id_file_cookies
+from bbpy.deadlines import DeadlineIndex
+from bbpy.exceptions import BBAuthError
+
+
+def available_memory() -> Optional[int]:
+    """Bytes of memory available for new processes (None if unknown)."""
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def max_browsers(
+    memory_per_browser: int = 400 * 1024 * 1024,
+    cpus_per_browser: float = 0.5,
+    reserve_memory: int = 512 * 1024 * 1024,
+    limit: Optional[int] = None
+) -> int:
+    """
+    Number of browsers the machine can run at once.
+    
+    Args:
+        memory_per_browser: Bytes one headless Chrome and its driver take
+        cpus_per_browser: CPU cores one login keeps busy
+        reserve_memory: Bytes left for everything else
+        limit: Hard upper bound
+    
+    Returns:
+        The smaller of the memory and CPU caps (at least 1)
+    """
+    caps = [int((os.cpu_count() or 1) / cpus_per_browser)]
+    memory = available_memory()
+    if memory is not None:
+        caps.append((memory - reserve_memory) // memory_per_browser)
+    if limit is not None:
+        caps.append(limit)
+    return max(1, min(caps))
+
+
+def _login(username: str, password: str, domain: str, headless: bool, timeout: int) -> List[Dict[str, str]]:
+    """Pool worker: log in and return the cookies (sessions do not cross processes)."""
+    session = login_with_selenium(username, password, domain, headless=headless, timeout=timeout)
+    return [
+        {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path}
+        for c in session.cookies
+    ]
+
+
+def session_is_valid(id_path: str, domain: str, timeout: float = 10.0) -> bool:
+    """Check an .id file's cookies with one cheap API request."""
+    try:
+        session, _ = load_id_file(id_path)
+        response = session.get(
+            f"{domain}/learn/api/public/v1/users/me",
+            params={"fields": "id"},
+            timeout=timeout
+        )
+    except (BBAuthError, requests.RequestException):
+        return False
+    return response.status_code == 200
+
+
+def deadline_priority(cache_dir: str) -> Callable[[str, Dict[str, Any]], float]:
+    """
+    Priority function: accounts with the soonest unsubmitted deadline first.
+    
+    Reads the deadline indexes BBClient keeps in cache_dir/deadlines;
+    accounts without one come after all accounts with a deadline.
+    """
+    now = datetime.now(timezone.utc).timestamp()
+    
+    def priority(id_path: str, id_data: Dict[str, Any]) -> float:
+        username = id_data.get("user", {}).get("username")
+        index_path = Path(cache_dir) / "deadlines" / f"{username}.json"
+        if not username or not index_path.exists():
+            return float("inf")
+        upcoming = DeadlineIndex(str(index_path)).upcoming(1, now=now)
+        return upcoming[0]["ts"] - now if upcoming else float("inf")
+    
+    return priority
+
+
+def recently_active_priority(id_path: str, id_data: Dict[str, Any]) -> float:
+    """Default priority: the most recently refreshed .id files (active users) first."""
+    return -Path(id_path).stat().st_mtime
+
+
+class ReauthPool:
+    """
+    Re-authenticates many .id files with a capped pool of browser processes.
+    
+    Logins run in worker processes (one browser each); the parent orders the
+    queue, collects cookies and writes them back, so .id files are never
+    written concurrently.
+    """
+    
+    def __init__(
+        self,
+        domain: str = "https://esprit.blackboard.com",
+        workers: Optional[int] = None,
+        memory_per_browser: int = 400 * 1024 * 1024,
+        cpus_per_browser: float = 0.5,
+        headless: bool = True,
+        timeout: int = 10,
+        priority: Callable[[str, Dict[str, Any]], float] = recently_active_priority,
+        login: Callable[..., List[Dict[str, str]]] = _login
+    ):
+        """
+        Initialize the pool.
+        
+        Args:
+            domain: Blackboard domain URL
+            workers: Concurrent browsers (computed by max_browsers() if None)
+            memory_per_browser: Bytes per browser, for the memory cap
+            cpus_per_browser: Cores per browser, for the CPU cap
+            headless: Run browsers headless
+            timeout: Selenium element timeout (seconds)
+            priority: Function (id_path, id_data) -> sort key; lowest goes first
+            login: Pool function (username, password, domain, headless, timeout)
+                   returning cookie dicts; must be picklable (module level)
+        """
+        self.domain = domain
+        self.workers = workers or max_browsers(memory_per_browser, cpus_per_browser)
+        self.headless = headless
+        self.timeout = timeout
+        self.priority = priority
+        self.login = login
+    
+    def _queue(self, id_paths: Iterable[str]) -> Dict[str, Any]:
+        """Load the .id files, drop those without stored credentials, and sort by priority."""
+        queue = []
+        skipped = {}
+        for id_path in map(str, id_paths):
+            try:
+                id_data = codec.load_file(id_path)
+            except (OSError, codec.DecodeError) as e:
+                skipped[id_path] = f"unreadable: {e}"
+                continue
+            credentials = id_data.get("credentials") or {}
+            if not credentials.get("username") or not credentials.get("password"):
+                skipped[id_path] = "no stored credentials"
+                continue
+            queue.append((self.priority(id_path, id_data), id_path, credentials))
+        queue.sort(key=lambda item: item[0])
+        return {"queue": [(id_path, credentials) for _, id_path, credentials in queue], "skipped": skipped}
+    
+    def run(self, id_paths: Iterable[str], check: bool = False, check_workers: int = 16) -> Dict[str, Any]:
+        """
+        Log in again for every .id file and store the new cookies.
+        
+        Args:
+            id_paths: .id files to re-authenticate
+            check: First test each session with an API request (in threads)
+                   and only log in where it expired
+            check_workers: Threads for the session checks
+        
+        Returns:
+            Dict with "refreshed" (id paths), "failed" ({id_path: error}),
+            "skipped" ({id_path: reason}), "valid" (sessions still working),
+            "workers" and "seconds"
+        """
+        start = time.perf_counter()
+        loaded = self._queue(id_paths)
+        queue = loaded["queue"]
+        valid = []
+        
+        if check and queue:
+            with ThreadPoolExecutor(max_workers=check_workers) as executor:
+                checks = list(executor.map(lambda item: session_is_valid(item[0], self.domain), queue))
+            valid = [id_path for (id_path, _), ok in zip(queue, checks) if ok]
+            queue = [item for item, ok in zip(queue, checks) if not ok]
+        
+        refreshed = []
+        failed = {}
+        if queue:
+            print(f"🔄 Re-authenticating {len(queue)} accounts with {self.workers} browsers...")
+            # Submitted in priority order; the pool starts them in that order
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(queue))) as executor:
+                futures = {
+                    executor.submit(
+                        self.login, credentials["username"], credentials["password"],
+                        self.domain, self.headless, self.timeout
+                    ): id_path
+                    for id_path, credentials in queue
+                }
+                for future in as_completed(futures):
+                    id_path = futures[future]
+                    try:
+                        cookies = future.result()
+                        session = requests.Session()
+                        for cookie in cookies:
+                            session.cookies.set(
+                                cookie["name"], cookie["value"],
+                                domain=cookie.get("domain") or "", path=cookie.get("path") or "/"
+                            )
+                        update_id_file_cookies(id_path, session)
+                        refreshed.append(id_path)
+                    except Exception as e:
+                        failed[id_path] = f"{type(e).__name__}: {e}"
+        
+        return {
+            "refreshed": refreshed,
+            "failed": failed,
+            "skipped": loaded["skipped"],
+            "valid": valid,
+            "workers": self.workers,
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-authenticate many .id files with parallel browser logins")
+    parser.add_argument("id_paths", nargs="+")
+    parser.add_argument("--domain", default="https://esprit.blackboard.com")
+    parser.add_argument("--workers", type=int, help="Concurrent browsers (default: from RAM and CPU)")
+    parser.add_argument("--memory-per-browser", type=int, default=400, help="MB per browser")
+    parser.add_argument("--cpus-per-browser", type=float, default=0.5)
+    parser.add_argument("--check", action="store_true", help="Only log in where the session expired")
+    parser.add_argument("--cache-dir", help="Prioritize by the deadline indexes in this BBClient cache_dir")
+    parser.add_argument("--show-browser", action="store_true")
+    args = parser.parse_args(argv)
+    
+    pool = ReauthPool(
+        domain=args.domain,
+        workers=args.workers,
+        memory_per_browser=args.memory_per_browser * 1024 * 1024,
+        cpus_per_browser=args.cpus_per_browser,
+        headless=not args.show_browser,
+        priority=deadline_priority(args.cache_dir) if args.cache_dir else recently_active_priority
+    )
+    result = pool.run(args.id_paths, check=args.check)
+    
+    print(f"✅ {len(result['refreshed'])} refreshed, {len(result['valid'])} still valid, "
+          f"{len(result['skipped'])} skipped in {result['seconds']}s ({result['workers']} browsers)")
+    for id_path, error in result["failed"].items():
+        print(f"❌ {id_path}: {error}")
+    for id_path, reason in result["skipped"].items():
+        print(f"⚠️  {id_path}: {reason}")
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
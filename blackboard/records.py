@@ -0,0 +1,193 @@
+"""
+Compact record types for assignments, attendance and courses.
+
+BBClient returns plain dicts by default; pass records=True (e.g.
+get_assignments(records=True)) to get these records instead. Records are
+slotted dataclasses: a fraction of the memory of the equivalent dicts, with
+faster attribute access. They behave like read-mostly dicts (record["name"],
+record.get("score"), "due" in record, dict(record)), but their keys are
+fixed: keys the API adds are not kept, and setting an unknown key raises
+KeyError. to_dict() converts when a plain dict is needed.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Optional, List, Dict, Any, ClassVar, Iterator
+
+
+class Record:
+    """
+    Dict-like access for slotted dataclass records.
+    
+    Dict keys are the field names, except where _KEYS maps an API key
+    (e.g. "meetingId") to its field ("meeting_id"). Subclasses are declared
+    with the @record decorator.
+    """
+    
+    __slots__ = ()
+    __hash__ = None
+    
+    _KEYS: ClassVar[Dict[str, str]] = {}
+    # Dict key -> field name, in field order (set by @record)
+    _FIELDS: ClassVar[Dict[str, str]] = {}
+    
+    def keys(self) -> List[str]:
+        return list(self._FIELDS)
+    
+    def values(self) -> List[Any]:
+        return [getattr(self, name) for name in self._FIELDS.values()]
+    
+    def items(self) -> List[tuple]:
+        return [(key, getattr(self, name)) for key, name in self._FIELDS.items()]
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        name = self._FIELDS.get(key)
+        return getattr(self, name) if name is not None else default
+    
+    def __getitem__(self, key: str) -> Any:
+        name = self._FIELDS.get(key)
+        if name is None:
+            raise KeyError(key)
+        return getattr(self, name)
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        name = self._FIELDS.get(key)
+        if name is None:
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        setattr(self, name, value)
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self._FIELDS
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._FIELDS)
+    
+    def __len__(self) -> int:
+        return len(self._FIELDS)
+    
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict (nested records included), keyed like the old dicts."""
+        return {
+            key: value.to_dict() if isinstance(value, Record) else value
+            for key, value in self.items()
+        }
+
+
+def record(cls):
+    """Class decorator: make cls a slotted dataclass and build its dict key map."""
+    cls = dataclass(slots=True, eq=False)(cls)
+    reverse = {field: key for key, field in cls._KEYS.items()}
+    cls._FIELDS = {reverse.get(f.name, f.name): f.name for f in fields(cls)}
+    return cls
+
+
+@record
+class Assignment(Record):
+    """A gradebook column with the current user's grade (see BBClient.get_course_assignments)."""
+    
+    id: str
+    content_id: Optional[str]
+    name: str
+    course_id: str
+    course_name: Optional[str]
+    due: Optional[str]
+    score_possible: Optional[float]
+    score: Optional[float]
+    status: str
+    submitted: bool
+    graded: bool
+    is_past_due: bool
+    accepts_late: bool
+    grading_type: str
+
+
+@record
+class Meeting(Record):
+    """A course meeting (attendance session)."""
+    
+    _KEYS: ClassVar[Dict[str, str]] = {"courseId": "course_id"}
+    
+    id: str
+    course_id: Optional[str] = None
+    title: Optional[str] = None
+    start: Optional[str] = None
+    end: Optional[str] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Meeting":
+        """Build a meeting from an API meeting object."""
+        return cls(
+            id=data.get("id"),
+            course_id=data.get("courseId"),
+            title=data.get("title"),
+            start=data.get("start"),
+            end=data.get("end")
+        )
+
+
+@record
+class AttendanceRecord(Record):
+    """The current user's attendance for one meeting."""
+    
+    _KEYS: ClassVar[Dict[str, str]] = {"meetingId": "meeting_id", "userId": "user_id"}
+    
+    meeting: Meeting
+    status: str = "unknown"
+    id: Optional[str] = None
+    meeting_id: Optional[str] = None
+    user_id: Optional[str] = None
+    course: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], meeting: Optional[Meeting] = None) -> "AttendanceRecord":
+        """
+        Build a record from an API attendance object (or attendance ledger entry).
+        
+        Args:
+            data: Attendance object, optionally with its "meeting" attached
+            meeting: Meeting to reference instead of data["meeting"]
+        """
+        if meeting is None:
+            meeting = Meeting.from_dict(data.get("meeting") or {})
+        return cls(
+            meeting=meeting,
+            status=data.get("status") or "unknown",
+            id=data.get("id"),
+            meeting_id=data.get("meetingId", meeting.id),
+            user_id=data.get("userId"),
+            course=data.get("course")
+        )
+
+
+@record
+class Course(Record):
+    """A cached course in the .id format (see CourseCatalog)."""
+    
+    name: Optional[str]
+    course_id: Optional[str]
+    internal_id: Optional[str]
+    url: str = ""
+    professors: List[str] = None
+    class_name: Optional[str] = None
+    
+    def __post_init__(self):
+        if self.professors is None:
+            self.professors = []
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Course":
+        """Build a course from a .id course entry."""
+        return cls(
+            name=data.get("name"),
+            course_id=data.get("course_id"),
+            internal_id=data.get("internal_id"),
+            url=data.get("url", ""),
+            professors=list(data.get("professors") or []),
+            class_name=data.get("class_name")
+        )
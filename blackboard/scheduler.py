@@ -0,0 +1,241 @@
+"""
+Adaptive per-course polling under a fixed request budget.
+
+Instead of syncing every course at the same rate, the scheduler learns how
+often each course's assignments and attendance actually change, and spends
+a fixed number of requests per cycle where a poll most likely finds news:
+    
+    priority = weight * P(changed since last poll) / expected requests
+
+P(changed) = 1 - exp(-rate * age) uses a per-course change rate (changes per
+hour, with exponential decay so old behavior fades out). The weight is
+raised for courses with an unsubmitted deadline in the next 48 hours.
+Courses that never change drift to a near-zero rate and are polled rarely.
+
+Usage:
+    scheduler = PollScheduler(client, state_path="cache/schedule/student.json")
+    while True:
+        result = scheduler.run_cycle(budget=40)
+        time.sleep(300)
+"""
+
+import math
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
+
+from bbpy import codec
+from bbpy.diff import take_snapshot
+from bbpy.exceptions import BBAPIError
+
+
+KINDS = ("assignments", "attendance")
+
+
+class PollScheduler:
+    """
+    Chooses which course data to poll each cycle, and learns from the results.
+    
+    State (change rates, last polls, cost estimates) is kept per
+    "<course_id>:<kind>" key and persisted in state_path after each cycle.
+    """
+    
+    # Relative value of fresh data of each kind
+    KIND_WEIGHTS = {"assignments": 1.0, "attendance": 0.5}
+    
+    # Weight multiplier for assignments of courses with a deadline soon
+    DEADLINE_BOOST = 4.0
+    DEADLINE_HORIZON = 48 * 3600  # seconds
+    
+    # Prior change rate: PRIOR_CHANGES changes per PRIOR_HOURS hours
+    PRIOR_CHANGES = 1.0
+    PRIOR_HOURS = 24.0
+    
+    # Observations lose half their weight after this many hours
+    HALF_LIFE_HOURS = 7 * 24.0
+    
+    # Requests per poll before the first measurement
+    COST_GUESS = {"assignments": 10.0, "attendance": 3.0}
+    
+    def __init__(self, client, state_path: Optional[str] = None, budget: int = 50):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            client: Authenticated BBClient with cached .id data
+            state_path: JSON file persisting the learned state (in-memory if None)
+            budget: Default max requests per cycle
+        """
+        self.client = client
+        self.state_path = Path(state_path) if state_path else None
+        self.budget = budget
+        self.state: Dict[str, Dict[str, Any]] = {}
+        if self.state_path and self.state_path.exists():
+            try:
+                self.state = codec.load_file(self.state_path)
+            except codec.DecodeError:
+                self.state = {}
+    
+    def _entry(self, course_id: str, kind: str) -> Dict[str, Any]:
+        return self.state.setdefault(f"{course_id}:{kind}", {
+            "changes": 0.0,
+            "hours": 0.0,
+            "cost": self.COST_GUESS[kind],
+            "polls": 0,
+            "last_poll": None,
+            "last_change": None,
+            "hash": None
+        })
+    
+    def change_rate(self, course_id: str, kind: str) -> float:
+        """Estimated changes per hour of a course's data."""
+        entry = self._entry(course_id, kind)
+        return (entry["changes"] + self.PRIOR_CHANGES) / (entry["hours"] + self.PRIOR_HOURS)
+    
+    def _deadline_courses(self, now: float) -> set:
+        """Courses with an unsubmitted deadline within the horizon."""
+        upcoming = self.client.deadlines.due_between(now, now + self.DEADLINE_HORIZON)
+        return {e.get("course_id") for e in upcoming if not e.get("submitted")}
+    
+    def priorities(self, now: Optional[float] = None) -> List[Tuple[float, str, str, float]]:
+        """
+        Score every pollable (course, kind).
+        
+        Args:
+            now: Epoch seconds (current time if None)
+        
+        Returns:
+            (priority, course_id, kind, expected requests) tuples, highest priority first
+        """
+        now = time.time() if now is None else now
+        near_deadline = self._deadline_courses(now)
+        families = {"assignments": "gradebook", "attendance": "meetings"}
+        
+        scored = []
+        for course in self.client.get_course_catalog():
+            course_id = course.get("internal_id")
+            if not course_id:
+                continue
+            for kind in KINDS:
+                if self.client.negative_cache.is_unavailable(course_id, families[kind]):
+                    continue
+                entry = self._entry(course_id, kind)
+                if entry["last_poll"] is None:
+                    p_change = 1.0
+                else:
+                    age_hours = max(0.0, now - entry["last_poll"]) / 3600
+                    p_change = 1 - math.exp(-self.change_rate(course_id, kind) * age_hours)
+                
+                weight = self.KIND_WEIGHTS[kind]
+                if kind == "assignments" and course_id in near_deadline:
+                    weight *= self.DEADLINE_BOOST
+                cost = max(entry["cost"], 1.0)
+                scored.append((weight * p_change / cost, course_id, kind, cost))
+        
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return scored
+    
+    def plan(self, budget: Optional[int] = None, now: Optional[float] = None) -> List[Tuple[str, str]]:
+        """
+        Choose the polls of one cycle: highest priority per request first, within the budget.
+        
+        Args:
+            budget: Max requests (the scheduler's budget if None)
+            now: Epoch seconds (current time if None)
+        
+        Returns:
+            (course_id, kind) pairs to poll
+        """
+        remaining = self.budget if budget is None else budget
+        chosen = []
+        for priority, course_id, kind, cost in self.priorities(now):
+            if priority <= 0:
+                break
+            if cost <= remaining:
+                chosen.append((course_id, kind))
+                remaining -= cost
+        return chosen
+    
+    def _poll(self, course_id: str, kind: str) -> str:
+        """
+        Fetch one course's data and return its content hash.
+        
+        Fetches are strict: a failed request raises BBAPIError instead of
+        looking like a course that emptied, so it neither counts as a change
+        nor wipes the course's deadlines.
+        """
+        if kind == "assignments":
+            assignments = self.client.get_course_assignments(course_id, strict=True)
+            self.client.deadlines.update_course(course_id, assignments)
+            return codec.content_hash(take_snapshot(assignments=assignments))
+        
+        records = self.client._get_course_attendance(course_id, incremental=True, strict=True)
+        return codec.content_hash(take_snapshot(attendance={course_id: records}))
+    
+    def _observe(self, entry: Dict[str, Any], digest: str, requests: int, now: float) -> bool:
+        """Update an entry's change rate and cost from one poll; True if the data changed."""
+        changed = entry["hash"] is not None and digest != entry["hash"]
+        if entry["last_poll"] is not None:
+            hours = max(0.0, now - entry["last_poll"]) / 3600
+            decay = 0.5 ** (hours / self.HALF_LIFE_HOURS)
+            entry["changes"] = entry["changes"] * decay + (1.0 if changed else 0.0)
+            entry["hours"] = entry["hours"] * decay + hours
+        if changed:
+            entry["last_change"] = now
+        
+        # Smoothed requests per poll (pagination, per-meeting fallbacks)
+        entry["cost"] = requests if not entry["polls"] else 0.7 * entry["cost"] + 0.3 * requests
+        entry["polls"] += 1
+        entry["last_poll"] = now
+        entry["hash"] = digest
+        return changed
+    
+    def run_cycle(self, budget: Optional[int] = None, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Plan and perform one polling cycle.
+        
+        Polls are charged the requests they actually made, so a cycle can
+        exceed the budget by at most one poll's cost misestimate.
+        
+        Args:
+            budget: Max requests (the scheduler's budget if None)
+            now: Epoch seconds (current time if None)
+        
+        Returns:
+            Dict with "polled" ({course_id, kind, changed, requests} per poll),
+            "changed" count, "requests" made, and "errors" (course_id, kind, message)
+        """
+        now = time.time() if now is None else now
+        remaining = self.budget if budget is None else budget
+        polled = []
+        errors = []
+        
+        # Like plan(), but charging the requests each poll actually made
+        for priority, course_id, kind, cost in self.priorities(now):
+            if priority <= 0 or remaining < 1:
+                break
+            if cost > remaining:
+                continue
+            before = self.client.metrics.total_requests()
+            try:
+                digest = self._poll(course_id, kind)
+            except BBAPIError as e:
+                errors.append((course_id, kind, str(e)))
+                remaining -= self.client.metrics.total_requests() - before
+                continue
+            requests = self.client.metrics.total_requests() - before
+            remaining -= requests
+            changed = self._observe(self._entry(course_id, kind), digest, requests, now)
+            polled.append({"course_id": course_id, "kind": kind, "changed": changed, "requests": requests})
+        
+        if any(p["kind"] == "attendance" for p in polled):
+            self.client._save_attendance_ledger()
+        if self.state_path:
+            codec.dump_file(self.state_path, self.state)
+        
+        return {
+            "polled": polled,
+            "changed": sum(1 for p in polled if p["changed"]),
+            "requests": sum(p["requests"] for p in polled),
+            "errors": errors
+        }
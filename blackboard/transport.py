@@ -0,0 +1,340 @@
+"""
+Pluggable HTTP transports for BBClient.
+
+A transport performs the GET requests of BBClient._request. Besides the
+default requests backend, HttpxTransport multiplexes concurrent requests
+over HTTP/2, and responses can be recorded into a compressed cassette and
+replayed later (with original, scaled or no timing), so performance runs
+are reproducible without credentials or network.
+"""
+
+import gzip
+import threading
+from abc import ABC, abstractmethod
+import time
+from datetime import datetime
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Optional, List, Dict, Any
+from urllib.parse import urlsplit, urlencode
+
+import requests
+from requests.cookies import get_cookie_header
+
+from bbpy import codec
+from bbpy.exceptions import BBAPIError
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+API_PREFIX = "/learn/api/public"
+
+
+class Response:
+    """Minimal response object returned by non-requests transports."""
+    
+    def __init__(self, status_code: int, content: bytes, headers: Optional[Dict[str, str]] = None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+    
+    def json(self) -> Any:
+        return codec.loads(self.content)
+
+
+class Transport(ABC):
+    """
+    Base transport.
+    
+    get() must return an object with status_code, content, text and json(),
+    and raise requests.RequestException (or BBAPIError) on network errors.
+    """
+    
+    @abstractmethod
+    def get(self, session: requests.Session, url: str, params: Optional[Dict] = None):
+        """Perform a GET request with the session's cookies."""
+    
+    def close(self) -> None:
+        """Release connections and flush any state (no-op by default)."""
+
+
+class RequestsTransport(Transport):
+    """Default transport: the client's requests.Session (HTTP/1.1 keep-alive)."""
+    
+    def get(self, session: requests.Session, url: str, params: Optional[Dict] = None):
+        return session.get(url, params=params)
+
+
+class HttpxTransport(Transport):
+    """
+    HTTP/2 transport on httpx (pip install "httpx[http2]").
+    
+    Over HTTPS, the concurrent requests of BBClient's fan-outs (content
+    handlers, per-meeting attendance, instructors) become streams on one
+    connection per host instead of one connection per thread. Plain http://
+    (e.g. the mock server) has no ALPN and falls back to HTTP/1.1 keep-alive.
+    
+    Cookies are taken from the client's requests.Session on every request,
+    and cookies set by responses are stored back into it, so one transport
+    can serve several sessions.
+    
+    Usage:
+        transport = HttpxTransport()
+        client = BBClient(id_path="student.id", transport=transport)
+        client.get_assignments()
+        print(transport.stats())
+    """
+    
+    def __init__(self, http2: bool = True, max_connections: int = 20, timeout: float = 30.0):
+        """
+        Initialize the transport.
+        
+        Args:
+            http2: Negotiate HTTP/2 (HTTP/1.1 only if False)
+            max_connections: Max open connections (HTTP/1.1 needs one per
+                             concurrent request; HTTP/2 needs one per host)
+            timeout: Connect/read timeout in seconds
+        
+        Raises:
+            ImportError: If httpx (or h2, for HTTP/2) is not installed
+        """
+        if httpx is None:
+            raise ImportError('HttpxTransport requires httpx: pip install "httpx[http2]"')
+        self.client = httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(max_connections=max_connections),
+            timeout=timeout,
+            # The requests.Session stays the only cookie store
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+        )
+        self.http_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, session: requests.Session, url: str, params: Optional[Dict] = None):
+        # Connection-specific headers are not allowed in HTTP/2
+        headers = {k: v for k, v in session.headers.items() if k.lower() != "connection"}
+        cookie = get_cookie_header(session.cookies, requests.Request("GET", url).prepare())
+        if cookie:
+            headers["Cookie"] = cookie
+        if params:
+            # requests leaves out None values, httpx would send "key="
+            params = {k: v for k, v in params.items() if v is not None}
+        
+        try:
+            response = self.client.get(url, params=params, headers=headers)
+        except httpx.HTTPError as e:
+            raise BBAPIError(f"Request error: {e}")
+        
+        if "set-cookie" in response.headers:
+            for cookie in response.cookies.jar:
+                session.cookies.set_cookie(cookie)
+        with self._lock:
+            self.http_versions[response.http_version] = self.http_versions.get(response.http_version, 0) + 1
+        return response
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get transport statistics: requests per negotiated HTTP version."""
+        with self._lock:
+            return {"requests": sum(self.http_versions.values()), "http_versions": dict(self.http_versions)}
+    
+    def close(self) -> None:
+        self.client.close()
+
+
+def request_key(url: str, params: Optional[Dict] = None) -> str:
+    """
+    Build the domain-independent key of a request.
+    
+    Args:
+        url: Full request URL
+        params: Query parameters
+    
+    Returns:
+        Path below /learn/api/public plus sorted query (e.g. "/v1/users/me?fields=id")
+    """
+    path = urlsplit(url).path
+    if path.startswith(API_PREFIX):
+        path = path[len(API_PREFIX):]
+    if params:
+        query = urlencode(sorted((k, str(v)) for k, v in params.items() if v is not None))
+        if query:
+            return f"{path}?{query}"
+    return path
+
+
+def sanitized_id_data(cached_data: Optional[dict]) -> Optional[dict]:
+    """Strip credentials and cookies from cached .id data, keeping user and courses."""
+    if not cached_data:
+        return None
+    return {
+        "user": cached_data.get("user", {}),
+        "courses": cached_data.get("courses", [])
+    }
+
+
+class RecordingTransport(Transport):
+    """
+    Records responses of an inner transport into a gzip-compressed JSON-lines cassette.
+    
+    Cookies and request headers are not recorded.
+    
+    Usage:
+        recorder = RecordingTransport("student.cassette.gz")
+        client = BBClient(id_path="student.id", transport=recorder)
+        client.get_assignments()
+        recorder.set_id_data(client.get_cached_data())
+        recorder.close()
+    """
+    
+    def __init__(self, path: str, inner: Optional[Transport] = None):
+        """
+        Initialize the recorder.
+        
+        Args:
+            path: Cassette file to write on close()
+            inner: Transport doing the real requests (requests backend if None)
+        """
+        self.path = path
+        self.inner = inner or RequestsTransport()
+        self.entries: List[Dict[str, Any]] = []
+        self.id_data: Optional[dict] = None
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+    
+    def get(self, session: requests.Session, url: str, params: Optional[Dict] = None):
+        offset = time.perf_counter() - self._start
+        start = time.perf_counter()
+        response = self.inner.get(session, url, params)
+        elapsed = time.perf_counter() - start
+        
+        entry = {
+            "key": request_key(url, params),
+            "at": round(offset, 6),
+            "elapsed": round(elapsed, 6),
+            "status": response.status_code,
+            "body": response.content.decode("utf-8", errors="replace")
+        }
+        with self._lock:
+            self.entries.append(entry)
+        return response
+    
+    def set_id_data(self, cached_data: Optional[dict]) -> None:
+        """Store the student's user and course data (without credentials) in the cassette."""
+        self.id_data = sanitized_id_data(cached_data)
+    
+    def save(self) -> None:
+        """Write the cassette."""
+        header = {
+            "version": 1,
+            "created_at": datetime.now().isoformat(),
+            "requests": len(self.entries),
+            "id_data": self.id_data
+        }
+        with gzip.open(self.path, 'wb') as f:
+            f.write(codec.dumps(header) + b"\n")
+            for entry in sorted(self.entries, key=lambda e: e["at"]):
+                f.write(codec.dumps(entry) + b"\n")
+    
+    def close(self) -> None:
+        self.save()
+        self.inner.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Serves responses from a cassette instead of the network.
+    
+    Responses are matched on path and query (not domain). Repeated requests
+    get the recorded responses in order; once exhausted, the last one is
+    served again. Unmatched requests get a 404 and are counted in misses.
+    
+    Usage:
+        replay = ReplayTransport("student.cassette.gz", timing="none")
+        replay.write_id_file("replay.id")
+        client = BBClient(id_path="replay.id", transport=replay)
+        client.get_assignments()
+    """
+    
+    TIMINGS = ("original", "scaled", "none")
+    
+    def __init__(self, path: str, timing: str = "original", scale: float = 1.0):
+        """
+        Load a cassette.
+        
+        Args:
+            path: Cassette written by RecordingTransport
+            timing: "original" (sleep the recorded response time), "scaled"
+                    (recorded time * scale) or "none" (no sleeping)
+            scale: Multiplier used by "scaled" timing
+        """
+        if timing not in self.TIMINGS:
+            raise ValueError(f"timing must be one of {self.TIMINGS}")
+        self.timing = timing
+        self.scale = scale
+        self.header: Dict[str, Any] = {}
+        self._responses: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses: List[str] = []
+        
+        with gzip.open(path, 'rb') as f:
+            self.header = codec.loads(f.readline())
+            for line in f:
+                entry = codec.loads(line)
+                self._responses.setdefault(entry["key"], []).append(entry)
+    
+    @property
+    def recorded_requests(self) -> int:
+        return sum(len(entries) for entries in self._responses.values())
+    
+    def write_id_file(self, id_path: str) -> None:
+        """
+        Write a credential-free .id file from the cassette's user and course data.
+        
+        Args:
+            id_path: Path to write
+        """
+        id_data = dict(self.header.get("id_data") or {"user": {}, "courses": []})
+        id_data["generated_at"] = self.header.get("created_at")
+        id_data["cookies"] = [{"name": "BbRouter", "value": "replay", "domain": "", "path": "/"}]
+        codec.dump_file(id_path, id_data)
+    
+    def _next(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entries = self._responses.get(key)
+            if not entries:
+                self.misses.append(key)
+                return None
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            self.hits += 1
+            return entries[min(index, len(entries) - 1)]
+    
+    def get(self, session: requests.Session, url: str, params: Optional[Dict] = None):
+        entry = self._next(request_key(url, params))
+        if entry is None:
+            return Response(404, b'{"status":404,"message":"Not in cassette"}')
+        
+        if self.timing == "original":
+            time.sleep(entry["elapsed"])
+        elif self.timing == "scaled":
+            time.sleep(entry["elapsed"] * self.scale)
+        
+        return Response(entry["status"], entry["body"].encode("utf-8"))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get replay statistics: recorded, served and unmatched requests."""
+        with self._lock:
+            return {
+                "recorded": self.recorded_requests,
+                "hits": self.hits,
+                "misses": len(self.misses),
+                "missed_keys": sorted(set(self.misses))
+            }
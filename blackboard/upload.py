@@ -0,0 +1,442 @@
+"""
+Batched delta uploads of sync results to the web app.
+
+Each student's sync result is a document of keyed collections (courses,
+assignments, attendance) and a few plain sections (user, attendanceStats).
+The uploader remembers, per student, the version and item hashes the server
+last acknowledged, and sends only what changed since then:
+
+    POST <url>   (Content-Encoding: gzip)
+    {
+        "protocol": 1,
+        "accounts": [
+            {"id": "<upload id>", "student": "...", "base": 3, "version": 4, "full": false,
+             "set": {"attendanceStats": {...}},
+             "upsert": {"assignments": {"<key>": {...}}},
+             "delete": {"attendance": ["<key>"]}}
+        ]
+    }
+
+Many accounts share one request. Retries resend the same body: the server
+recognizes upload ids it already applied, so a retry after a lost response
+is harmless. A version conflict (the server's version is not our base)
+makes the uploader send that student's full document instead.
+
+A course whose fetch failed has no items in the document. Its acknowledged
+items are kept, neither deleted nor re-sent, until it can be fetched again.
+
+Usage:
+    uploader = DeltaUploader("https://portal.example/api/blackboard/sync", state_path="upload_state.json")
+    for client in clients:
+        uploader.add_client(client)
+    stats = uploader.flush()
+"""
+
+import gzip
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterable, Mapping, Tuple
+
+import requests
+
+from bbpy import codec
+from bbpy.exceptions import BBAPIError
+
+
+PROTOCOL = 1
+
+# Document sections holding items by stable key; the others are replaced as a whole
+COLLECTIONS = ("courses", "assignments", "attendance")
+
+
+def build_document(client, failed: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+    """
+    Build the upload document of a BBClient's current data.
+    
+    Attendance is read in one ledger pass (get_attendance_by_course), and
+    attendanceStats is counted from the same records. attendanceStats is left
+    out if a course's attendance could not be fetched.
+    
+    Args:
+        client: Authenticated BBClient with cached .id data
+        failed: Dict that receives, per collection ("assignments",
+                "attendance"), the internal IDs of courses whose items are
+                missing because their fetch failed or the negative cache
+                skipped them; pass it to DeltaUploader.add
+    
+    Returns:
+        Dict with user, attendanceStats and keyed courses, assignments and attendance
+    """
+    cached = client.get_cached_data() or {}
+    catalog = client.get_course_catalog()
+    failed_assignments: List[str] = []
+    failed_attendance: List[str] = []
+    assignments = client.get_assignments(failed=failed_assignments)
+    by_course = client.get_attendance_by_course(failed=failed_attendance)
+    
+    attendance = {}
+    for course_id, records in by_course.items():
+        for entry in records:
+            meeting = entry.get("meeting") or {}
+            meeting_id = entry.get("meetingId") or meeting.get("id")
+            attendance[f"{course_id}:{meeting_id}"] = {
+                "course_id": course_id,
+                "meeting_id": meeting_id,
+                "title": meeting.get("title"),
+                "start": meeting.get("start"),
+                "status": entry.get("status") or "unknown"
+            }
+    
+    document = {
+        "user": cached.get("user", {}),
+        "courses": {c["internal_id"]: dict(c) for c in catalog if c.get("internal_id")},
+        "assignments": {f"{a['course_id']}:{a['id']}": a for a in assignments},
+        "attendance": attendance
+    }
+    if not failed_attendance:
+        records = [entry for entries in by_course.values() for entry in entries]
+        document["attendanceStats"] = client.summarize_attendance(records)
+    
+    if failed is not None:
+        # A 403 is cached as "unavailable" and then returns no items without
+        # failing: such courses keep their acknowledged items as well
+        course_ids = [c["internal_id"] for c in catalog if c.get("internal_id")]
+        for collection, course_failed, family in (
+            ("assignments", failed_assignments, "gradebook"),
+            ("attendance", failed_attendance, "meetings")
+        ):
+            skipped = [
+                c for c in course_ids
+                if c not in course_failed and client.negative_cache.is_unavailable(c, family)
+            ]
+            failed[collection] = course_failed + skipped
+    return document
+
+
+def _course_of(key: str) -> str:
+    """Internal course ID of a collection item key ("<course_id>" or "<course_id>:<id>")."""
+    return key.split(":", 1)[0]
+
+
+def document_hashes(document: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """Hash every plain section and every collection item of a document."""
+    hashes: Dict[str, Dict[str, str]] = {"sections": {}}
+    for section, value in document.items():
+        if section in COLLECTIONS:
+            hashes[section] = {key: codec.content_hash(item) for key, item in value.items()}
+        else:
+            hashes["sections"][section] = codec.content_hash(value)
+    return hashes
+
+
+def carry_failed(
+    hashes: Dict[str, Dict[str, str]],
+    previous: Optional[Dict[str, Dict[str, str]]],
+    failed: Optional[Mapping[str, Iterable[str]]]
+) -> Dict[str, Dict[str, str]]:
+    """
+    Add the acknowledged hashes of what a document is missing because a fetch failed.
+    
+    Args:
+        hashes: document_hashes(document)
+        previous: Hashes of the acknowledged document
+        failed: Internal IDs of failed courses per collection (see build_document)
+    
+    Returns:
+        hashes plus the previous hashes of the failed courses' items and of
+        plain sections left out of the document (the server keeps both)
+    """
+    if not previous:
+        return hashes
+    carried = {section: dict(values) for section, values in hashes.items()}
+    for section, digest in previous.get("sections", {}).items():
+        carried["sections"].setdefault(section, digest)
+    for collection, course_ids in (failed or {}).items():
+        course_ids = set(course_ids)
+        items = carried.setdefault(collection, {})
+        for key, digest in previous.get(collection, {}).items():
+            if _course_of(key) in course_ids:
+                items.setdefault(key, digest)
+    return carried
+
+
+def document_delta(
+    document: Dict[str, Any],
+    hashes: Dict[str, Dict[str, str]],
+    previous: Optional[Dict[str, Dict[str, str]]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute the changes from the acknowledged hashes to the document.
+    
+    Args:
+        document: Current document
+        hashes: document_hashes(document), or carry_failed() of it; carried
+                hashes equal the previous ones, so they are never sent
+        previous: Hashes of the acknowledged document (None: send everything)
+    
+    Returns:
+        Dict with "set" (plain sections), "upsert" ({collection: {key: item}})
+        and "delete" ({collection: [keys]}); empty parts are left out
+    """
+    previous = previous or {}
+    delta: Dict[str, Dict[str, Any]] = {}
+    
+    old_sections = previous.get("sections", {})
+    changed = {
+        section: document[section]
+        for section, digest in hashes["sections"].items()
+        if old_sections.get(section) != digest
+    }
+    if changed:
+        delta["set"] = changed
+    
+    for collection in COLLECTIONS:
+        new = hashes.get(collection, {})
+        old = previous.get(collection, {})
+        upsert = {key: document[collection][key] for key, digest in new.items() if old.get(key) != digest}
+        removed = [key for key in old if key not in new]
+        if upsert:
+            delta.setdefault("upsert", {})[collection] = upsert
+        if removed:
+            delta.setdefault("delete", {})[collection] = removed
+    
+    return delta
+
+
+def apply_delta(document: Dict[str, Any], account: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply an uploaded account entry to a stored document (what the server does).
+    
+    Args:
+        document: Stored document (ignored for full uploads)
+        account: Account entry of an upload request
+    
+    Returns:
+        The updated document
+    """
+    document = {} if account.get("full") else dict(document)
+    document.update(account.get("set", {}))
+    for collection, items in account.get("upsert", {}).items():
+        document[collection] = dict(document.get(collection, {}), **items)
+    for collection, keys in account.get("delete", {}).items():
+        items = dict(document.get(collection, {}))
+        for key in keys:
+            items.pop(key, None)
+        document[collection] = items
+    return document
+
+
+class DeltaUploader:
+    """
+    Queues students' documents and uploads their deltas in compressed batches.
+    
+    The acknowledged version and item hashes of every student are kept in
+    state_path (written atomically after each acknowledged batch), so deltas
+    survive restarts.
+    """
+    
+    def __init__(
+        self,
+        url: str,
+        state_path: Optional[str] = None,
+        batch_size: int = 50,
+        compress: bool = True,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 30.0,
+        session: Optional[requests.Session] = None,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize the uploader.
+        
+        Args:
+            url: Sync endpoint URL
+            state_path: File keeping acknowledged versions and hashes (in-memory if None)
+            batch_size: Accounts per request
+            compress: gzip request bodies
+            max_retries: Retries of a batch after network errors or 5xx responses
+            backoff: Seconds before the first retry (doubled each retry)
+            timeout: Request timeout in seconds
+            session: requests.Session to use (e.g. with auth headers)
+            headers: Extra request headers
+        """
+        self.url = url
+        self.state_path = Path(state_path) if state_path else None
+        self.batch_size = batch_size
+        self.compress = compress
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.headers = headers or {}
+        self.state: Dict[str, Dict[str, Any]] = self._load_state()
+        # student -> (document, failed courses per collection)
+        self._queue: Dict[str, Tuple[Dict[str, Any], Dict[str, List[str]]]] = {}
+    
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if not self.state_path or not self.state_path.exists():
+            return {}
+        try:
+            return codec.load_file(self.state_path)
+        except codec.DecodeError:
+            # Unknown state: the next upload of every student is a full one
+            return {}
+    
+    def _save_state(self) -> None:
+        if self.state_path:
+            codec.dump_file(self.state_path, self.state)
+    
+    def add(
+        self,
+        student: str,
+        document: Dict[str, Any],
+        failed: Optional[Mapping[str, List[str]]] = None
+    ) -> None:
+        """
+        Queue a student's document (replaces a queued document of the same student).
+        
+        Args:
+            student: Student key
+            document: Upload document (see build_document)
+            failed: Internal IDs of courses per collection whose items are
+                    missing from the document; their acknowledged items are kept
+        """
+        self._queue[student] = (document, dict(failed or {}))
+    
+    def add_client(self, client, student: Optional[str] = None) -> None:
+        """Build and queue the document of a BBClient (student defaults to the .id username)."""
+        user = (client.get_cached_data() or {}).get("user", {})
+        failed: Dict[str, List[str]] = {}
+        document = build_document(client, failed)
+        self.add(student or user.get("username") or str(client.user_id), document, failed)
+    
+    def _entry(
+        self,
+        student: str,
+        document: Dict[str, Any],
+        failed: Dict[str, List[str]],
+        full: bool
+    ) -> Tuple[Optional[dict], dict]:
+        """Build the account entry of a student; None if nothing changed since the last ack."""
+        state = None if full else self.state.get(student)
+        previous = state["hashes"] if state else None
+        hashes = carry_failed(document_hashes(document), previous, failed)
+        base = state["version"] if state else 0
+        delta = document_delta(document, hashes, previous)
+        if state and not delta:
+            return None, hashes
+        
+        entry = {
+            "id": uuid.uuid4().hex,
+            "student": student,
+            "base": base,
+            "version": base + 1,
+            "full": state is None,
+            **delta
+        }
+        return entry, hashes
+    
+    def flush(self) -> Dict[str, Any]:
+        """
+        Upload the deltas of every queued student.
+        
+        Students that are not acknowledged (their batch failed, the server
+        rejected their entry, or it conflicted twice) go back to the queue for
+        the next flush, unless a newer document of theirs was queued meanwhile.
+        A conflicting student with failed courses is not sent in full, which
+        would drop the kept items; it goes back to the queue as well.
+        
+        Returns:
+            Stats: accounts, unchanged, full, delta, conflicts, requeued,
+            requests, retries, raw_bytes (uncompressed JSON) and bytes_sent
+        
+        Raises:
+            BBAPIError: If a batch still fails after max_retries, or is rejected (4xx)
+        """
+        stats = {
+            "accounts": len(self._queue), "unchanged": 0, "full": 0, "delta": 0,
+            "conflicts": 0, "requeued": 0, "requests": 0, "retries": 0, "raw_bytes": 0, "bytes_sent": 0
+        }
+        queue, self._queue = self._queue, {}
+        # Students are removed once acknowledged (or unchanged); the rest is queued again
+        unsent = dict(queue)
+        pending = [(student, document, failed, False) for student, (document, failed) in queue.items()]
+        
+        try:
+            # A conflict sends the student again, in full, in a second round
+            for _ in range(2):
+                conflicts = []
+                entries = []
+                for student, document, failed, full in pending:
+                    entry, hashes = self._entry(student, document, failed, full)
+                    if entry is None:
+                        stats["unchanged"] += 1
+                        unsent.pop(student, None)
+                        continue
+                    stats["full" if entry["full"] else "delta"] += 1
+                    entries.append((entry, hashes, document, failed))
+                
+                for start in range(0, len(entries), self.batch_size):
+                    batch = entries[start:start + self.batch_size]
+                    results = self._post([entry for entry, _, _, _ in batch], stats)
+                    for entry, hashes, document, failed in batch:
+                        result = results.get(entry["id"], {})
+                        if result.get("status") in ("ok", "duplicate"):
+                            self.state[entry["student"]] = {"version": result["version"], "hashes": hashes}
+                            unsent.pop(entry["student"], None)
+                        elif result.get("status") == "conflict":
+                            stats["conflicts"] += 1
+                            if any(failed.values()):
+                                continue
+                            self.state.pop(entry["student"], None)
+                            conflicts.append((entry["student"], document, failed, True))
+                    self._save_state()
+                
+                if not conflicts:
+                    break
+                pending = conflicts
+        finally:
+            for student, queued in unsent.items():
+                self._queue.setdefault(student, queued)
+            stats["requeued"] = len(unsent)
+        
+        return stats
+    
+    def _post(self, accounts: List[Dict[str, Any]], stats: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Send one batch, retrying the identical body; returns results by upload id."""
+        raw = codec.dumps({"protocol": PROTOCOL, "accounts": accounts})
+        headers = dict(self.headers, **{"Content-Type": "application/json"})
+        body = raw
+        if self.compress:
+            body = gzip.compress(raw, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        stats["raw_bytes"] += len(raw)
+        
+        delay = self.backoff
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                stats["retries"] += 1
+                time.sleep(delay)
+                delay *= 2
+            
+            stats["requests"] += 1
+            stats["bytes_sent"] += len(body)
+            try:
+                response = self.session.post(self.url, data=body, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = BBAPIError(f"Upload error: {e}")
+                continue
+            
+            if response.status_code == 200:
+                return {r.get("id"): r for r in codec.loads(response.content).get("results", [])}
+            error = BBAPIError(
+                f"Upload failed: {self.url}",
+                status_code=response.status_code,
+                response=response.text
+            )
+            if response.status_code < 500:
+                raise error
+        
+        raise error
@@ -0,0 +1,430 @@
+"""
+Durable work queue for sharded fleet syncs across processes and hosts.
+
+Accounts (.id files) are work items in a SQLite database; any number of
+worker processes, on one host or on several hosts sharing the file (with
+--shared, see WorkQueue), claim items under a lease, renew it with
+heartbeats while syncing, and mark them done. A worker that dies simply
+stops renewing: once its lease expires the item is claimed again
+(at-least-once delivery). Sync jobs are therefore
+written to be idempotent: the default job recomputes the stats and writes
+them to the .id file with an atomic replace, so running it twice leaves the
+same file.
+
+Every claim gets a fresh lease token; heartbeat() and complete() only
+succeed for the current token, so a worker whose lease was taken over
+learns it and does not mark the item done.
+
+Usage:
+    python -m bbpy.workqueue enqueue queue.db ids/*.id
+    python -m bbpy.workqueue work queue.db --threads 8      # on each process
+    python -m bbpy.workqueue --shared work /mnt/nfs/queue.db  # on each host
+    python -m bbpy.workqueue stats queue.db
+"""
+
+import argparse
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Callable, Iterable
+
+from bbpy.client import BBClient
+
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    token TEXT,
+    owner TEXT,
+    lease_expires REAL,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS items_claim ON items (state, lease_expires, enqueued_at);
+"""
+
+
+@dataclass
+class Lease:
+    """A claimed work item."""
+    
+    item_id: str
+    token: str
+    attempt: int
+    expires_at: float
+
+
+class WorkQueue:
+    """
+    SQLite-backed queue of work items with leases.
+    
+    Each call opens its own short transaction (BEGIN IMMEDIATE for writes),
+    so one WorkQueue can be shared by threads and one database file by
+    processes. By default the database uses WAL, whose shared-memory index
+    only works between processes of one host. A file shared by several hosts
+    must be opened with shared=True by every process (rollback journal), and
+    live on a filesystem with working POSIX locks.
+    """
+    
+    DEFAULT_LEASE = 120.0  # seconds
+    DEFAULT_MAX_ATTEMPTS = 5
+    
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = DEFAULT_LEASE,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        shared: bool = False
+    ):
+        """
+        Open (or create) a queue.
+        
+        Args:
+            path: SQLite database file
+            lease_seconds: Lease length; a claim not renewed within it can be taken over
+            max_attempts: Claims per item before it is marked failed
+            shared: The file is used from several hosts (e.g. over NFS): use the
+                    rollback journal instead of WAL
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.shared = shared
+        self._local = threading.local()
+        self._db().executescript(_SCHEMA)
+    
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            if self.shared:
+                db.execute("PRAGMA journal_mode=DELETE")
+                db.execute("PRAGMA synchronous=FULL")
+            else:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+    
+    @contextmanager
+    def _transaction(self):
+        """Write transaction; BEGIN IMMEDIATE takes the write lock up front (no upgrade deadlocks)."""
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+    
+    def enqueue(self, item_ids: Iterable[str], requeue: bool = False) -> int:
+        """
+        Add work items (e.g. .id file paths).
+        
+        Args:
+            item_ids: Item IDs; IDs already queued are left alone
+            requeue: Also reset done and failed items to pending (a new sync round)
+        
+        Returns:
+            Number of items added or reset
+        """
+        now = time.time()
+        count = 0
+        with self._transaction() as db:
+            for item_id in item_ids:
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO items (id, state, enqueued_at, updated_at) VALUES (?, ?, ?, ?)",
+                    (item_id, PENDING, now, now)
+                )
+                if not cursor.rowcount and requeue:
+                    cursor = db.execute(
+                        "UPDATE items SET state = ?, attempts = 0, last_error = NULL, enqueued_at = ?, updated_at = ? "
+                        "WHERE id = ? AND state IN (?, ?)",
+                        (PENDING, now, now, item_id, DONE, FAILED)
+                    )
+                count += cursor.rowcount
+        return count
+    
+    def claim(self, owner: str, limit: int = 1) -> List[Lease]:
+        """
+        Claim pending items, or items whose lease expired.
+        
+        Args:
+            owner: Worker name (recorded for stats)
+            limit: Max items to claim
+        
+        Returns:
+            Leases of the claimed items, oldest first (empty if none available)
+        """
+        now = time.time()
+        expires = now + self.lease_seconds
+        leases = []
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT id, attempts FROM items "
+                "WHERE state = ? OR (state = ? AND lease_expires < ?) "
+                "ORDER BY enqueued_at, id LIMIT ?",
+                (PENDING, LEASED, now, limit)
+            ).fetchall()
+            for item_id, attempts in rows:
+                if attempts >= self.max_attempts:
+                    db.execute(
+                        "UPDATE items SET state = ?, token = NULL, updated_at = ?, "
+                        "last_error = COALESCE(last_error, 'lease expired') WHERE id = ?",
+                        (FAILED, now, item_id)
+                    )
+                    continue
+                token = uuid.uuid4().hex
+                db.execute(
+                    "UPDATE items SET state = ?, attempts = attempts + 1, token = ?, owner = ?, "
+                    "lease_expires = ?, updated_at = ? WHERE id = ?",
+                    (LEASED, token, owner, expires, now, item_id)
+                )
+                leases.append(Lease(item_id, token, attempts + 1, expires))
+        return leases
+    
+    def heartbeat(self, lease: Lease) -> bool:
+        """
+        Extend a lease.
+        
+        Returns:
+            False if the lease was lost (expired and claimed by another worker)
+        """
+        expires = time.time() + self.lease_seconds
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE items SET lease_expires = ? WHERE id = ? AND token = ? AND state = ?",
+                (expires, lease.item_id, lease.token, LEASED)
+            )
+        if cursor.rowcount:
+            lease.expires_at = expires
+        return bool(cursor.rowcount)
+    
+    def complete(self, lease: Lease) -> bool:
+        """
+        Mark a leased item done.
+        
+        Returns:
+            False if the lease was lost (the item is another worker's now)
+        """
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE items SET state = ?, token = NULL, lease_expires = NULL, last_error = NULL, updated_at = ? "
+                "WHERE id = ? AND token = ?",
+                (DONE, time.time(), lease.item_id, lease.token)
+            )
+        return bool(cursor.rowcount)
+    
+    def fail(self, lease: Lease, error: str) -> bool:
+        """
+        Release a leased item after a failed attempt.
+        
+        The item goes back to pending, or to failed once max_attempts is reached.
+        
+        Returns:
+            False if the lease was lost
+        """
+        state = FAILED if lease.attempt >= self.max_attempts else PENDING
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE items SET state = ?, token = NULL, lease_expires = NULL, last_error = ?, updated_at = ? "
+                "WHERE id = ? AND token = ?",
+                (state, error, time.time(), lease.item_id, lease.token)
+            )
+        return bool(cursor.rowcount)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue statistics.
+        
+        Returns:
+            Dict with item counts per state, active leases per owner, and
+            failed items with their last error
+        """
+        db = self._db()
+        states = {state: 0 for state in (PENDING, LEASED, DONE, FAILED)}
+        states.update(db.execute("SELECT state, COUNT(*) FROM items GROUP BY state").fetchall())
+        owners = dict(db.execute(
+            "SELECT owner, COUNT(*) FROM items WHERE state = ? AND lease_expires >= ? GROUP BY owner",
+            (LEASED, time.time())
+        ).fetchall())
+        failed = dict(db.execute("SELECT id, last_error FROM items WHERE state = ?", (FAILED,)).fetchall())
+        return {"states": states, "owners": owners, "failed": failed}
+
+
+def sync_account(id_path: str, domain: str = BBClient.DEFAULT_DOMAIN) -> None:
+    """
+    Default job: sync one account and store its stats in the .id file.
+    
+    is_nerd() and is_attending() write computed values with an atomic
+    replace, so repeating the job (at-least-once delivery) is harmless.
+    Fetches are strict and write errors propagate, so a sync that could not
+    complete fails the item instead of storing stats of missing data.
+    """
+    client = BBClient(id_path=id_path, domain=domain, auto_refresh=False)
+    assignments = client.get_assignments(strict=True)
+    client.is_nerd(client.get_assignment_stats(assignments), strict=True)
+    client.is_attending(client.get_attendance_percentage(strict=True), strict=True)
+
+
+class Worker:
+    """
+    Claims items from a WorkQueue and runs a job on each, with threads and heartbeats.
+    
+    Start one Worker per process (and as many processes or hosts as needed);
+    throughput scales with the total number of threads until Blackboard or
+    the network is the bottleneck.
+    """
+    
+    def __init__(
+        self,
+        queue: WorkQueue,
+        job: Callable[[str], Any] = sync_account,
+        threads: int = 4,
+        name: Optional[str] = None
+    ):
+        """
+        Initialize the worker.
+        
+        Args:
+            queue: Work queue
+            job: Function called with each item ID; must be idempotent
+            threads: Items synced concurrently
+            name: Worker name (defaults to host:pid)
+        """
+        self.queue = queue
+        self.job = job
+        self.threads = threads
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.stats = {"completed": 0, "failed": 0, "lost": 0}
+        self._held: Dict[str, Lease] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+    
+    def _heartbeats(self) -> None:
+        """Renew held leases every third of the lease length."""
+        while not self._stop.wait(self.queue.lease_seconds / 3):
+            with self._lock:
+                leases = list(self._held.values())
+            for lease in leases:
+                self.queue.heartbeat(lease)
+    
+    def _run_thread(self, until_empty: bool, poll_interval: float) -> None:
+        while not self._stop.is_set():
+            leases = self.queue.claim(self.name)
+            if not leases:
+                if until_empty:
+                    return
+                self._stop.wait(poll_interval)
+                continue
+            
+            lease = leases[0]
+            with self._lock:
+                self._held[lease.token] = lease
+            try:
+                self.job(lease.item_id)
+            except Exception as e:
+                outcome = "failed" if self.queue.fail(lease, f"{type(e).__name__}: {e}") else "lost"
+            else:
+                outcome = "completed" if self.queue.complete(lease) else "lost"
+            finally:
+                with self._lock:
+                    self._held.pop(lease.token, None)
+            with self._lock:
+                self.stats[outcome] += 1
+    
+    def run(self, until_empty: bool = True, poll_interval: float = 5.0) -> Dict[str, int]:
+        """
+        Process items.
+        
+        Args:
+            until_empty: Return once no item can be claimed (else keep polling until stop())
+            poll_interval: Seconds between claims while the queue is empty
+        
+        Returns:
+            Counts of completed, failed and lost (lease taken over) items
+        """
+        heartbeat = threading.Thread(target=self._heartbeats, daemon=True)
+        heartbeat.start()
+        threads = [
+            threading.Thread(target=self._run_thread, args=(until_empty, poll_interval), daemon=True)
+            for _ in range(self.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self._stop.set()
+        return dict(self.stats)
+    
+    def stop(self) -> None:
+        """Stop after the items in progress."""
+        self._stop.set()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Durable work queue for fleet syncs")
+    parser.add_argument(
+        "--shared", action="store_true",
+        help="Database shared by several hosts (rollback journal instead of WAL); use on every host"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    enqueue = commands.add_parser("enqueue", help="Queue .id files")
+    enqueue.add_argument("db")
+    enqueue.add_argument("id_paths", nargs="+")
+    enqueue.add_argument("--requeue", action="store_true", help="Reset done and failed items (new round)")
+    
+    work = commands.add_parser("work", help="Sync queued accounts")
+    work.add_argument("db")
+    work.add_argument("--threads", type=int, default=4)
+    work.add_argument("--domain", default=BBClient.DEFAULT_DOMAIN)
+    work.add_argument("--lease", type=float, default=WorkQueue.DEFAULT_LEASE)
+    work.add_argument("--forever", action="store_true", help="Keep polling when the queue is empty")
+    
+    stats = commands.add_parser("stats", help="Show queue statistics")
+    stats.add_argument("db")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "enqueue":
+        added = WorkQueue(args.db, shared=args.shared).enqueue((os.path.abspath(p) for p in args.id_paths), requeue=args.requeue)
+        print(f"✅ {added} items queued")
+    elif args.command == "work":
+        worker = Worker(
+            WorkQueue(args.db, lease_seconds=args.lease, shared=args.shared),
+            job=lambda id_path: sync_account(id_path, args.domain),
+            threads=args.threads
+        )
+        print(f"🔄 Worker {worker.name} started ({args.threads} threads)")
+        result = worker.run(until_empty=not args.forever)
+        print(f"✅ {result['completed']} completed, {result['failed']} failed, {result['lost']} lost leases")
+    else:
+        result = WorkQueue(args.db, shared=args.shared).stats()
+        for state, count in result["states"].items():
+            print(f"{state:>8}: {count}")
+        for owner, count in result["owners"].items():
+            print(f"  leased by {owner}: {count}")
+        for item_id, error in result["failed"].items():
+            print(f"  ❌ {item_id}: {error}")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())